@@ -0,0 +1,84 @@
+"""Benchmark batch parsing throughput for each executor strategy.
+
+Generates a synthetic corpus of ArgoCD Application manifests and times
+``process_files_batch`` with the serial, thread and process executors. Run it
+under both a regular and a free-threaded interpreter to compare GIL builds:
+
+    uv run python benchmarks/bench_executors.py --files 2000 --workers 8
+    python3.13t benchmarks/bench_executors.py --files 2000 --workers 8
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from parser.batch import process_files_batch  # noqa: E402
+from parser.executor import ExecutorKind, gil_enabled  # noqa: E402
+
+MANIFEST_TEMPLATE = """apiVersion: argoproj.io/v1alpha1
+kind: Application
+metadata:
+  name: {name}
+  annotations:
+    argocd.argoproj.io/sync-wave: "{index}"
+  labels:
+    team: team-{team}
+spec:
+  project: default
+  source:
+    repoURL: https://github.com/org/repo.git
+    targetRevision: main
+    path: apps/{name}
+  destination:
+    server: https://kubernetes.default.svc
+    namespace: ns-{team}
+"""
+
+
+def write_corpus(directory: Path, count: int) -> list[Path]:
+    """Write count synthetic manifests into directory."""
+    files = []
+    for index in range(count):
+        path = directory / f"app-{index:06d}.yaml"
+        path.write_text(
+            MANIFEST_TEMPLATE.format(name=f"app-{index:06d}", index=index, team=index % 17)
+        )
+        files.append(path)
+    return files
+
+
+def main() -> None:
+    """Run the benchmark and print one line per executor."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    executors: list[ExecutorKind] = ["serial", "threads", "processes"]
+    print(f"python {sys.version.split()[0]} gil_enabled={gil_enabled()} files={args.files}")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        files = write_corpus(Path(temp_dir), args.files)
+        for executor in executors:
+            output_dir = Path(temp_dir) / f"out-{executor}"
+            start = time.perf_counter()
+            summary = process_files_batch(
+                files,
+                output_dir,
+                show_progress=False,
+                executor=executor,
+                max_workers=args.workers,
+            )
+            elapsed = time.perf_counter() - start
+            print(
+                f"{executor:>10}: {elapsed:7.3f}s  "
+                f"{summary.total / elapsed:9.1f} files/s  ({summary.successful} ok)"
+            )
+
+
+if __name__ == "__main__":
+    main()
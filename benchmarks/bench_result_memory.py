@@ -0,0 +1,80 @@
+"""Measure the per-file memory cost of keeping batch results.
+
+Compares a list of ParseResult models (what BatchSummary.results holds) with
+a ResultStore of compact records, for successful and failed results. Strings
+are built per file, as they are when results come back from workers:
+
+    uv run python benchmarks/bench_result_memory.py --files 100000
+"""
+
+import argparse
+import gc
+import sys
+import tempfile
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from parser.models import ParseResult, ValidationError  # noqa: E402
+from parser.results import ResultStore  # noqa: E402
+
+
+def make_result(index: int, failed: bool) -> ParseResult:
+    """Build the result of one typical file."""
+    name = f"payments-api-{index}"
+    if failed:
+        return ParseResult(
+            file_path=f"/src/manifests/team-{index % 50}/{name}.yaml",
+            status="failed",
+            errors=[
+                ValidationError(
+                    error_type="MISSING_FIELD",
+                    field="spec.destination",
+                    message="Field required",
+                )
+            ],
+        )
+    return ParseResult(
+        file_path=f"/src/manifests/team-{index % 50}/{name}.yaml",
+        status="success",
+        output_path=f"/src/output/{name}.json",
+        application_name=name,
+    )
+
+
+def measure(files: int, keep: Callable[[int, ParseResult], None]) -> float:
+    """Bytes still allocated per file after keeping every result."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for index in range(files):
+        keep(index, make_result(index, failed=index % 2 == 1))
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / files
+
+
+def main() -> None:
+    """Run the benchmark and print bytes per file."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=100000)
+    args = parser.parse_args()
+    print(f"{args.files} files, half of them failed")
+
+    models: list[ParseResult] = []
+    per_file = measure(args.files, lambda index, result: models.append(result))
+    print(f"{'ParseResult list':>28}: {per_file:7.0f} bytes/file")
+    models.clear()
+
+    with tempfile.TemporaryDirectory() as spill_dir:
+        for limit in (args.files, 1000):
+            with ResultStore(failures_in_memory=limit, spill_dir=Path(spill_dir)) as store:
+                per_file = measure(args.files, store.add)
+                label = f"ResultStore ({limit} in mem)"
+                print(f"{label:>28}: {per_file:7.0f} bytes/file ({store.spilled} spilled)")
+
+
+if __name__ == "__main__":
+    main()
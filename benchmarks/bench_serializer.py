@@ -0,0 +1,83 @@
+"""Micro-benchmark the per-object cost of each JSON serializer backend.
+
+Builds a representative MigrationOutput and times serializing it with the
+original ``model_dump`` + ``json.dumps`` path and every available backend in
+pretty and compact styles:
+
+    uv run python benchmarks/bench_serializer.py --iterations 20000
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from parser.models import (  # noqa: E402
+    MigrationOutput,
+    OutputDestination,
+    OutputDirectoryConfig,
+    OutputMetadata,
+    OutputSource,
+)
+from parser.serializer import (  # noqa: E402
+    JsonStyle,
+    ResolvedBackend,
+    orjson_available,
+    serialize_model,
+)
+
+
+def sample_output() -> MigrationOutput:
+    """Build a migration output of typical size."""
+    return MigrationOutput(
+        metadata=OutputMetadata(
+            name="payments-api",
+            annotations={f"argocdSyncWave{i}": str(i) for i in range(4)},
+            labels={"team": "payments", "environment": "production", "tier": "backend"},
+        ),
+        project="payments",
+        source=OutputSource(
+            repoURL="https://github.com/org/payments.git",
+            revision="v1.42.0",
+            manifestPath="deploy/overlays/production",
+            directory=OutputDirectoryConfig(recurse=True),
+        ),
+        destination=OutputDestination(clusterName="prod-eu-1", namespace="payments"),
+        enableSyncPolicy=True,
+    )
+
+
+def legacy_dump(output: MigrationOutput) -> bytes:
+    """The serialization path used before the serializer layer existed."""
+    return json.dumps(output.model_dump(mode="json"), indent=2, ensure_ascii=False).encode()
+
+
+def main() -> None:
+    """Run the benchmark and print microseconds per object."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    output = sample_output()
+    backends: list[ResolvedBackend] = ["json", "pydantic"]
+    if orjson_available():
+        backends.append("orjson")
+    styles: list[JsonStyle] = ["pretty", "compact"]
+
+    def report(label: str, seconds: float) -> None:
+        print(f"{label:>20}: {seconds / args.iterations * 1e6:7.2f} us/object")
+
+    report("legacy", timeit.timeit(lambda: legacy_dump(output), number=args.iterations))
+    for backend in backends:
+        for style in styles:
+            seconds = timeit.timeit(
+                lambda: serialize_model(output, style, backend), number=args.iterations
+            )
+            report(f"{backend} {style}", seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,39 @@
 """Batch processing functions for multiple ArgoCD manifests."""
 
-from collections.abc import Callable
+import threading
+from collections.abc import Callable, Collection, Iterable, Sequence
+from contextlib import nullcontext
+from functools import partial
 from pathlib import Path
+from typing import Any
 
 from rich.console import Console
-from rich.progress import (
-    BarColumn,
-    Progress,
-    SpinnerColumn,
-    TextColumn,
-    TimeElapsedColumn,
+from rich.markup import escape
+
+from parser.core import parse_and_render, unexpected_error_result, worker_lost_result
+from parser.executor import (
+    TASKS_IN_FLIGHT_PER_WORKER,
+    ExecutionPlan,
+    ExecutorKind,
+    iter_job_results,
 )
-
-from parser.core import parse_and_write
-from parser.models import BatchSummary, ParseResult
+from parser.layout import OutputLayout
+from parser.memory import MemoryGovernor
+from parser.models import BatchSummary, ParseResult, ValidationError
+from parser.output import OutputConflictError, OutputDirectory, OutputSink, ValidationOutput
+from parser.planner import plan_execution
+from parser.progress import BatchProgress
+from parser.results import ResultStore
+from parser.serializer import JsonStyle, SerializerBackend, resolve_backend
+from parser.signatures import ErrorSignatureCounter, count_signatures
+from scanner.throttle import IOThrottle
 
 console = Console()
 
+# Failure signatures and failed files listed by format_batch_summary
+SIGNATURES_SHOWN = 10
+FAILED_FILES_LISTED = 20
+
 
 def find_yaml_files(directory: Path, recursive: bool = True) -> list[Path]:
     """Find all YAML files in a directory.
@@ -54,111 +71,328 @@ def process_files_batch(
     default_labels: dict[str, str] | None = None,
     show_progress: bool = True,
     progress_callback: Callable[[str, str], None] | None = None,
+    result_callback: Callable[[ParseResult], None] | None = None,
+    executor: ExecutorKind = "serial",
+    max_workers: int | None = None,
+    plan: ExecutionPlan | None = None,
+    max_failures: int | None = None,
+    failed_first: Collection[str] = (),
+    max_rss: int | None = None,
+    throttle: IOThrottle | None = None,
+    json_style: JsonStyle = "pretty",
+    serializer: SerializerBackend = "auto",
+    sink: OutputSink | None = None,
+    layout: OutputLayout | None = None,
+    validate_only: bool = False,
+    keep_results: bool = True,
+    result_store: ResultStore | None = None,
+    verbose: bool = False,
 ) -> BatchSummary:
     """Process multiple YAML files in batch mode.
 
+    Files are parsed and rendered by the selected executor; claiming output
+    names, writing files, counting, progress output and callbacks always run
+    in the calling thread, so the thread and process executors share no
+    mutable state with the workers. The output directory is locked for the
+    run; a manifest whose application name was already produced by another
+    manifest (in this run or a concurrent one) fails with DUPLICATE_OUTPUT.
+
+    Results are handled in the order a serial run handles files (failed_first
+    files, then input order), whatever order they complete in, so the same
+    manifest wins a contested name with every executor. Parallel runs
+    dispatch files in that order too, which keeps the results waiting for an
+    earlier file to a few tasks' worth.
+
     Args:
         files: List of YAML file paths to process
         output_dir: Output directory for JSON files
         cluster_mappings: Optional cluster URL to name mappings
         default_labels: Optional default labels
-        show_progress: Whether to show progress bar
+        show_progress: Whether to show progress (a bar redrawn at a fixed rate
+            on a terminal, periodic rate/ETA lines otherwise) and a line per
+            failed file
         progress_callback: Optional callback for progress updates (file_path, status)
+        result_callback: Optional callback invoked with each result as soon as it
+            completes (e.g. ResultJournal.append for crash-safe checkpoints)
+        executor: Execution strategy ("serial", "threads", "processes" or "auto",
+            which may calibrate the machine and cache a profile; see plan_execution)
+        max_workers: Upper bound on parallel workers (defaults to one per CPU)
+        plan: Pre-computed execution plan; overrides executor and max_workers
+        max_failures: Stop after this many failures; queued files are cancelled,
+            in-flight files finish cleanly, and unprocessed files are reported
+            as skipped
+        failed_first: File paths (e.g. earlier failures) to process before the rest
+        max_rss: Memory cap in bytes for the run and its workers; parallel
+            dispatch is throttled or paused near the cap
+        throttle: Optional I/O throttle shared by every worker's file reads
+        json_style: Output JSON style, "pretty" or "compact"
+        serializer: Serializer backend ("auto", "pydantic", "orjson" or "json")
+        sink: Where rendered outputs go (e.g. an AggregateOutputFile); defaults
+            to a locked OutputDirectory at output_dir
+        layout: Layout of the default OutputDirectory (flat if omitted)
+        validate_only: Only validate and transform manifests in memory: nothing
+            is serialized or written and output_dir is not used; duplicate
+            application names are still reported
+        keep_results: Keep every result in the summary; if False (results
+            are consumed through result_callback instead), the summary only
+            lists files skipped because the run stopped early
+        result_store: Keep results in this bounded-memory store instead of
+            the summary (whose results list is then empty); overrides
+            keep_results
+        verbose: With show_progress, print a line for every file, not only
+            failures
 
     Returns:
-        BatchSummary with results for all files
+        BatchSummary with results for all files (see keep_results), in input order
+
+    Raises:
+        OSError: If the output directory cannot be created or locked
+        ValueError: If the requested serializer is not installed
     """
-    results: list[ParseResult] = []
+    if plan is None:
+        plan = plan_execution(files, executor, max_workers, throttle=throttle)
+    if result_store is not None:
+        keep_results = False
+
+    results: list[ParseResult | None] = [None] * len(files) if keep_results else []
+    # One flag per file, so unprocessed files are known without keeping results
+    done = bytearray(len(files))
+    cancel = threading.Event()
+    governor = (
+        MemoryGovernor(max_rss, plan.workers * TASKS_IN_FLIGHT_PER_WORKER)
+        if max_rss is not None
+        else None
+    )
+    priority = [index for index, path in enumerate(files) if str(path) in failed_first]
+    first = set(priority)
+    handling_order: Sequence[int] = (
+        sorted(range(len(files)), key=lambda i: i not in first) if first else range(len(files))
+    )
     successful = 0
     failed = 0
     skipped = 0
+    signatures = ErrorSignatureCounter()
 
+    progress: BatchProgress | None = None
     if show_progress and len(files) > 1:
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-            TimeElapsedColumn(),
-            console=console,
-        ) as progress:
-            task = progress.add_task("Processing files...", total=len(files))
-
-            for file_path in files:
-                # Update progress description
-                progress.update(task, description=f"Processing {file_path.name}")
-
-                # Parse file (with error isolation)
-                result = parse_and_write(
-                    input_file=file_path,
-                    output_dir=output_dir,
-                    cluster_mappings=cluster_mappings,
-                    default_labels=default_labels,
-                )
-
-                results.append(result)
-
-                # Update counts
-                if result.status == "success":
-                    successful += 1
-                    if progress_callback:
-                        progress_callback(str(file_path), "success")
-                    console.print(
-                        f"[green]✓[/green] {file_path.name}: {result.application_name}"
-                    )
-                elif result.status == "failed":
-                    failed += 1
-                    if progress_callback:
-                        progress_callback(str(file_path), "failed")
-                    error_msg = result.errors[0].message if result.errors else "Unknown error"
-                    console.print(f"[red]✗[/red] {file_path.name}: {error_msg}")
-                else:
-                    skipped += 1
-                    if progress_callback:
-                        progress_callback(str(file_path), "skipped")
-                    console.print(f"[yellow]⊘[/yellow] {file_path.name}: Skipped")
-
-                progress.advance(task)
-    else:
-        # Process without progress bar
-        for file_path in files:
-            result = parse_and_write(
-                input_file=file_path,
-                output_dir=output_dir,
-                cluster_mappings=cluster_mappings,
-                default_labels=default_labels,
+        progress = BatchProgress(len(files), console, verbose)
+
+    def on_wait() -> None:
+        if show_progress:
+            console.print(
+                f"[yellow]Waiting for another run to release {output_dir}...[/yellow]"
             )
 
-            results.append(result)
+    outputs: OutputSink
+    if sink is not None:
+        outputs = sink
+    elif validate_only:
+        outputs = ValidationOutput()
+    else:
+        outputs = OutputDirectory(output_dir, (str(path) for path in files), on_wait, layout)
+    if plan.largest_first:
+        # Results wait for every file handled before them; dispatching in
+        # handling order keeps that wait short
+        plan = plan.model_copy(update={"largest_first": False})
+    job = partial(
+        parse_and_render,
+        cluster_mappings=cluster_mappings,
+        default_labels=default_labels,
+        throttle=throttle,
+        style=outputs.json_style or json_style,
+        backend=resolve_backend(serializer),
+        render=not validate_only,
+    )
 
-            if result.status == "success":
-                successful += 1
-                if progress_callback:
-                    progress_callback(str(file_path), "success")
-            elif result.status == "failed":
-                failed += 1
-                if progress_callback:
-                    progress_callback(str(file_path), "failed")
+    def on_worker_lost(path: Path, error: BaseException) -> tuple[ParseResult, None]:
+        # The pool cannot run anything else: fail the lost files, skip the rest
+        cancel.set()
+        return worker_lost_result(path, error), None
+
+    def handle(index: int, result: ParseResult, rendered: bytes | None) -> None:
+        nonlocal successful, failed, skipped
+        file_path = files[index]
+        if rendered is not None:
+            result = _store_output(outputs, result, rendered)
+        elif validate_only and result.status == "success":
+            result = _claim_output(outputs, result) or result
+        done[index] = 1
+        if result_store is not None:
+            result_store.add(index, result)
+        elif keep_results:
+            results[index] = result
+
+        # Update counts
+        if result.status == "success":
+            successful += 1
+        elif result.status == "failed":
+            failed += 1
+            signatures.add(result)
+        else:
+            skipped += 1
+
+        if result_callback:
+            result_callback(result)
+        if progress_callback:
+            progress_callback(str(file_path), result.status)
+
+        if progress is not None:
+            progress.advance(file_path, result)
+
+        if max_failures is not None and failed >= max_failures and not cancel.is_set():
+            cancel.set()
+
+    # Completed results waiting for a file handled before them
+    waiting: dict[int, tuple[ParseResult, bytes | None]] = {}
+    position = 0
+    with outputs, progress if progress is not None else nullcontext():
+        for index, completed in iter_job_results(
+            files, job, plan, cancel, priority, governor, on_worker_lost
+        ):
+            waiting[index] = completed
+            while position < len(files) and handling_order[position] in waiting:
+                next_index = handling_order[position]
+                handle(next_index, *waiting.pop(next_index))
+                position += 1
+        # A cancelled run never completes some files; handle the rest in order
+        for index in sorted(waiting, key=lambda i: (i not in first, i)):
+            handle(index, *waiting.pop(index))
+
+    # Files never started because the run was cancelled
+    for index, finished in enumerate(done):
+        if not finished:
+            skipped_result = ParseResult(file_path=str(files[index]), status="skipped")
+            if result_store is not None:
+                result_store.add(index, skipped_result)
+            elif keep_results:
+                results[index] = skipped_result
             else:
-                skipped += 1
-                if progress_callback:
-                    progress_callback(str(file_path), "skipped")
+                results.append(skipped_result)
+            skipped += 1
 
     return BatchSummary(
         total=len(files),
         successful=successful,
         failed=failed,
         skipped=skipped,
+        written=outputs.written,
+        unchanged=outputs.unchanged,
+        stopped_early=cancel.is_set(),
+        results=[result for result in results if result is not None],
+        throttle_events=governor.events if governor else [],
+        throttle_events_dropped=governor.dropped_events if governor else 0,
+        error_signatures=signatures.signatures(),
+    )
+
+
+def duplicate_output_result(result: ParseResult, owner: str) -> ParseResult:
+    """Turn a successful result into a DUPLICATE_OUTPUT failure.
+
+    Args:
+        result: Successful result whose application name is already taken
+        owner: Source manifest that produces the name
+
+    Returns:
+        Failed result naming the owner
+    """
+    name = result.application_name or ""
+    return ParseResult(
+        file_path=result.file_path,
+        status="failed",
+        application_name=name,
+        errors=[
+            ValidationError(
+                error_type="DUPLICATE_OUTPUT",
+                field="metadata.name",
+                message=f"{name}.json is already produced by {owner}",
+            )
+        ],
+    )
+
+
+def _claim_output(outputs: OutputSink, result: ParseResult) -> ParseResult | None:
+    """Claim a parsed result's output name.
+
+    Args:
+        outputs: Output sink of the run
+        result: Successful result
+
+    Returns:
+        A failed DUPLICATE_OUTPUT result if the name is already taken,
+        otherwise None
+    """
+    owner = outputs.claim(result.application_name or "", result.file_path)
+    if owner is None:
+        return None
+    return duplicate_output_result(result, owner)
+
+
+def _store_output(outputs: OutputSink, result: ParseResult, rendered: bytes) -> ParseResult:
+    """Claim a parsed result's output name and write its JSON.
+
+    Args:
+        outputs: Output sink of the run
+        result: Successful result without an output path
+        rendered: Rendered JSON output
+
+    Returns:
+        The result with its output path, or a failed result if the name is
+        already taken, the sink refuses the output or the file cannot be
+        written
+    """
+    duplicate = _claim_output(outputs, result)
+    if duplicate is not None:
+        return duplicate
+
+    name = result.application_name or ""
+    try:
+        location = outputs.write(name, rendered)
+    except OutputConflictError as e:
+        return ParseResult(
+            file_path=result.file_path,
+            status="failed",
+            application_name=name,
+            errors=[ValidationError(error_type="DUPLICATE_OUTPUT", message=str(e))],
+        )
+    except OSError as e:
+        return unexpected_error_result(Path(result.file_path), e)
+    return result.model_copy(update={"output_path": str(location)})
+
+
+def summarize_results(results: list[ParseResult]) -> BatchSummary:
+    """Build a batch summary from a list of results.
+
+    Args:
+        results: Parse results, in the order they should be reported
+
+    Returns:
+        BatchSummary counting each result by status
+    """
+    successful = sum(1 for result in results if result.status == "success")
+    failed = sum(1 for result in results if result.status == "failed")
+    return BatchSummary(
+        total=len(results),
+        successful=successful,
+        failed=failed,
+        skipped=len(results) - successful - failed,
         results=results,
+        error_signatures=count_signatures(results),
     )
 
 
-def format_batch_summary(summary: BatchSummary, show_details: bool = True) -> None:
+def format_batch_summary(
+    summary: BatchSummary,
+    show_details: bool = True,
+    results: Iterable[ParseResult] | None = None,
+) -> None:
     """Format and print batch processing summary.
 
     Args:
         summary: BatchSummary with processing results
-        show_details: Whether to show detailed per-file results
+        show_details: Whether to show failures grouped by signature and,
+            if there are at most FAILED_FILES_LISTED, every failed file
+        results: Results to detail instead of summary.results (e.g. the
+            failures of a ResultStore)
     """
     console.print("\n[bold]Batch Summary:[/bold]")
     console.print(f"  Total: {summary.total}")
@@ -182,10 +416,55 @@ def format_batch_summary(summary: BatchSummary, show_details: bool = True) -> No
 
     console.print(f"  [{color}]Success Rate: {success_rate:.1f}%[/{color}]")
 
-    # Detailed errors (if requested and there are failures)
-    if show_details and summary.failed > 0:
+    if summary.written or summary.unchanged:
+        console.print(
+            f"  Outputs: {summary.written} written, {summary.unchanged} unchanged"
+        )
+
+    if summary.throttle_events:
+        pauses = sum(1 for event in summary.throttle_events if event.action == "pause")
+        peak = max(event.rss_bytes for event in summary.throttle_events)
+        adjustments = len(summary.throttle_events) + summary.throttle_events_dropped
+        # Pauses and peak only cover the recorded events
+        at_least = "+" if summary.throttle_events_dropped else ""
+        console.print(
+            f"  [yellow]Memory throttling: {adjustments} adjustment(s), "
+            f"{pauses}{at_least} pause(s), peak {peak / 1024**2:.0f}{at_least} MiB[/yellow]"
+        )
+
+    if summary.stopped_early:
+        console.print(
+            f"  [yellow]Stopped early after {summary.failed} failure(s); "
+            f"{summary.skipped} file(s) not processed[/yellow]"
+        )
+
+    if show_details and summary.error_signatures:
+        console.print("\n[bold red]Failures by Signature:[/bold red]")
+        for signature in summary.error_signatures[:SIGNATURES_SHOWN]:
+            field = f"{signature.field}: " if signature.field else ""
+            console.print(
+                f"  • {signature.count} × {signature.error_type} "
+                f"{escape(field + signature.message)}"
+            )
+            more = signature.count - len(signature.sample_files)
+            console.print(
+                f"    [dim]e.g. {escape(', '.join(signature.sample_files))}"
+                + (f" (+{more} more)" if more > 0 else "")
+                + "[/dim]"
+            )
+        hidden = len(summary.error_signatures) - SIGNATURES_SHOWN
+        if hidden > 0:
+            console.print(f"  … and {hidden} more signature(s); see --json for all")
+
+    # Every failed file, when there are few enough to read
+    if show_details and summary.failed > FAILED_FILES_LISTED:
+        console.print(
+            f"\n[dim]{summary.failed} failed files not listed individually; "
+            "use --json for every failure[/dim]"
+        )
+    elif show_details and summary.failed > 0:
         console.print("\n[bold red]Failed Files:[/bold red]")
-        for result in summary.results:
+        for result in summary.results if results is None else results:
             if result.status == "failed":
                 console.print(f"  • {result.file_path}")
                 for error in result.errors:
@@ -193,3 +472,78 @@ def format_batch_summary(summary: BatchSummary, show_details: bool = True) -> No
                         console.print(f"    - {error.field}: {error.message}")
                     else:
                         console.print(f"    - {error.message}")
+
+
+def result_to_dict(result: ParseResult) -> dict[str, Any]:
+    """Convert a parse result to its machine-readable JSON record.
+
+    Args:
+        result: Parse result to convert
+
+    Returns:
+        Dictionary in the ``--json`` results format
+    """
+    return {
+        "file": result.file_path,
+        "status": result.status,
+        "output": result.output_path,
+        "application_name": result.application_name,
+        "errors": [
+            {
+                "type": error.error_type,
+                "field": error.field,
+                "message": error.message,
+            }
+            for error in result.errors
+        ],
+    }
+
+
+def result_from_dict(data: dict[str, Any]) -> ParseResult:
+    """Rebuild a parse result from its machine-readable JSON record.
+
+    Args:
+        data: Dictionary in the ``--json`` results format
+
+    Returns:
+        Equivalent ParseResult
+
+    Raises:
+        KeyError: If required keys are missing
+    """
+    return ParseResult(
+        file_path=data["file"],
+        status=data["status"],
+        output_path=data.get("output"),
+        application_name=data.get("application_name"),
+        errors=[
+            ValidationError(
+                error_type=error["type"],
+                field=error.get("field"),
+                message=error["message"],
+            )
+            for error in data.get("errors") or []
+        ],
+    )
+
+
+def summary_counts_to_dict(summary: BatchSummary) -> dict[str, Any]:
+    """Convert batch summary counters to the ``--json`` summary format.
+
+    Args:
+        summary: Batch summary to convert
+
+    Returns:
+        Dictionary with total, successful, failed, skipped, success_rate,
+        stopped_early and the written/unchanged output counts
+    """
+    return {
+        "total": summary.total,
+        "successful": summary.successful,
+        "failed": summary.failed,
+        "skipped": summary.skipped,
+        "success_rate": round(summary.success_rate, 1),
+        "stopped_early": summary.stopped_early,
+        "written": summary.written,
+        "unchanged": summary.unchanged,
+    }
@@ -0,0 +1,217 @@
+"""Compressed tar bundle of migration outputs, with a member index.
+
+``--output-bundle out.tar.zst`` replaces "write the output directory, then
+tar it" with a single archive that needs no output files on disk. Records
+are streamed into the compressed archive as ``<name>.json`` members with
+fixed ownership and mtimes, in the order the batch hands them over (the
+order a serial run processes files, whatever the executor), so identical
+runs produce identical bundles.
+
+The tar stream is compressed as a series of independent gzip members or
+zstd frames of about ``BUNDLE_FRAME_BYTES`` each; standard tools still see
+one ordinary ``.tar.gz``/``.tar.zst``. A sidecar ``<bundle>.index.json``
+records, for every application, the compressed frame holding its member
+and the member's position within that frame, so read_bundle_member() can
+extract one application by decompressing a single frame.
+"""
+
+import gzip
+import json
+import os
+import tarfile
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Any
+
+from parser.output import Compression, NameClaims, atomic_write_text, resolve_compression
+from parser.serializer import JsonStyle
+
+# Uncompressed tar bytes per independently compressed frame
+BUNDLE_FRAME_BYTES = 1024 * 1024
+
+# Suffix of the member index written next to the bundle
+INDEX_SUFFIX = ".index.json"
+
+# Environment variable for a reproducible-builds member mtime
+SOURCE_DATE_EPOCH_ENV_VAR = "SOURCE_DATE_EPOCH"
+
+
+def bundle_index_path(bundle: Path) -> Path:
+    """Return the member index file of a bundle."""
+    return bundle.with_name(bundle.name + INDEX_SUFFIX)
+
+
+def _member_mtime() -> int:
+    try:
+        return int(os.environ.get(SOURCE_DATE_EPOCH_ENV_VAR, "0"))
+    except ValueError:
+        return 0
+
+
+def _compress_frame(data: bytes, compression: Compression) -> bytes:
+    if compression == "gzip":
+        return gzip.compress(data, mtime=0)
+    if compression == "zstd":
+        import zstandard
+
+        frame: bytes = zstandard.ZstdCompressor().compress(data)
+        return frame
+    return data
+
+
+def _decompress_frame(data: bytes, compression: Compression) -> bytes:
+    if compression == "gzip":
+        return gzip.decompress(data)
+    if compression == "zstd":
+        import zstandard
+
+        frame: bytes = zstandard.ZstdDecompressor().decompress(data)
+        return frame
+    return data
+
+
+class OutputBundle:
+    """Output sink writing every output into one (compressed) tar archive."""
+
+    def __init__(self, path: Path, compression: Compression = "auto") -> None:
+        """Prepare a bundle; it is opened by entering the context.
+
+        Args:
+            path: Bundle file, e.g. out.tar.zst
+            compression: "auto" (from the file suffix), "none", "gzip" or "zstd"
+
+        Raises:
+            ValueError: If the compression is unavailable
+        """
+        self.path = path
+        self.compression = resolve_compression(path, compression)
+        self.json_style: JsonStyle | None = None
+        self.written = 0
+        self.unchanged = 0
+        self._temp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        self._out: IO[bytes] | None = None
+        self._mtime = _member_mtime()
+        # Uncompressed tar bytes of the current frame, and its members' positions
+        self._frame = bytearray()
+        self._frame_members: list[tuple[str, int, int]] = []
+        self._frame_offset = 0
+        self._index: dict[str, dict[str, Any]] = {}
+        self._claims = NameClaims()
+
+    def __enter__(self) -> "OutputBundle":
+        """Create the temporary archive file.
+
+        Raises:
+            OSError: If the file cannot be created
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._out = open(self._temp, "wb")
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Finish the archive and write its index, or discard it if the run failed."""
+        assert self._out is not None
+        try:
+            if exc_type is None:
+                # End-of-archive marker: two zero blocks
+                self._frame += bytes(2 * tarfile.BLOCKSIZE)
+                self._flush_frame()
+                self._out.close()
+                os.replace(self._temp, self.path)
+                index_data = {"compression": self.compression, "members": self._index}
+                atomic_write_text(
+                    bundle_index_path(self.path),
+                    json.dumps(index_data, indent=0, sort_keys=True) + "\n",
+                )
+        finally:
+            self._out.close()
+            self._temp.unlink(missing_ok=True)
+
+    def _add_member(self, name: str, data: bytes) -> None:
+        info = tarfile.TarInfo(f"{name}.json")
+        info.size = len(data)
+        info.mtime = self._mtime
+        info.mode = 0o644
+        self._frame += info.tobuf(tarfile.GNU_FORMAT, "utf-8", "surrogateescape")
+        self._frame_members.append((name, len(self._frame), len(data)))
+        self._frame += data
+        self._frame += bytes(-len(data) % tarfile.BLOCKSIZE)
+        if len(self._frame) >= BUNDLE_FRAME_BYTES:
+            self._flush_frame()
+
+    def _flush_frame(self) -> None:
+        assert self._out is not None
+        compressed = _compress_frame(bytes(self._frame), self.compression)
+        self._out.write(compressed)
+        for name, offset, size in self._frame_members:
+            self._index[name] = {
+                "member": f"{name}.json",
+                "frame_offset": self._frame_offset,
+                "frame_size": len(compressed),
+                "offset": offset,
+                "size": size,
+            }
+        self._frame_offset += len(compressed)
+        self._frame.clear()
+        self._frame_members.clear()
+
+    def claim(self, name: str, source: str) -> str | None:
+        """Claim an application name (its member name) for this run.
+
+        Args:
+            name: Application name
+            source: Manifest producing the output
+
+        Returns:
+            The manifest that already owns the name, or None if the claim
+            succeeded
+        """
+        return self._claims.claim(name, source)
+
+    def write(self, name: str, data: bytes) -> Path:
+        """Append one rendered output to the archive.
+
+        Args:
+            name: Application name
+            data: Rendered JSON
+
+        Returns:
+            Path of the bundle (moved into place when the run ends)
+
+        Raises:
+            OSError: If the archive cannot be written
+        """
+        self._add_member(name, data)
+        self.written += 1
+        return self.path
+
+
+def read_bundle_member(bundle: Path, name: str) -> bytes:
+    """Extract one application's JSON from a bundle using its index.
+
+    Only the compressed frame holding the member is read and decompressed.
+
+    Args:
+        bundle: Bundle written by OutputBundle
+        name: Application name
+
+    Returns:
+        The application's JSON output
+
+    Raises:
+        OSError: If the bundle or its index cannot be read
+        KeyError: If the application is not in the bundle
+    """
+    with open(bundle_index_path(bundle), encoding="utf-8") as f:
+        index = json.load(f)
+    entry = index["members"][name]
+    with open(bundle, "rb") as f:
+        f.seek(entry["frame_offset"])
+        frame = _decompress_frame(f.read(entry["frame_size"]), index["compression"])
+    member: bytes = frame[entry["offset"] : entry["offset"] + entry["size"]]
+    return member
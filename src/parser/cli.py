@@ -1,14 +1,53 @@
 """CLI interface for ArgoCD YAML Parser."""
 
 import json
+import sys
+from collections.abc import Iterable, Iterator
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Any
 
 import typer
 from rich.console import Console
 
-from parser.batch import find_yaml_files, format_batch_summary, process_files_batch
-from parser.core import parse_and_write
+from parser.batch import (
+    find_yaml_files,
+    format_batch_summary,
+    process_files_batch,
+    result_to_dict,
+    summarize_results,
+    summary_counts_to_dict,
+)
+from parser.bundle import OutputBundle
+from parser.core import parse_and_render, parse_and_write
+from parser.diff import OutputPlan
+from parser.executor import ExecutorKind
+from parser.grouping import DEFAULT_MAX_OPEN_FILES, GroupedConfigOutput
+from parser.journal import ResultJournal, load_failed_files, load_journal
+from parser.layout import OutputLayout
+from parser.merge import LinkMode, SummaryMerger, place_outputs, relative_output_path
+from parser.models import ParseResult
+from parser.output import (
+    AggregateOutputFile,
+    Compression,
+    OutputFormat,
+    OutputSink,
+)
+from parser.planner import plan_execution
+from parser.query import QueryIndex, parse_query
+from parser.results import ResultStore
+from parser.serializer import SerializerBackend, resolve_backend
+from parser.sharding import ShardSpec, parse_shard_spec, select_shard
+from parser.signatures import combine_signatures
+from parser.store import SqliteOutputStore
+from scanner.throttle import (
+    IO_BUCKET_ENV_VAR,
+    MAX_OPEN_RATE_ENV_VAR,
+    MAX_READ_RATE_ENV_VAR,
+    IOStats,
+    IOThrottle,
+    parse_size,
+)
 
 app = typer.Typer(
     name="argocd-parse",
@@ -43,8 +82,102 @@ def load_config(config_path: Path) -> dict[str, dict[str, str]]:
         raise typer.Exit(1)
 
 
-@app.command()
+def _load_failed_files(path: Path) -> set[str]:
+    """Load previously failed files from a journal or summary, exiting on error.
+
+    Args:
+        path: Journal or ``--json`` summary path
+
+    Returns:
+        Source file paths that failed
+
+    Raises:
+        typer.Exit: If the file cannot be read or is not recognized
+    """
+    try:
+        return load_failed_files(path)
+    except (OSError, ValueError) as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+
+def _emit_record(record: dict[str, Any]) -> None:
+    """Write one NDJSON record to stdout and flush it for live consumers.
+
+    Args:
+        record: JSON-serializable record
+    """
+    sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+
+
+def _print_json_results(output: dict[str, Any], results: Iterable[ParseResult]) -> None:
+    """Print the ``--json`` document with a results array streamed from an iterable.
+
+    The output matches ``json.dumps(..., indent=2)`` with "results" as the
+    last key, without building every result record first.
+
+    Args:
+        output: The document without its results (must not be empty)
+        results: Results to list, in order
+    """
+    # Drop the closing "\n}" to append the results key
+    sys.stdout.write(json.dumps(output, indent=2)[:-2] + ',\n  "results": [')
+    separator = "\n    "
+    for result in results:
+        record = json.dumps(result_to_dict(result), indent=2).replace("\n", "\n    ")
+        sys.stdout.write(separator + record)
+        separator = ",\n    "
+    sys.stdout.write("]\n}\n" if separator == "\n    " else "\n  ]\n}\n")
+
+
+def _merge_previous(
+    all_files: list[Path], previous: dict[str, ParseResult], results: Iterable[ParseResult]
+) -> Iterator[ParseResult]:
+    """Interleave results from before a restart with this run's, in input order.
+
+    Args:
+        all_files: Every file of the run, in input order
+        previous: Results completed before the restart, by file path
+        results: This run's results, in input order (the files not in previous)
+
+    Yields:
+        One result per file of all_files
+    """
+    remaining = iter(results)
+    for path in all_files:
+        yield previous.get(str(path)) or next(remaining)
+
+
+def _print_plan(plan: OutputPlan) -> None:
+    """Print planned output changes, terraform-plan style.
+
+    Args:
+        plan: Finished output plan
+    """
+    symbols = {
+        "create": "[green]+[/green]",
+        "change": "[yellow]~[/yellow]",
+        "delete": "[red]-[/red]",
+    }
+    console.print("\n[bold]Planned Changes:[/bold]")
+    for change in plan.changes:
+        console.print(
+            f"  {symbols[change.action]} {change.application_name} "
+            f"[dim]{change.output_path}[/dim]"
+        )
+        for field in change.fields:
+            console.print(f"      {field.field}: {json.dumps(field.old)} → {json.dumps(field.new)}")
+    counts = plan.counts()
+    console.print(
+        f"\n  Plan: {counts['create']} to create, {counts['change']} to change, "
+        f"{counts['delete']} to delete, {counts['unchanged']} unchanged"
+    )
+
+
+@app.callback(invoke_without_command=True)
 def parse(
+    ctx: typer.Context,
     file: Annotated[
         Path | None,
         typer.Option(
@@ -107,6 +240,287 @@ def parse(
             help="Output results in JSON format for automation (batch mode only)",
         ),
     ] = False,
+    json_stream: Annotated[
+        bool,
+        typer.Option(
+            "--json-stream",
+            help=(
+                "Print one NDJSON result record per file as it completes, then a summary "
+                "record; results are not kept in memory (batch mode only)"
+            ),
+        ),
+    ] = False,
+    executor: Annotated[
+        ExecutorKind,
+        typer.Option(
+            "--executor",
+            "-e",
+            help=(
+                "Batch execution strategy: 'auto' (chosen from file count, size and a "
+                "cached calibration run), 'serial', 'threads' (best on free-threaded "
+                "Python builds) or 'processes'"
+            ),
+        ),
+    ] = "auto",
+    workers: Annotated[
+        int | None,
+        typer.Option(
+            "--workers",
+            "-w",
+            help="Maximum number of parallel workers (default: one per CPU)",
+            min=1,
+        ),
+    ] = None,
+    shard: Annotated[
+        str | None,
+        typer.Option(
+            "--shard",
+            help=(
+                "Process only shard INDEX of COUNT (e.g. 2/4, 1-based); files are assigned "
+                "by a stable hash of their path relative to --directory (batch mode only)"
+            ),
+        ),
+    ] = None,
+    journal: Annotated[
+        Path | None,
+        typer.Option(
+            "--journal",
+            help=(
+                "Append each result to this checkpoint journal as soon as it completes "
+                "(batch mode only)"
+            ),
+            dir_okay=False,
+            resolve_path=True,
+        ),
+    ] = None,
+    resume: Annotated[
+        bool,
+        typer.Option(
+            "--resume",
+            help="Skip files already recorded in --journal by an interrupted run",
+        ),
+    ] = False,
+    retry_failed: Annotated[
+        Path | None,
+        typer.Option(
+            "--retry-failed",
+            help="Reprocess only the files that failed in this journal or --json summary",
+            exists=True,
+            dir_okay=False,
+            resolve_path=True,
+        ),
+    ] = None,
+    fail_fast: Annotated[
+        bool,
+        typer.Option(
+            "--fail-fast",
+            help="Stop at the first failure (same as --max-failures 1)",
+        ),
+    ] = False,
+    max_failures: Annotated[
+        int | None,
+        typer.Option(
+            "--max-failures",
+            help=(
+                "Stop after N failures: queued files are cancelled, in-flight files "
+                "finish cleanly and a partial summary is reported (batch mode only)"
+            ),
+            min=1,
+        ),
+    ] = None,
+    failed_first: Annotated[
+        Path | None,
+        typer.Option(
+            "--failed-first",
+            help="Process files that failed in this journal or --json summary before the rest",
+            exists=True,
+            dir_okay=False,
+            resolve_path=True,
+        ),
+    ] = None,
+    max_rss: Annotated[
+        str | None,
+        typer.Option(
+            "--max-rss",
+            help=(
+                "Memory cap for the run and its workers (e.g. 512M, 2G); parallel dispatch "
+                "slows down or pauses near the cap (batch mode only)"
+            ),
+        ),
+    ] = None,
+    max_read_rate: Annotated[
+        str | None,
+        typer.Option(
+            "--max-read-rate",
+            help="Limit manifest reads to this many bytes per second (e.g. 20M)",
+            envvar=MAX_READ_RATE_ENV_VAR,
+        ),
+    ] = None,
+    max_open_rate: Annotated[
+        float | None,
+        typer.Option(
+            "--max-open-rate",
+            help="Limit manifest opens to this many files per second",
+            envvar=MAX_OPEN_RATE_ENV_VAR,
+            min=0.001,
+        ),
+    ] = None,
+    io_bucket: Annotated[
+        Path | None,
+        typer.Option(
+            "--io-bucket",
+            help=(
+                "Shared I/O budget state file; argocd-scan and argocd-parse runs using "
+                "the same file share one budget"
+            ),
+            envvar=IO_BUCKET_ENV_VAR,
+            dir_okay=False,
+            resolve_path=True,
+        ),
+    ] = None,
+    output_format: Annotated[
+        OutputFormat,
+        typer.Option(
+            "--output-format",
+            help=(
+                "'files' (one JSON file per application in --output-dir), 'grouped' (one "
+                "config.json array per --group-by value in --output-dir), or stream every "
+                "application into --output-file as 'ndjson' or a 'json-array' (batch mode only)"
+            ),
+        ),
+    ] = "files",
+    group_by: Annotated[
+        str,
+        typer.Option(
+            "--group-by",
+            help=(
+                "Grouping field for --output-format grouped: cluster, namespace, project, "
+                "repo, environment, team, label:NAME, annotation:NAME or a dotted path"
+            ),
+        ),
+    ] = "cluster",
+    max_open_groups: Annotated[
+        int,
+        typer.Option(
+            "--max-open-groups",
+            help="Maximum group spill files kept open at once for --output-format grouped",
+            min=1,
+        ),
+    ] = DEFAULT_MAX_OPEN_FILES,
+    layout: Annotated[
+        str,
+        typer.Option(
+            "--layout",
+            help=(
+                "Layout of --output-dir: 'flat' (<name>.json), 'hash' (ab/cd/<name>.json) or "
+                "a template such as '{cluster}/{namespace}/{name}.json'; non-flat layouts "
+                "also write an index.json of name -> path (batch mode only)"
+            ),
+        ),
+    ] = "flat",
+    output_file: Annotated[
+        Path | None,
+        typer.Option(
+            "--output-file",
+            help="Aggregated output file for --output-format ndjson or json-array",
+            dir_okay=False,
+            resolve_path=True,
+        ),
+    ] = None,
+    output_bundle: Annotated[
+        Path | None,
+        typer.Option(
+            "--output-bundle",
+            help=(
+                "Write every application into this tar archive (e.g. out.tar.zst) instead of "
+                "--output-dir, with a <bundle>.index.json for single-application extraction "
+                "(batch mode only)"
+            ),
+            dir_okay=False,
+            resolve_path=True,
+        ),
+    ] = None,
+    output_sqlite: Annotated[
+        Path | None,
+        typer.Option(
+            "--output-sqlite",
+            help=(
+                "Upsert every application into this SQLite database (indexed by cluster, "
+                "namespace, project, repo and labels) instead of --output-dir (batch mode only)"
+            ),
+            dir_okay=False,
+            resolve_path=True,
+        ),
+    ] = None,
+    output_compression: Annotated[
+        Compression,
+        typer.Option(
+            "--output-compression",
+            help=(
+                "Compression for --output-file or --output-bundle: 'auto' (from a .gz or "
+                ".zst suffix), 'none', 'gzip' or 'zstd'"
+            ),
+        ),
+    ] = "auto",
+    pretty: Annotated[
+        bool,
+        typer.Option(
+            "--pretty/--compact",
+            help="Write indented JSON (default) or compact single-line JSON",
+        ),
+    ] = True,
+    serializer: Annotated[
+        SerializerBackend,
+        typer.Option(
+            "--serializer",
+            help=(
+                "JSON serializer: 'auto' (orjson if installed, else pydantic), 'pydantic', "
+                "'orjson' or 'json' (standard library)"
+            ),
+        ),
+    ] = "auto",
+    plan_only: Annotated[
+        bool,
+        typer.Option(
+            "--plan",
+            help=(
+                "Write nothing; report which outputs in --output-dir would be created, "
+                "changed (with field diffs) or deleted (batch mode only)"
+            ),
+        ),
+    ] = False,
+    validate_only: Annotated[
+        bool,
+        typer.Option(
+            "--validate-only",
+            help=(
+                "Only validate and transform manifests in memory; no JSON is serialized "
+                "or written and --output-dir is not used"
+            ),
+        ),
+    ] = False,
+    low_memory: Annotated[
+        bool,
+        typer.Option(
+            "--low-memory",
+            help=(
+                "Keep per-file results as compact records and spill failures beyond the "
+                "first 1000 to a temporary file, for runs over very many files "
+                "(batch mode only)"
+            ),
+        ),
+    ] = False,
+    verbose: Annotated[
+        bool,
+        typer.Option(
+            "--verbose",
+            "-v",
+            help=(
+                "Print a line for every processed file, not only failures, and the chosen "
+                "execution plan (batch mode only)"
+            ),
+        ),
+    ] = False,
 ) -> None:
     """Parse ArgoCD Application manifest(s) and generate migration JSON output.
 
@@ -124,7 +538,56 @@ def parse(
 
     JSON output for automation:
         argocd-parse --directory ./manifests --output-dir ./output --json
+
+    Merging shard summaries (see `argocd-parse merge --help`):
+        argocd-parse merge shard-*.json --output-dir ./combined
+
+    Checkpointed long run (rerun the same command with --resume after a crash):
+        argocd-parse --directory ./manifests --output-dir ./output --journal run.jsonl
+
+    Pre-merge check that stops at the first broken manifest:
+        argocd-parse --directory ./manifests --output-dir ./output --fail-fast
+
+    Live machine-readable progress (one NDJSON line per file, then a summary):
+        argocd-parse --directory ./manifests --output-dir ./output --json-stream
+
+    PR check that validates every manifest without writing outputs:
+        argocd-parse --directory ./manifests --validate-only --json
+
+    Sharded across CI runners (run once per INDEX from 1 to 4):
+        argocd-parse --directory ./manifests --output-dir ./output --shard 1/4 --json
+
+    Parallel batch processing:
+        argocd-parse --directory ./manifests --output-dir ./output --executor processes
+
+    ApplicationSet git generator configs, one config.json per environment label:
+        argocd-parse --directory ./manifests --output-dir ./appsets --output-format grouped \\
+            --group-by environment
+
+    One compressed NDJSON stream instead of a file per application:
+        argocd-parse --directory ./manifests --output-format ndjson --output-file apps.ndjson.gz
+
+    Upload-ready archive instead of an output directory:
+        argocd-parse --directory ./manifests --output-bundle out.tar.zst
+
+    Queryable SQLite database, updated in place on every run:
+        argocd-parse --directory ./manifests --output-sqlite apps.db
+
+    A million-file fleet without holding every result in memory:
+        argocd-parse --directory ./manifests --output-dir ./output --low-memory --json
+
+    Preview what a run would change, without writing anything:
+        argocd-parse --directory ./manifests --output-dir ./output --plan
+
+    Fan a very large fleet out into hashed subdirectories:
+        argocd-parse --directory ./manifests --output-dir ./output --layout hash
+
+    Gentle on a shared build host (also settable via ARGOCD_MAX_READ_RATE):
+        argocd-parse --directory ./manifests --output-dir ./output --max-read-rate 20M
     """
+    if ctx.invoked_subcommand is not None:
+        return
+
     # Validate mutual exclusion
     if file and directory:
         console.print("[red]Error: Cannot specify both --file and --directory[/red]")
@@ -134,6 +597,113 @@ def parse(
         console.print("[red]Error: Must specify either --file or --directory[/red]")
         raise typer.Exit(1)
 
+    if (output_format in ("files", "grouped")) != (output_file is None):
+        console.print(
+            "[red]Error: --output-file must be combined with --output-format ndjson "
+            "or json-array[/red]"
+        )
+        raise typer.Exit(1)
+
+    if output_bundle is not None and (output_format != "files" or output_file is not None):
+        console.print(
+            "[red]Error: --output-bundle cannot be combined with --output-format "
+            "or --output-file[/red]"
+        )
+        raise typer.Exit(1)
+
+    if output_sqlite is not None and (
+        output_format != "files" or output_file is not None or output_bundle is not None
+    ):
+        console.print(
+            "[red]Error: --output-sqlite cannot be combined with --output-format, "
+            "--output-file or --output-bundle[/red]"
+        )
+        raise typer.Exit(1)
+
+    if plan_only and (
+        file is not None
+        or output_format != "files"
+        or output_bundle is not None
+        or output_sqlite is not None
+    ):
+        console.print(
+            "[red]Error: --plan compares against --output-dir and requires --directory[/red]"
+        )
+        raise typer.Exit(1)
+
+    if plan_only and journal is not None:
+        # A plan writes nothing, so a resumed run must not skip the files it planned
+        console.print(
+            "[red]Error: --plan writes nothing and cannot be combined with --journal[/red]"
+        )
+        raise typer.Exit(1)
+
+    if validate_only and (
+        plan_only
+        or output_format != "files"
+        or output_bundle is not None
+        or output_sqlite is not None
+    ):
+        console.print(
+            "[red]Error: --validate-only writes no outputs and cannot be combined with "
+            "--plan or another output option[/red]"
+        )
+        raise typer.Exit(1)
+
+    if validate_only and (journal is not None or resume or retry_failed is not None):
+        # Nothing is written, so a journal would mark files done that have no output
+        console.print(
+            "[red]Error: --validate-only writes no outputs and cannot be combined with "
+            "--journal, --resume or --retry-failed[/red]"
+        )
+        raise typer.Exit(1)
+
+    if resume and not journal:
+        console.print("[red]Error: --resume requires --journal[/red]")
+        raise typer.Exit(1)
+
+    if (resume or retry_failed) and (
+        output_file is not None or output_bundle is not None or output_format == "grouped"
+    ):
+        # These are rebuilt by every run, so they would lose the files this run skips
+        console.print(
+            "[red]Error: --output-file, --output-bundle and --output-format grouped are "
+            "rebuilt from the files each run processes and cannot be combined with "
+            "--resume or --retry-failed[/red]"
+        )
+        raise typer.Exit(1)
+
+    max_rss_bytes: int | None = None
+    if max_rss:
+        try:
+            max_rss_bytes = parse_size(max_rss)
+        except ValueError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            raise typer.Exit(1)
+
+    try:
+        throttle = IOThrottle.from_options(max_read_rate, max_open_rate, io_bucket)
+    except (OSError, ValueError) as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+    if throttle is not None:
+        ctx.call_on_close(throttle.close)
+
+    try:
+        backend = resolve_backend(serializer)
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+    shard_spec: ShardSpec | None = None
+    if shard:
+        try:
+            shard_spec = parse_shard_spec(shard)
+        except ValueError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            raise typer.Exit(1)
+
     # Load configuration if provided
     cluster_mappings = None
     default_labels = None
@@ -148,18 +718,27 @@ def parse(
         if not quiet:
             console.print(f"[cyan]Parsing:[/cyan] {file}")
 
-        result = parse_and_write(
-            input_file=file,
-            output_dir=output_dir,
-            cluster_mappings=cluster_mappings,
-            default_labels=default_labels,
-        )
+        if validate_only:
+            result, _ = parse_and_render(
+                file, cluster_mappings, default_labels, throttle, render=False
+            )
+        else:
+            result = parse_and_write(
+                input_file=file,
+                output_dir=output_dir,
+                cluster_mappings=cluster_mappings,
+                default_labels=default_labels,
+                throttle=throttle,
+                style="pretty" if pretty else "compact",
+                backend=backend,
+            )
 
         # Display results
         if result.status == "success":
             if not quiet:
                 console.print(f"[green]✓[/green] Successfully parsed: {result.application_name}")
-                console.print(f"[dim]Output:[/dim] {result.output_path}")
+                if result.output_path:
+                    console.print(f"[dim]Output:[/dim] {result.output_path}")
         else:
             console.print(f"[red]✗[/red] Failed to parse: {file}")
             if result.errors:
@@ -173,6 +752,7 @@ def parse(
 
     # Batch directory mode
     elif directory:
+        machine_output = json_output or json_stream
         # Find all YAML files
         try:
             yaml_files = find_yaml_files(directory, recursive=True)
@@ -184,58 +764,424 @@ def parse(
             console.print(f"[yellow]No YAML files found in {directory}[/yellow]")
             raise typer.Exit(0)
 
-        if not quiet and not json_output:
-            console.print(f"[cyan]Found {len(yaml_files)} YAML file(s) in {directory}[/cyan]\n")
+        discovered = len(yaml_files)
+        if shard_spec:
+            yaml_files = select_shard(yaml_files, directory, shard_spec)
+
+        if not quiet and not machine_output:
+            console.print(f"[cyan]Found {discovered} YAML file(s) in {directory}[/cyan]")
+            if shard_spec:
+                console.print(
+                    f"[cyan]Shard {shard_spec}: processing {len(yaml_files)} file(s)[/cyan]"
+                )
+            console.print()
+
+        all_files = yaml_files
+        previous: dict[str, ParseResult] = {}
+        if resume and journal:
+            previous = load_journal(journal)
+        if retry_failed:
+            retry_files = _load_failed_files(retry_failed)
+            all_files = [f for f in all_files if str(f) in retry_files]
+            previous = {k: v for k, v in previous.items() if v.status != "failed"}
+        yaml_files = [f for f in all_files if str(f) not in previous]
+
+        if not quiet and not machine_output and (resume or retry_failed):
+            console.print(
+                f"[cyan]Resuming: {len(all_files) - len(yaml_files)} file(s) already done, "
+                f"{len(yaml_files)} to process[/cyan]\n"
+            )
+
+        plan = plan_execution(yaml_files, executor, workers, throttle=throttle)
+        if verbose and not quiet and not machine_output:
+            console.print(f"[dim]Execution plan:[/dim] {plan.describe()}\n")
+
+        sink: OutputSink | None = None
+        try:
+            output_layout = OutputLayout(layout)
+            if output_format == "grouped":
+                sink = GroupedConfigOutput(
+                    output_dir,
+                    group_by,
+                    pretty=pretty,
+                    max_open_files=max_open_groups,
+                    on_wait=None
+                    if quiet or machine_output
+                    else lambda: console.print(
+                        f"[yellow]Waiting for another run to release {output_dir}...[/yellow]"
+                    ),
+                )
+            elif output_file is not None and output_format in ("ndjson", "json-array"):
+                sink = AggregateOutputFile(output_file, output_format, output_compression)
+            elif output_bundle is not None:
+                sink = OutputBundle(output_bundle, output_compression)
+            elif output_sqlite is not None:
+                sink = SqliteOutputStore(output_sqlite, (str(path) for path in yaml_files))
+            elif plan_only:
+                sink = OutputPlan(output_dir, (str(path) for path in yaml_files), output_layout)
+        except ValueError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            raise typer.Exit(1)
+
+        if json_stream:
+            # Results completed before a restart are part of this run's stream
+            for path in all_files:
+                if str(path) in previous:
+                    _emit_record({"type": "result", **result_to_dict(previous[str(path)])})
+
+        result_store: ResultStore | None = None
+        if low_memory and not json_stream:
+            result_store = ResultStore()
+            ctx.call_on_close(result_store.close)
 
         # Process batch
-        summary = process_files_batch(
-            files=yaml_files,
-            output_dir=output_dir,
-            cluster_mappings=cluster_mappings,
-            default_labels=default_labels,
-            show_progress=not quiet and not json_output,
-        )
+        try:
+            with ResultJournal(journal) if journal else nullcontext() as result_journal:
+
+                def on_result(result: ParseResult) -> None:
+                    if result_journal is not None:
+                        result_journal.append(result)
+                    if json_stream:
+                        _emit_record({"type": "result", **result_to_dict(result)})
+
+                summary = process_files_batch(
+                    files=yaml_files,
+                    output_dir=output_dir,
+                    cluster_mappings=cluster_mappings,
+                    default_labels=default_labels,
+                    show_progress=not quiet and not machine_output,
+                    result_callback=on_result if result_journal or json_stream else None,
+                    plan=plan,
+                    max_failures=1 if fail_fast else max_failures,
+                    failed_first=_load_failed_files(failed_first) if failed_first else (),
+                    max_rss=max_rss_bytes,
+                    throttle=throttle,
+                    json_style="pretty" if pretty else "compact",
+                    serializer=backend,
+                    sink=sink,
+                    layout=output_layout,
+                    validate_only=validate_only,
+                    keep_results=not json_stream,
+                    result_store=result_store,
+                    verbose=verbose,
+                )
+        except OSError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            raise typer.Exit(1)
+        io_stats: IOStats | None = throttle.stats() if throttle is not None else None
+
+        if json_stream:
+            # Files skipped because the run stopped early
+            for result in summary.results:
+                _emit_record({"type": "result", **result_to_dict(result)})
+        if previous and (json_stream or result_store is not None):
+            # The summary holds no results to rebuild it from; add the earlier counts
+            prior = summarize_results([previous[str(f)] for f in all_files if str(f) in previous])
+            summary = summary.model_copy(
+                update={
+                    "total": summary.total + prior.total,
+                    "successful": summary.successful + prior.successful,
+                    "failed": summary.failed + prior.failed,
+                    "skipped": summary.skipped + prior.skipped,
+                    "error_signatures": combine_signatures(
+                        prior.error_signatures, summary.error_signatures
+                    ),
+                }
+            )
+        elif previous:
+            # Report the whole run, including files completed before the restart
+            by_file = {result.file_path: result for result in summary.results}
+            summary = summarize_results(
+                [previous.get(str(f)) or by_file[str(f)] for f in all_files]
+            ).model_copy(
+                update={
+                    "written": summary.written,
+                    "unchanged": summary.unchanged,
+                    "stopped_early": summary.stopped_early,
+                    "throttle_events": summary.throttle_events,
+                    "throttle_events_dropped": summary.throttle_events_dropped,
+                }
+            )
 
         # Output results
-        if json_output:
+        if machine_output:
             # Machine-readable JSON output
-            output = {
+            output: dict[str, Any] = {
                 "success": summary.failed == 0,
-                "summary": {
-                    "total": summary.total,
-                    "successful": summary.successful,
-                    "failed": summary.failed,
-                    "skipped": summary.skipped,
-                    "success_rate": round(summary.success_rate, 1),
-                },
-                "results": [
-                    {
-                        "file": result.file_path,
-                        "status": result.status,
-                        "output": result.output_path,
-                        "application_name": result.application_name,
-                        "errors": [
-                            {
-                                "type": error.error_type,
-                                "field": error.field,
-                                "message": error.message,
-                            }
-                            for error in result.errors
-                        ] if result.errors else [],
-                    }
-                    for result in summary.results
+                "summary": summary_counts_to_dict(summary),
+                "output_dir": None if validate_only else str(output_dir),
+                "error_signatures": [
+                    signature.model_dump() for signature in summary.error_signatures
                 ],
             }
-            print(json.dumps(output, indent=2))
+            if not json_stream and result_store is None:
+                output["results"] = [result_to_dict(result) for result in summary.results]
+            if summary.throttle_events:
+                output["throttle_events"] = [
+                    event.model_dump() for event in summary.throttle_events
+                ]
+            if summary.throttle_events_dropped:
+                output["throttle_events_dropped"] = summary.throttle_events_dropped
+            if output_file is not None:
+                output["output_file"] = str(output_file)
+            if output_bundle is not None:
+                output["output_bundle"] = str(output_bundle)
+            if output_sqlite is not None:
+                output["output_sqlite"] = str(output_sqlite)
+            if isinstance(sink, OutputPlan):
+                output["plan"] = {
+                    "counts": sink.counts(),
+                    "changes": [change.model_dump() for change in sink.changes],
+                }
+            if io_stats is not None:
+                output["io"] = io_stats.model_dump()
+            if shard_spec:
+                output["shard"] = {
+                    "index": shard_spec.index,
+                    "count": shard_spec.count,
+                    "discovered": discovered,
+                }
+            if json_stream:
+                _emit_record({"type": "summary", **output})
+            elif result_store is not None:
+                _print_json_results(output, _merge_previous(all_files, previous, result_store))
+            else:
+                print(json.dumps(output, indent=2))
         else:
             # Human-readable summary
             if not quiet:
-                format_batch_summary(summary, show_details=True)
+                details: Iterable[ParseResult] | None = None
+                if result_store is not None:
+                    details = (
+                        _merge_previous(all_files, previous, result_store)
+                        if previous
+                        else result_store.failures()
+                    )
+                format_batch_summary(summary, show_details=True, results=details)
+                if io_stats is not None:
+                    console.print(f"  [dim]I/O:[/dim] {io_stats.describe()}")
+                if isinstance(sink, OutputPlan):
+                    _print_plan(sink)
 
         # Exit with appropriate code
         if summary.failed > 0:
             raise typer.Exit(1)
 
 
+@app.command()
+def merge(
+    summaries: Annotated[
+        list[Path],
+        typer.Argument(
+            help="Batch summaries written by `argocd-parse --json` or `--json-stream`",
+            exists=True,
+            dir_okay=False,
+            resolve_path=True,
+        ),
+    ],
+    outputs: Annotated[
+        list[Path] | None,
+        typer.Option(
+            "--outputs",
+            help=(
+                "Local copy of each run's output directory, given once per summary in the "
+                "same order (default: the output paths recorded in the summaries)"
+            ),
+            exists=True,
+            file_okay=False,
+            resolve_path=True,
+        ),
+    ] = None,
+    output_dir: Annotated[
+        Path | None,
+        typer.Option(
+            "--output-dir",
+            "-o",
+            help="Combine the output files of all runs into this directory",
+            resolve_path=True,
+        ),
+    ] = None,
+    link_mode: Annotated[
+        LinkMode,
+        typer.Option(
+            "--link-mode",
+            help="How to combine outputs: 'hardlink' (copies across devices) or 'copy'",
+        ),
+    ] = "hardlink",
+    workers: Annotated[
+        int,
+        typer.Option(
+            "--workers",
+            "-w",
+            help="Number of parallel threads used to link or copy outputs",
+            min=1,
+        ),
+    ] = 8,
+    quiet: Annotated[
+        bool,
+        typer.Option("--quiet", "-q", help="Suppress the human-readable summary"),
+    ] = False,
+    json_output: Annotated[
+        bool,
+        typer.Option("--json", help="Output the merged summary in JSON format"),
+    ] = False,
+) -> None:
+    """Merge batch summaries from sharded or repeated runs into one report.
+
+    Summaries are read one at a time, incrementally, and merged results are
+    streamed out. An application name produced by different manifests is
+    reported as a collision and fails the later manifest with
+    DUPLICATE_OUTPUT; only the first manifest's output is combined.
+
+    Merge shard summaries:
+        argocd-parse merge shard-1.json shard-2.json
+
+    Combine outputs downloaded from each runner:
+        argocd-parse merge s1.json s2.json --outputs ./out-1 --outputs ./out-2 -o ./output
+    """
+    if outputs and len(outputs) != len(summaries):
+        console.print("[red]Error: --outputs must be given once per summary file[/red]")
+        raise typer.Exit(1)
+
+    merger = SummaryMerger()
+    placements: dict[str, tuple[Path, Path]] = {}
+
+    if json_output:
+        sys.stdout.write('{\n  "results": [')
+    first_record = True
+
+    for position, summary_file in enumerate(summaries):
+        output_root = outputs[position] if outputs else None
+        try:
+            for result, run_output_dir in merger.add_summary(summary_file):
+                if json_output:
+                    record = json.dumps(result_to_dict(result), indent=2)
+                    separator = "" if first_record else ","
+                    sys.stdout.write(separator + "\n    " + record.replace("\n", "\n    "))
+                    first_record = False
+
+                if output_dir is not None and result.status == "success":
+                    relative = relative_output_path(result, run_output_dir)
+                    if output_root is not None:
+                        source = output_root / relative
+                    else:
+                        source = Path(result.output_path or "")
+                    placements.setdefault(
+                        result.application_name or "", (source, output_dir / relative)
+                    )
+        except (OSError, ValueError) as e:
+            console.print(f"[red]Error: {e}[/red]")
+            raise typer.Exit(1)
+
+    placement_errors: list[str] = []
+    if output_dir is not None:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        placement_errors = place_outputs(list(placements.values()), link_mode, workers)
+
+    summary = merger.summary
+    missing_shards = merger.missing_shards
+
+    if json_output:
+        tail = {
+            "success": summary.failed == 0 and not merger.collisions and not missing_shards,
+            "summary": summary_counts_to_dict(summary),
+            "error_signatures": [signature.model_dump() for signature in summary.error_signatures],
+            "collisions": [collision.model_dump() for collision in merger.collisions],
+            "duplicate_files": merger.duplicate_files,
+            "missing_shards": missing_shards,
+            "output_errors": placement_errors,
+        }
+        body = json.dumps(tail, indent=2)[1:-1]
+        sys.stdout.write(("\n  ]," if not first_record else "],") + body + "}\n")
+    elif not quiet:
+        format_batch_summary(summary, show_details=True)
+        if merger.collisions:
+            console.print("\n[bold red]Application Name Collisions:[/bold red]")
+            for collision in merger.collisions:
+                console.print(
+                    f"  • {collision.application_name}: {collision.duplicate_file} "
+                    f"(kept {collision.first_file})"
+                )
+        if merger.duplicate_files:
+            console.print(
+                f"\n[yellow]{len(merger.duplicate_files)} file(s) appeared in more than one "
+                "summary and were counted once[/yellow]"
+            )
+        if missing_shards:
+            console.print(f"\n[red]Missing shards: {', '.join(missing_shards)}[/red]")
+        if output_dir is not None:
+            console.print(
+                f"\n[dim]Combined outputs:[/dim] {len(placements)} file(s) in {output_dir}"
+            )
+        for error in placement_errors:
+            console.print(f"[red]✗[/red] {error}")
+
+    if summary.failed > 0 or merger.collisions or missing_shards or placement_errors:
+        raise typer.Exit(1)
+
+
+@app.command()
+def query(
+    expression: Annotated[
+        str,
+        typer.Argument(
+            help=(
+                "Predicates joined with 'and': FIELD=VALUE, FIELD=PREFIX* or FIELD (exists), "
+                "e.g. 'cluster=prod-east and label:team=payments'"
+            ),
+        ),
+    ],
+    output_dir: Annotated[
+        Path,
+        typer.Option(
+            "--output-dir",
+            "-o",
+            help="Output directory written by argocd-parse (any --layout)",
+            exists=True,
+            file_okay=False,
+            resolve_path=True,
+        ),
+    ] = Path("./output"),
+    rebuild: Annotated[
+        bool,
+        typer.Option("--rebuild", help="Rebuild the query index from scratch"),
+    ] = False,
+    paths_only: Annotated[
+        bool,
+        typer.Option("--paths", help="Print matching output paths instead of their JSON"),
+    ] = False,
+) -> None:
+    """Query an output directory and print matching outputs as NDJSON.
+
+    The first query builds an inverted index of field values in the output
+    directory; later queries only re-read outputs that changed since.
+
+    Apps on one cluster owned by one team:
+        argocd-parse query -o ./output 'destination.clusterName=prod-east and team=payments'
+
+    Apps from any repository of an organization:
+        argocd-parse query -o ./output 'repo=https://github.com/org/*' --paths
+    """
+    try:
+        predicates = parse_query(expression)
+        index = QueryIndex.open(output_dir, rebuild=rebuild)
+    except (OSError, ValueError) as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+    for relative in index.match(predicates):
+        path = output_dir / relative
+        if paths_only:
+            sys.stdout.write(f"{path}\n")
+            continue
+        try:
+            with open(path, encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            # Removed or rewritten since the index was refreshed
+            continue
+        sys.stdout.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+
 if __name__ == "__main__":
     app()
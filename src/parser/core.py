@@ -1,6 +1,6 @@
 """Core YAML parsing and validation logic for ArgoCD manifests."""
 
-import json
+import os
 from pathlib import Path
 from typing import Any
 
@@ -14,6 +14,10 @@ from parser.models import (
     ParseResult,
     ValidationError,
 )
+from parser.output import write_if_changed
+from parser.serializer import JsonStyle, ResolvedBackend, serialize_model
+from parser.validator import check_manifest_structure
+from scanner.throttle import IOThrottle
 
 
 class YAMLDocumentError(Exception):
@@ -22,11 +26,27 @@ class YAMLDocumentError(Exception):
     pass
 
 
-def load_single_yaml_document(file_path: Path) -> dict[str, Any]:
+class ManifestStructureError(Exception):
+    """Raised when a manifest does not match the ArgoCD Application schema."""
+
+    def __init__(self, errors: list[ValidationError]) -> None:
+        """Create the error.
+
+        Args:
+            errors: Every structural error found in the manifest
+        """
+        super().__init__("; ".join(f"{error.field}: {error.message}" for error in errors))
+        self.errors = errors
+
+
+def load_single_yaml_document(
+    file_path: Path, throttle: IOThrottle | None = None
+) -> dict[str, Any]:
     """Load and validate a single YAML document from a file.
 
     Args:
         file_path: Path to the YAML file
+        throttle: Optional I/O throttle charged for the open and the file's bytes
 
     Returns:
         Parsed YAML document as a dictionary
@@ -37,6 +57,8 @@ def load_single_yaml_document(file_path: Path) -> dict[str, Any]:
         FileNotFoundError: If file doesn't exist
     """
     with open(file_path, encoding="utf-8") as f:
+        if throttle is not None:
+            throttle.acquire(os.fstat(f.fileno()).st_size, files=1)
         # Use safe_load_all to detect multi-document YAML
         documents = list(yaml.safe_load_all(f))
 
@@ -70,6 +92,7 @@ def parse_argocd_manifest(
     file_path: Path,
     cluster_mappings: dict[str, str] | None = None,
     default_labels: dict[str, str] | None = None,
+    throttle: IOThrottle | None = None,
 ) -> MigrationOutput:
     """Parse an ArgoCD Application manifest and transform to migration output.
 
@@ -77,19 +100,26 @@ def parse_argocd_manifest(
         file_path: Path to the ArgoCD YAML manifest file
         cluster_mappings: Optional mapping of server URLs to cluster names
         default_labels: Optional default labels to add to output
+        throttle: Optional I/O throttle for reading the manifest
 
     Returns:
         Transformed migration output
 
     Raises:
         YAMLDocumentError: If YAML structure is invalid
-        PydanticValidationError: If manifest doesn't conform to ArgoCD schema
+        ManifestStructureError: If manifest doesn't conform to ArgoCD schema
+        PydanticValidationError: If manifest doesn't conform to ArgoCD schema in
+            a way check_manifest_structure leaves to Pydantic
         FileNotFoundError: If file doesn't exist
     """
     # Load and parse YAML
-    document = load_single_yaml_document(file_path)
+    document = load_single_yaml_document(file_path, throttle)
 
-    # Validate against ArgoCD Application schema
+    # Report structural errors in one pass, without building models or
+    # raising Pydantic errors; only sound documents are validated by Pydantic
+    errors = check_manifest_structure(document)
+    if errors:
+        raise ManifestStructureError(errors)
     app = ArgoCDApplication.model_validate(document)
 
     # Transform to migration output format
@@ -98,64 +128,92 @@ def parse_argocd_manifest(
     return output
 
 
-def write_json_output(output: MigrationOutput, output_file: Path) -> None:
+def render_json_output(
+    output: MigrationOutput,
+    style: JsonStyle = "pretty",
+    backend: ResolvedBackend = "pydantic",
+) -> bytes:
+    """Serialize migration output to the JSON bytes written to disk.
+
+    Args:
+        output: Migration output data
+        style: "pretty" (2-space indent) or "compact"
+        backend: Serializer backend (see parser.serializer)
+
+    Returns:
+        Encoded JSON document
+    """
+    return serialize_model(output, style, backend)
+
+
+def write_json_output(
+    output: MigrationOutput,
+    output_file: Path,
+    style: JsonStyle = "pretty",
+    backend: ResolvedBackend = "pydantic",
+) -> bool:
     """Write migration output to JSON file.
 
+    The output is serialized in memory and compared with the existing file;
+    an identical file is left untouched. Otherwise it is written under a
+    temporary name and renamed into place, so it is never observed
+    half-written. The parent directory is created only if it is missing.
+
     Args:
         output: Migration output data
         output_file: Path where JSON file should be written
+        style: "pretty" (2-space indent) or "compact"
+        backend: Serializer backend (see parser.serializer)
+
+    Returns:
+        True if the file was written, False if it was already up to date
 
     Raises:
         OSError: If file cannot be written
     """
-    # Ensure parent directory exists
-    output_file.parent.mkdir(parents=True, exist_ok=True)
-
-    # Write JSON with proper formatting
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(
-            output.model_dump(mode="json"),
-            f,
-            indent=2,
-            ensure_ascii=False,
-        )
+    return write_if_changed(output_file, render_json_output(output, style, backend))
 
 
-def parse_and_write(
+def parse_and_render(
     input_file: Path,
-    output_dir: Path,
     cluster_mappings: dict[str, str] | None = None,
     default_labels: dict[str, str] | None = None,
-) -> ParseResult:
-    """Parse ArgoCD manifest and write JSON output.
+    throttle: IOThrottle | None = None,
+    style: JsonStyle = "pretty",
+    backend: ResolvedBackend = "pydantic",
+    render: bool = True,
+) -> tuple[ParseResult, bytes | None]:
+    """Parse ArgoCD manifest and render its JSON output without writing it.
 
-    High-level function that orchestrates parsing and writing.
+    Used by batch runs, where workers parse and render while the calling
+    thread claims output names and writes the files.
 
     Args:
         input_file: Path to input YAML manifest
-        output_dir: Directory where JSON output should be written
         cluster_mappings: Optional cluster URL to name mappings
         default_labels: Optional default labels
+        throttle: Optional I/O throttle for reading the manifest
+        style: Output JSON style, "pretty" or "compact"
+        backend: Serializer backend (see parser.serializer)
+        render: Serialize the output; if False the manifest is only
+            validated and transformed in memory (validate-only runs)
 
     Returns:
-        ParseResult with status and details
+        ParseResult (without output_path) and the rendered JSON, which is
+        None if parsing failed or render is False
     """
     try:
         # Parse the manifest
-        output = parse_argocd_manifest(input_file, cluster_mappings, default_labels)
-
-        # Determine output file name (use application name)
-        output_file = output_dir / f"{output.metadata.name}.json"
-
-        # Write JSON output
-        write_json_output(output, output_file)
+        output = parse_argocd_manifest(
+            input_file, cluster_mappings, default_labels, throttle
+        )
 
-        return ParseResult(
+        result = ParseResult(
             file_path=str(input_file),
             status="success",
-            output_path=str(output_file),
             application_name=output.metadata.name,
         )
+        return result, render_json_output(output, style, backend) if render else None
 
     except YAMLDocumentError as e:
         return ParseResult(
@@ -167,7 +225,14 @@ def parse_and_write(
                     message=str(e),
                 )
             ],
-        )
+        ), None
+
+    except ManifestStructureError as e:
+        return ParseResult(
+            file_path=str(input_file),
+            status="failed",
+            errors=e.errors,
+        ), None
 
     except PydanticValidationError as e:
         errors = []
@@ -185,16 +250,96 @@ def parse_and_write(
             file_path=str(input_file),
             status="failed",
             errors=errors,
-        )
+        ), None
 
     except Exception as e:
-        return ParseResult(
-            file_path=str(input_file),
-            status="failed",
-            errors=[
-                ValidationError(
-                    error_type="UNEXPECTED_ERROR",
-                    message=f"{type(e).__name__}: {str(e)}",
-                )
-            ],
-        )
+        return unexpected_error_result(input_file, e), None
+
+
+def unexpected_error_result(input_file: Path, error: Exception) -> ParseResult:
+    """Build the failed result reported for an unexpected exception.
+
+    Args:
+        input_file: Manifest being processed
+        error: Exception raised while parsing or writing
+
+    Returns:
+        Failed ParseResult with an UNEXPECTED_ERROR entry
+    """
+    return ParseResult(
+        file_path=str(input_file),
+        status="failed",
+        errors=[
+            ValidationError(
+                error_type="UNEXPECTED_ERROR",
+                message=f"{type(error).__name__}: {str(error)}",
+            )
+        ],
+    )
+
+
+def worker_lost_result(input_file: Path, error: BaseException) -> ParseResult:
+    """Build the failed result reported for a file whose worker process died.
+
+    Args:
+        input_file: Manifest that was being processed
+        error: Error raised by the broken process pool
+
+    Returns:
+        Failed ParseResult with a WORKER_LOST entry
+    """
+    return ParseResult(
+        file_path=str(input_file),
+        status="failed",
+        errors=[
+            ValidationError(
+                error_type="WORKER_LOST",
+                message=(
+                    f"Worker process died before finishing this file ({type(error).__name__}); "
+                    "it may have been killed for running out of memory"
+                ),
+            )
+        ],
+    )
+
+
+def parse_and_write(
+    input_file: Path,
+    output_dir: Path,
+    cluster_mappings: dict[str, str] | None = None,
+    default_labels: dict[str, str] | None = None,
+    throttle: IOThrottle | None = None,
+    style: JsonStyle = "pretty",
+    backend: ResolvedBackend = "pydantic",
+) -> ParseResult:
+    """Parse ArgoCD manifest and write JSON output.
+
+    High-level function that orchestrates parsing and writing.
+
+    Args:
+        input_file: Path to input YAML manifest
+        output_dir: Directory where JSON output should be written
+        cluster_mappings: Optional cluster URL to name mappings
+        default_labels: Optional default labels
+        throttle: Optional I/O throttle for reading the manifest
+        style: Output JSON style, "pretty" or "compact"
+        backend: Serializer backend (see parser.serializer)
+
+    Returns:
+        ParseResult with status and details
+    """
+    result, rendered = parse_and_render(
+        input_file, cluster_mappings, default_labels, throttle, style, backend
+    )
+    if rendered is None:
+        return result
+
+    # Determine output file name (use application name)
+    output_file = output_dir / f"{result.application_name}.json"
+
+    try:
+        write_if_changed(output_file, rendered)
+    except OSError as e:
+        return unexpected_error_result(input_file, e)
+
+    return result.model_copy(update={"output_path": str(output_file)})
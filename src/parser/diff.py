@@ -0,0 +1,231 @@
+"""Dry-run planning: what a batch run would change in an output directory.
+
+``argocd-parse --plan`` runs the normal parallel batch with a sink that
+writes nothing. Names are claimed against the output directory's claims
+ledger exactly as a real run would. Each rendered output is compared with
+the file it would replace by size, then byte for byte; only files that
+differ are parsed and diffed field by field. Outputs that exist but would
+no longer be produced (their manifest was removed or now yields another
+name), and old locations of outputs a non-flat layout moves, are reported
+as deletions.
+"""
+
+import json
+import os
+from collections.abc import Iterable
+from pathlib import Path
+from types import TracebackType
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from parser.layout import INDEX_FILE_NAME, OutputLayout
+from parser.output import CLAIMS_FILE_NAME, DirectoryClaims, check_not_index, load_mapping
+from parser.query import flatten_fields
+from parser.serializer import JsonStyle
+
+PlanAction = Literal["create", "change", "delete"]
+
+
+class FieldChange(BaseModel):
+    """One field that differs between the existing and the planned output."""
+
+    model_config = ConfigDict(frozen=True)
+
+    field: str = Field(description="Dotted field path")
+    old: str | None = Field(default=None, description="Existing value, None if absent")
+    new: str | None = Field(default=None, description="Planned value, None if absent")
+
+
+class PlannedChange(BaseModel):
+    """An output file the run would create, change or delete."""
+
+    model_config = ConfigDict(frozen=True)
+
+    action: PlanAction = Field(description="create, change or delete")
+    application_name: str = Field(description="Application name")
+    output_path: str = Field(description="Output file affected")
+    fields: list[FieldChange] = Field(
+        default_factory=list, description="Changed fields (change only)"
+    )
+
+
+def diff_fields(old: bytes, new: bytes) -> list[FieldChange]:
+    """Compare two output documents field by field.
+
+    Args:
+        old: Existing JSON
+        new: Planned JSON
+
+    Returns:
+        Changed fields, sorted by path; a single "(document)" change if the
+        existing file is not a JSON object
+    """
+    try:
+        old_record = json.loads(old)
+    except ValueError:
+        old_record = None
+    if not isinstance(old_record, dict):
+        return [FieldChange(field="(document)", old="unreadable", new="valid output")]
+    old_fields = flatten_fields(old_record)
+    new_fields = flatten_fields(json.loads(new))
+    return [
+        FieldChange(field=field, old=old_fields.get(field), new=new_fields.get(field))
+        for field in sorted(old_fields.keys() | new_fields.keys())
+        if old_fields.get(field) != new_fields.get(field)
+    ]
+
+
+class OutputPlan:
+    """Output sink that compares outputs with an output directory instead of writing."""
+
+    def __init__(
+        self,
+        output_dir: Path,
+        sources: Iterable[str] = (),
+        layout: OutputLayout | None = None,
+    ) -> None:
+        """Prepare a plan against an output directory (which need not exist).
+
+        Args:
+            output_dir: Output directory a real run would write to
+            sources: Manifests this run processes
+            layout: Layout a real run would use (default: flat)
+        """
+        self.output_dir = output_dir
+        self.layout = layout or OutputLayout()
+        self.json_style: JsonStyle | None = None
+        # Nothing is ever written
+        self.written = 0
+        self.unchanged = 0
+        self.changes: list[PlannedChange] = []
+        self.unchanged_outputs = 0
+        self._sources = set(sources)
+        self._claims = DirectoryClaims(output_dir, self._sources, self.layout)
+        self._ledger: dict[str, str] = {}
+        self._prior_index: dict[str, str] = {}
+
+    def __enter__(self) -> "OutputPlan":
+        """Start planning: load earlier claims (and the index of a non-flat layout)."""
+        self._claims.load()
+        self._ledger = load_mapping(self.output_dir / CLAIMS_FILE_NAME)
+        if not self.layout.is_flat:
+            self._prior_index = load_mapping(self.output_dir / INDEX_FILE_NAME)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Add deletions and sort the planned changes."""
+        if exc_type is None:
+            self._plan_deletions()
+        order = {"create": 0, "change": 1, "delete": 2}
+        self.changes.sort(key=lambda change: (order[change.action], change.application_name))
+
+    def _existing_outputs(self) -> dict[str, str]:
+        """Existing outputs as name -> path relative to the output directory."""
+        if not self.layout.is_flat:
+            return self._prior_index
+        try:
+            entries = os.listdir(self.output_dir)
+        except OSError:
+            return {}
+        return {
+            entry[: -len(".json")]: entry
+            for entry in entries
+            if entry.endswith(".json") and not entry.startswith(".")
+        }
+
+    def _plan_deletions(self) -> None:
+        producing = set(self._claims.claims.values())
+        for name, relative in sorted(self._existing_outputs().items()):
+            if name in self._claims.claims:
+                continue
+            owner = self._ledger.get(name)
+            if owner is not None:
+                if owner in self._sources and owner not in producing:
+                    # Its manifest failed this run; a real run keeps the output
+                    continue
+                if owner not in self._sources and os.path.exists(owner):
+                    # Produced by a manifest outside this run
+                    continue
+            self.changes.append(
+                PlannedChange(
+                    action="delete",
+                    application_name=name,
+                    output_path=str(self.output_dir / relative),
+                )
+            )
+
+    def claim(self, name: str, source: str) -> str | None:
+        """Claim an application name as a real run on the directory would.
+
+        Args:
+            name: Application name
+            source: Manifest producing the output
+
+        Returns:
+            The manifest that already owns the name, or None if the claim
+            succeeded
+        """
+        return self._claims.claim(name, source)
+
+    def write(self, name: str, data: bytes) -> Path:
+        """Compare one rendered output with the file a real run would write.
+
+        If a non-flat layout moves the application (e.g. its cluster
+        changed), the file at its old location is planned for deletion.
+
+        Args:
+            name: Application name
+            data: Rendered JSON
+
+        Returns:
+            Path the output would be written to
+
+        Raises:
+            OutputConflictError: If the layout renders the path of its index
+        """
+        relative = self.layout.relative_path(name, data)
+        check_not_index(self.layout, relative)
+        output_file = self.output_dir / relative
+        previous = self._prior_index.get(name)
+        if previous is not None and previous != relative and ".." not in previous.split("/"):
+            self.changes.append(
+                PlannedChange(
+                    action="delete",
+                    application_name=name,
+                    output_path=str(self.output_dir / previous),
+                )
+            )
+        try:
+            with open(output_file, "rb") as f:
+                if os.fstat(f.fileno()).st_size == len(data) and f.read() == data:
+                    self.unchanged_outputs += 1
+                    return output_file
+                f.seek(0)
+                existing = f.read()
+        except OSError:
+            self.changes.append(
+                PlannedChange(action="create", application_name=name, output_path=str(output_file))
+            )
+            return output_file
+        self.changes.append(
+            PlannedChange(
+                action="change",
+                application_name=name,
+                output_path=str(output_file),
+                fields=diff_fields(existing, data),
+            )
+        )
+        return output_file
+
+    def counts(self) -> dict[str, int]:
+        """Number of planned creations, changes, deletions and unchanged outputs."""
+        counts = {"create": 0, "change": 0, "delete": 0}
+        for change in self.changes:
+            counts[change.action] += 1
+        return {**counts, "unchanged": self.unchanged_outputs}
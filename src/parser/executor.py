@@ -0,0 +1,319 @@
+"""Execution strategies for running per-file parse jobs serially or in parallel.
+
+Jobs are plain callables taking a single file path. They must not touch shared
+mutable state: all bookkeeping (counters, console output, callbacks) happens in
+the calling thread as results are yielded, so the thread and process executors
+never need locks around reporting.
+"""
+
+import multiprocessing
+import os
+import sys
+import threading
+from collections import deque
+from collections.abc import Callable, Collection, Iterator, Sequence
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Literal, Protocol
+
+from pydantic import BaseModel, ConfigDict, Field
+
+# Type aliases
+ExecutionStrategy = Literal["serial", "threads", "processes"]
+ExecutorKind = Literal["auto", "serial", "threads", "processes"]
+
+# Fixed per-file scheduling cost, in bytes-equivalent units
+FILE_OVERHEAD_BYTES = 1024
+
+# Target number of tasks per worker when scheduling parallel runs
+CHUNKS_PER_WORKER = 4
+
+# Tasks kept queued per worker so no worker idles between completions
+TASKS_IN_FLIGHT_PER_WORKER = 2
+
+# How often a limited run re-checks its limiter while tasks are running
+LIMITER_POLL_SECONDS = 0.1
+
+# Stop flag shared with process pool workers, installed by _init_worker()
+_worker_stop_event: Any = None
+
+
+class ConcurrencyLimiter(Protocol):
+    """Decides how many tasks a parallel run may have in flight."""
+
+    def limit(self, in_flight: int) -> int:
+        """Return the allowed number of in-flight tasks.
+
+        Must return at least 1 when in_flight is 0, or the run cannot progress.
+        """
+        ...
+
+
+class ExecutionPlan(BaseModel):
+    """Resolved execution strategy for a batch run."""
+
+    model_config = ConfigDict(frozen=True)
+
+    executor: ExecutionStrategy = Field(description="Execution strategy")
+    workers: int = Field(default=1, description="Number of parallel workers")
+    chunk_size: int = Field(default=1, description="Maximum files handed to a worker per task")
+    largest_first: bool = Field(
+        default=True,
+        description="Dispatch the largest files first; if False, in input order",
+    )
+    reason: str = Field(default="requested", description="Why this plan was chosen")
+
+    def describe(self) -> str:
+        """Return a one-line human-readable description of the plan."""
+        if self.executor == "serial":
+            return f"serial ({self.reason})"
+        return (
+            f"{self.executor} x{self.workers} workers, chunk size {self.chunk_size} "
+            f"({self.reason})"
+        )
+
+
+def gil_enabled() -> bool:
+    """Check whether the running interpreter has the GIL enabled.
+
+    Returns:
+        False on free-threaded (3.13t/3.14t) builds running without the GIL,
+        True everywhere else
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    if is_gil_enabled is None:
+        return True
+    return bool(is_gil_enabled())
+
+
+def default_worker_count() -> int:
+    """Return the default number of parallel workers (one per available CPU)."""
+    if hasattr(os, "process_cpu_count"):
+        count = os.process_cpu_count()
+    else:
+        count = os.cpu_count()
+    return max(1, count or 1)
+
+
+def _init_worker(stop_event: Any) -> None:
+    """Install the run's stop flag in a process pool worker."""
+    global _worker_stop_event
+    _worker_stop_event = stop_event
+
+
+def _run_chunk[T](
+    job: Callable[[Path], T],
+    paths: Sequence[Path],
+    stop_event: threading.Event | None = None,
+) -> list[T]:
+    """Run a job over a chunk of paths inside a worker.
+
+    Module-level so it can be pickled for the process pool. The stop flag is
+    checked between files, so a cancelled run never interrupts a job part-way
+    and the returned list may be shorter than paths.
+    """
+    stop = stop_event if stop_event is not None else _worker_stop_event
+    results = []
+    for path in paths:
+        if stop is not None and stop.is_set():
+            break
+        results.append(job(path))
+    return results
+
+
+def file_sizes(files: Sequence[Path]) -> list[int]:
+    """Return the size of each file in bytes, treating unreadable files as empty.
+
+    Args:
+        files: Files to measure
+
+    Returns:
+        Size per file, in input order
+    """
+    sizes = []
+    for path in files:
+        try:
+            sizes.append(path.stat().st_size)
+        except OSError:
+            sizes.append(0)
+    return sizes
+
+
+def schedule_chunks(
+    sizes: Sequence[int],
+    workers: int,
+    max_chunk_size: int,
+    priority: Collection[int] = (),
+    largest_first: bool = True,
+) -> list[list[int]]:
+    """Group file indices into tasks, most expensive first.
+
+    File size is the cost model, plus a fixed overhead per file so that empty
+    files still count as work. Files are ordered by descending cost so large
+    manifests start immediately instead of landing on one worker at the end of
+    the run. Each task's cost target is a fraction of the work still remaining
+    (guided self-scheduling): early tasks are large, and the tail is made of
+    small tasks that idle workers pick up from the shared queue while others
+    finish. Files of equal size keep their input order. Priority files (for
+    example, ones that failed in an earlier run) are dispatched before all
+    others. Without largest_first, files are dispatched in input order (for
+    callers that handle results in input order, so that few results wait).
+
+    Args:
+        sizes: Size of each file in bytes
+        workers: Number of workers
+        max_chunk_size: Maximum number of files per task
+        priority: Indices to dispatch first
+        largest_first: Order files by descending cost instead of input order
+
+    Returns:
+        Lists of indices into sizes, in dispatch order
+    """
+    costs = [size + FILE_OVERHEAD_BYTES for size in sizes]
+    first = set(priority)
+    order = sorted(
+        range(len(costs)), key=lambda i: (i not in first, -costs[i] if largest_first else 0)
+    )
+    remaining = sum(costs)
+    chunks: list[list[int]] = []
+    chunk: list[int] = []
+    chunk_cost = 0
+    target = remaining / (workers * CHUNKS_PER_WORKER)
+
+    for index in order:
+        chunk.append(index)
+        chunk_cost += costs[index]
+        if chunk_cost >= target or len(chunk) >= max_chunk_size:
+            chunks.append(chunk)
+            remaining -= chunk_cost
+            chunk, chunk_cost = [], 0
+            target = remaining / (workers * CHUNKS_PER_WORKER)
+
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def iter_job_results[T](
+    files: Sequence[Path],
+    job: Callable[[Path], T],
+    plan: ExecutionPlan,
+    cancel: threading.Event | None = None,
+    priority: Collection[int] = (),
+    limiter: ConcurrencyLimiter | None = None,
+    on_worker_lost: Callable[[Path, BaseException], T] | None = None,
+) -> Iterator[tuple[int, T]]:
+    """Run a job over every file and yield results as they complete.
+
+    Parallel runs dispatch files using schedule_chunks(), largest-first unless
+    the plan says otherwise; callers restore input order from the yielded
+    indices. Tasks are submitted
+    incrementally, keeping a bounded number in flight, so dispatch can be
+    slowed down by a limiter or stopped by cancellation at any time.
+
+    Cancellation is cooperative: once the caller sets cancel, queued tasks are
+    dropped and workers stop before their next file, while files already being
+    processed finish normally and are still yielded. Nothing is interrupted
+    mid-write. The same clean shutdown happens if the caller stops iterating.
+
+    If a process worker dies (e.g. killed by the kernel for running out of
+    memory), the pool is broken: nothing more is dispatched, and with
+    on_worker_lost every file of the chunks that were lost is yielded with
+    the result it returns, so the caller can report them and stop cleanly.
+
+    Args:
+        files: Files to process
+        job: Callable invoked once per file; must be picklable for "processes"
+        plan: Execution strategy, worker count and maximum chunk size
+        cancel: Optional event the caller sets to stop the run early
+        priority: Indices of files to process before all others
+        limiter: Optional limiter consulted before each dispatch (e.g. a memory cap)
+        on_worker_lost: Builds the result of a file whose worker process died;
+            without it, the pool's BrokenProcessPool error is raised
+
+    Yields:
+        Tuples of (index into files, job result) in completion order
+
+    Raises:
+        BrokenProcessPool: If a worker process dies and on_worker_lost is None
+    """
+    if plan.executor == "serial" or len(files) <= 1:
+        first = set(priority)
+        order = sorted(range(len(files)), key=lambda i: i not in first)
+        for index in order:
+            if cancel is not None and cancel.is_set():
+                return
+            yield index, job(files[index])
+        return
+
+    pool: Executor
+    stop_event: Any
+    if plan.executor == "threads":
+        stop_event = threading.Event()
+        pool = ThreadPoolExecutor(max_workers=plan.workers, thread_name_prefix="argocd-parse")
+    else:
+        stop_event = multiprocessing.Event()
+        pool = ProcessPoolExecutor(
+            max_workers=plan.workers, initializer=_init_worker, initargs=(stop_event,)
+        )
+
+    try:
+        pending = deque(
+            schedule_chunks(
+                file_sizes(files), plan.workers, plan.chunk_size, priority, plan.largest_first
+            )
+        )
+        thread_stop = stop_event if plan.executor == "threads" else None
+        max_in_flight = plan.workers * TASKS_IN_FLIGHT_PER_WORKER
+        in_flight: dict[Future[list[T]], list[int]] = {}
+
+        while pending or in_flight:
+            if cancel is not None and cancel.is_set() and not stop_event.is_set():
+                stop_event.set()
+                pending.clear()
+
+            allowed = max_in_flight
+            if limiter is not None:
+                allowed = min(allowed, limiter.limit(len(in_flight)))
+                if not in_flight:
+                    allowed = max(allowed, 1)
+            while pending and len(in_flight) < allowed:
+                chunk = pending.popleft()
+                future = pool.submit(_run_chunk, job, [files[i] for i in chunk], thread_stop)
+                in_flight[future] = chunk
+
+            if not in_flight:
+                continue
+
+            done, _ = wait(
+                in_flight,
+                timeout=LIMITER_POLL_SECONDS if limiter is not None else None,
+                return_when=FIRST_COMPLETED,
+            )
+            # Report simultaneous completions in dispatch order
+            for future in [f for f in in_flight if f in done]:
+                chunk = in_flight.pop(future)
+                try:
+                    chunk_results = future.result()
+                except BrokenProcessPool as e:
+                    if on_worker_lost is None:
+                        raise
+                    # Every other in-flight chunk fails the same way; submit no more
+                    pending.clear()
+                    for index in chunk:
+                        yield index, on_worker_lost(files[index], e)
+                    continue
+                # Chunks stopped by cancellation return fewer results than indices
+                for index, result in zip(chunk, chunk_results, strict=False):
+                    yield index, result
+    finally:
+        stop_event.set()
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,86 @@
+"""Named fields of migration output records, for grouping and output layouts.
+
+Fields are given either as a short alias (``cluster``, ``team``), as
+``label:NAME`` or ``annotation:NAME`` for keys that contain dots or slashes,
+or as a dotted path into the output JSON (``source.revision``).
+"""
+
+import re
+from typing import Any
+
+# Short names for commonly used fields
+FIELD_ALIASES: dict[str, tuple[str, ...]] = {
+    "name": ("metadata", "name"),
+    "cluster": ("destination", "clusterName"),
+    "namespace": ("destination", "namespace"),
+    "project": ("project",),
+    "repo": ("source", "repoURL"),
+    "environment": ("metadata", "labels", "environment"),
+    "team": ("metadata", "labels", "team"),
+}
+
+_UNSAFE_PATH_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def parse_field(spec: str) -> tuple[str, ...]:
+    """Parse a field specification into a path of JSON keys.
+
+    Args:
+        spec: Alias (e.g. "cluster"), "label:NAME", "annotation:NAME" or a
+            dotted path such as "metadata.labels.region"
+
+    Returns:
+        Keys leading to the field in the output JSON
+
+    Raises:
+        ValueError: If spec is empty or malformed
+    """
+    spec = spec.strip()
+    if spec in FIELD_ALIASES:
+        return FIELD_ALIASES[spec]
+    prefix, separator, key = spec.partition(":")
+    if separator:
+        if prefix == "label" and key:
+            return ("metadata", "labels", key)
+        if prefix == "annotation" and key:
+            return ("metadata", "annotations", key)
+        raise ValueError(f"Invalid field '{spec}'. Expected label:NAME or annotation:NAME")
+    path = tuple(spec.split("."))
+    if not spec or not all(path):
+        raise ValueError(f"Invalid field '{spec}'. Expected an alias or a dotted path")
+    return path
+
+
+def field_value(record: dict[str, Any], path: tuple[str, ...]) -> str | None:
+    """Look up a field in an output record.
+
+    Args:
+        record: Output JSON object
+        path: Keys from parse_field()
+
+    Returns:
+        The value as a string, or None if it is missing, null or empty
+    """
+    value: Any = record
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def safe_path_component(value: str) -> str:
+    """Make a field value safe to use as one directory or file name.
+
+    Args:
+        value: Field value
+
+    Returns:
+        Value with path separators and unusual characters replaced by "_"
+        and no leading dot
+    """
+    return _UNSAFE_PATH_CHARS.sub("_", value).lstrip(".") or "_"
@@ -0,0 +1,219 @@
+"""Grouped ``config.json`` output for ApplicationSet git files generators.
+
+Applications are grouped by a field of their output (cluster, project, a
+label such as environment or team) and each group is written as a JSON array
+to ``<output_dir>/<group>/config.json``, the layout consumed by an
+ApplicationSet git ``files`` generator.
+
+While the run is in progress each group's records are streamed as compact
+NDJSON into a temporary part file. Only a bounded number of part files are
+kept open at once (least recently used handles are closed and reopened in
+append mode), so thousands of groups never exhaust file descriptors. When the
+run ends, groups are finalized one at a time: records are sorted by name, so
+repeated runs produce identical files, and written only if changed.
+
+Group values are sanitized into directory names, so distinct values can map
+to one directory ("prod east" and "prod/east" both become ``prod_east``);
+the records of a later value are then refused rather than merged into the
+other group's file. The groups a run wrote are recorded in a ledger, and the
+config.json of a group that the next run no longer produces is removed.
+"""
+
+import json
+import os
+import shutil
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Any
+
+from parser.fields import field_value, parse_field, safe_path_component
+from parser.output import (
+    NameClaims,
+    OutputConflictError,
+    atomic_write_text,
+    load_mapping,
+    lock_directory,
+    write_if_changed,
+)
+from parser.serializer import JsonStyle
+
+# File written into each group directory
+GROUP_FILE_NAME = "config.json"
+
+# Group for applications that have no value for the grouping field
+UNGROUPED = "_ungrouped"
+
+# Default cap on simultaneously open part files
+DEFAULT_MAX_OPEN_FILES = 64
+
+# Ledger of the groups written by the last run: directory -> group value
+GROUPS_FILE_NAME = ".argocd-parse.groups"
+
+
+def _group_label(value: str | None) -> str:
+    return f"'{value}'" if value is not None else "(no value)"
+
+
+class GroupedConfigOutput:
+    """Output sink writing one ``config.json`` array per group."""
+
+    def __init__(
+        self,
+        output_dir: Path,
+        group_by: str,
+        pretty: bool = True,
+        max_open_files: int = DEFAULT_MAX_OPEN_FILES,
+        on_wait: Callable[[], None] | None = None,
+    ) -> None:
+        """Prepare grouped output; it is opened by entering the context.
+
+        Args:
+            output_dir: Directory receiving one subdirectory per group
+            group_by: Grouping field (see parser.fields.parse_field)
+            pretty: Indent the config.json arrays (2 spaces) or write them compact
+            max_open_files: Maximum part files open at once
+            on_wait: Called once if another run holds the directory lock
+
+        Raises:
+            ValueError: If group_by is not a valid field or max_open_files < 1
+        """
+        if max_open_files < 1:
+            raise ValueError(f"max_open_files must be at least 1, got {max_open_files}")
+        self.output_dir = output_dir
+        self.group_path = parse_field(group_by)
+        self.pretty = pretty
+        self.max_open_files = max_open_files
+        self.on_wait = on_wait
+        # Records are framed one per line while the run is in progress
+        self.json_style: JsonStyle | None = "compact"
+        self.written = 0
+        self.unchanged = 0
+        self._claims = NameClaims()
+        self._groups: dict[str, Path] = {}
+        # Group directory -> the value it was created for (None: ungrouped)
+        self._values: dict[str, str | None] = {}
+        self._handles: OrderedDict[str, IO[bytes]] = OrderedDict()
+        self._work_dir: Path | None = None
+        self._lock_fd: int | None = None
+
+    def __enter__(self) -> "GroupedConfigOutput":
+        """Lock the output directory and create the part file directory.
+
+        Raises:
+            OSError: If the directory cannot be created or locked
+        """
+        self._lock_fd = lock_directory(self.output_dir, self.on_wait)
+        self._work_dir = self.output_dir / f".argocd-parse-groups.{os.getpid()}"
+        self._work_dir.mkdir(exist_ok=True)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Write every group's config.json (unless the run failed) and clean up."""
+        try:
+            for handle in self._handles.values():
+                handle.close()
+            self._handles.clear()
+            if exc_type is None:
+                for group in sorted(self._groups):
+                    self._finalize(group)
+                self._remove_stale_groups()
+        finally:
+            if self._work_dir is not None:
+                shutil.rmtree(self._work_dir, ignore_errors=True)
+            if self._lock_fd is not None:
+                os.close(self._lock_fd)
+                self._lock_fd = None
+
+    def _handle(self, group: str) -> IO[bytes]:
+        handle = self._handles.get(group)
+        if handle is not None:
+            self._handles.move_to_end(group)
+            return handle
+        if len(self._handles) >= self.max_open_files:
+            _, oldest = self._handles.popitem(last=False)
+            oldest.close()
+        part = self._groups.get(group)
+        if part is None:
+            assert self._work_dir is not None
+            part = self._groups[group] = self._work_dir / f"{len(self._groups)}.ndjson"
+        handle = self._handles[group] = open(part, "ab")
+        return handle
+
+    def _finalize(self, group: str) -> None:
+        with open(self._groups[group], "rb") as f:
+            records: list[dict[str, Any]] = [json.loads(line) for line in f]
+        records.sort(key=lambda record: str(field_value(record, ("metadata", "name"))))
+        if self.pretty:
+            text = json.dumps(records, indent=2, ensure_ascii=False)
+        else:
+            text = json.dumps(records, ensure_ascii=False, separators=(",", ":"))
+        if write_if_changed(self._group_file(group), (text + "\n").encode("utf-8")):
+            self.written += 1
+        else:
+            self.unchanged += 1
+
+    def _group_file(self, group: str) -> Path:
+        return self.output_dir / group / GROUP_FILE_NAME
+
+    def _remove_stale_groups(self) -> None:
+        ledger = self.output_dir / GROUPS_FILE_NAME
+        for group in sorted(load_mapping(ledger).keys() - self._groups.keys()):
+            if safe_path_component(group) != group:
+                # Not a directory this sink creates; leave it alone
+                continue
+            self._group_file(group).unlink(missing_ok=True)
+            try:
+                (self.output_dir / group).rmdir()
+            except OSError:
+                # Holds other files
+                pass
+        groups = {
+            group: value if value is not None else UNGROUPED
+            for group, value in self._values.items()
+        }
+        atomic_write_text(ledger, json.dumps(groups, indent=0, sort_keys=True))
+
+    def claim(self, name: str, source: str) -> str | None:
+        """Claim an application name across all groups for this run.
+
+        Args:
+            name: Application name
+            source: Manifest producing the output
+
+        Returns:
+            The manifest that already owns the name, or None if the claim
+            succeeded
+        """
+        return self._claims.claim(name, source)
+
+    def write(self, name: str, data: bytes) -> Path:
+        """Append one compact output record to its group.
+
+        Args:
+            name: Application name
+            data: Rendered compact JSON
+
+        Returns:
+            Path of the group's config.json (written when the run ends)
+
+        Raises:
+            OutputConflictError: If another group value uses the same directory
+            OSError: If the part file cannot be written
+        """
+        value = field_value(json.loads(data), self.group_path)
+        group = safe_path_component(value) if value is not None else UNGROUPED
+        owner = self._values.setdefault(group, value)
+        if owner != value:
+            raise OutputConflictError(
+                f"Group {_group_label(value)} would share {group}/{GROUP_FILE_NAME} "
+                f"with group {_group_label(owner)}"
+            )
+        self._handle(group).write(data + b"\n")
+        return self._group_file(group)
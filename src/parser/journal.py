@@ -0,0 +1,149 @@
+"""Append-only checkpoint journal for long batch runs.
+
+Each completed ParseResult is appended as one JSON line (the ``--json``
+result record format) as soon as it is known, so a run that dies part-way can
+be resumed without reprocessing finished files. Lines are flushed to the OS
+immediately and fsynced periodically; a torn final line left by a crash is
+ignored on load.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Any
+
+from parser.batch import result_from_dict, result_to_dict
+from parser.models import ParseResult
+
+# Default durability window: at most this much work is lost on power failure
+DEFAULT_FSYNC_INTERVAL_SECONDS = 2.0
+DEFAULT_FSYNC_EVERY_RECORDS = 1000
+
+
+class ResultJournal:
+    """Append parse results to an NDJSON journal with periodic fsync."""
+
+    def __init__(
+        self,
+        path: Path,
+        fsync_interval: float = DEFAULT_FSYNC_INTERVAL_SECONDS,
+        fsync_every: int = DEFAULT_FSYNC_EVERY_RECORDS,
+    ) -> None:
+        """Open (or create) a journal for appending.
+
+        Args:
+            path: Journal file path
+            fsync_interval: Maximum seconds between fsyncs
+            fsync_every: Maximum records between fsyncs
+
+        Raises:
+            OSError: If the journal cannot be opened
+        """
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.fsync_every = fsync_every
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: IO[str] = open(path, "a", encoding="utf-8")
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def append(self, result: ParseResult) -> None:
+        """Record one completed result.
+
+        Args:
+            result: Result to record
+        """
+        self._file.write(json.dumps(result_to_dict(result), ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if (
+            self._unsynced >= self.fsync_every
+            or time.monotonic() - self._last_sync >= self.fsync_interval
+        ):
+            self.sync()
+
+    def sync(self) -> None:
+        """Force recorded results to stable storage."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """Sync and close the journal."""
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self) -> "ResultJournal":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def load_journal(path: Path) -> dict[str, ParseResult]:
+    """Load the latest recorded result for each file in a journal.
+
+    Args:
+        path: Journal file path
+
+    Returns:
+        Mapping of source file path to its most recent result (empty if the
+        journal does not exist)
+    """
+    results: dict[str, ParseResult] = {}
+    try:
+        f = open(path, encoding="utf-8")
+    except FileNotFoundError:
+        return results
+
+    with f:
+        for line in f:
+            try:
+                result = result_from_dict(json.loads(line))
+            except (ValueError, KeyError, TypeError):
+                # Torn write from a crash, or a foreign line: skip it
+                continue
+            results[result.file_path] = result
+    return results
+
+
+def load_failed_files(path: Path) -> set[str]:
+    """Load the files that failed in a previous run.
+
+    Args:
+        path: A journal, or a summary written by ``argocd-parse --json``
+
+    Returns:
+        Source file paths whose latest result is "failed"
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is neither a journal nor a summary
+    """
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+
+    try:
+        data: Any = json.loads(text)
+    except json.JSONDecodeError:
+        data = None
+
+    if isinstance(data, dict) and isinstance(data.get("results"), list):
+        summary_results = [result_from_dict(record) for record in data["results"]]
+        return {result.file_path for result in summary_results if result.status == "failed"}
+
+    journal_results = load_journal(path)
+    if text.strip() and not journal_results:
+        raise ValueError(f"Not a journal or batch summary: {path}")
+    return {
+        file_path for file_path, result in journal_results.items() if result.status == "failed"
+    }
@@ -0,0 +1,102 @@
+"""Output directory layouts: flat, hash-prefix fan-out, or a path template.
+
+A flat directory of 200k ``<name>.json`` files makes listings, rsync and
+every open slow on ext4 and NFS. The ``hash`` layout spreads outputs over
+two levels of 256 directories keyed by a stable hash of the application
+name (``ab/cd/<name>.json``); a template such as
+``{cluster}/{namespace}/{name}.json`` groups them by output fields instead.
+Non-flat layouts keep an index mapping each name to its path, so lookups
+never need a directory scan.
+"""
+
+import hashlib
+import json
+import re
+from typing import Any
+
+from parser.fields import field_value, parse_field, safe_path_component
+
+# Name -> relative path index written by non-flat layouts
+INDEX_FILE_NAME = "index.json"
+
+_PLACEHOLDER = re.compile(r"\{([^{}]*)\}")
+
+
+class OutputLayout:
+    """Maps an application's output to a path relative to the output directory."""
+
+    def __init__(self, spec: str = "flat") -> None:
+        """Parse a layout specification.
+
+        Args:
+            spec: "flat" (<name>.json), "hash" (ab/cd/<name>.json), or a template
+                of "/"-separated components with {FIELD} placeholders, where
+                FIELD is "name" or anything accepted by parse_field (e.g.
+                "{cluster}/{label:team}/{name}.json")
+
+        Raises:
+            ValueError: If the template is malformed
+        """
+        self.spec = spec
+        self._fields: dict[str, tuple[str, ...]] = {}
+        if spec in ("flat", "hash"):
+            return
+        if "{name}" not in spec:
+            raise ValueError(f"Invalid layout '{spec}'. A template must contain {{name}}")
+        if any(part in ("", ".", "..") for part in spec.split("/")):
+            raise ValueError(f"Invalid layout '{spec}'. Expected a relative path template")
+        literal = _PLACEHOLDER.sub("", spec)
+        if "{" in literal or "}" in literal:
+            raise ValueError(f"Invalid layout '{spec}'. Unbalanced braces")
+        for placeholder in _PLACEHOLDER.findall(spec):
+            if placeholder != "name":
+                self._fields[placeholder] = parse_field(placeholder)
+
+    @property
+    def is_flat(self) -> bool:
+        """Whether outputs go directly into the output directory as <name>.json."""
+        return self.spec == "flat"
+
+    def name_component(self, name: str) -> str:
+        """Return an application name as it appears in its output path.
+
+        Templates sanitize the name with safe_path_component, so different
+        names can share a component (e.g. "a b" and "a_b"); flat and hash
+        layouts use the name as is.
+
+        Args:
+            name: Application name
+
+        Returns:
+            Path component derived from the name
+        """
+        if self.spec in ("flat", "hash"):
+            return name
+        return safe_path_component(name)
+
+    def relative_path(self, name: str, data: bytes) -> str:
+        """Compute the POSIX path of an output relative to the output directory.
+
+        Args:
+            name: Application name
+            data: Rendered JSON (only parsed if the template uses output fields)
+
+        Returns:
+            Relative path such as "ab/cd/name.json"
+        """
+        if self.spec == "flat":
+            return f"{name}.json"
+        if self.spec == "hash":
+            digest = hashlib.blake2b(name.encode("utf-8"), digest_size=2).hexdigest()
+            return f"{digest[:2]}/{digest[2:]}/{name}.json"
+
+        record: dict[str, Any] = json.loads(data) if self._fields else {}
+
+        def substitute(match: re.Match[str]) -> str:
+            placeholder = match.group(1)
+            if placeholder == "name":
+                return self.name_component(name)
+            value = field_value(record, self._fields[placeholder])
+            return safe_path_component(value) if value is not None else "_"
+
+        return _PLACEHOLDER.sub(substitute, self.spec)
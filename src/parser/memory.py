@@ -0,0 +1,168 @@
+"""Resident memory monitoring and memory-capped concurrency for batch runs.
+
+Memory is read from ``/proc/<pid>/status`` for this process and its children
+(the process pool workers). On platforms without ``/proc`` the governor cannot
+measure memory and never throttles.
+"""
+
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from parser.models import ThrottleEvent
+
+# Fraction of the cap at which dispatch is throttled, and at which it recovers
+HIGH_WATER_RATIO = 0.9
+LOW_WATER_RATIO = 0.75
+
+# Minimum seconds between /proc samples
+SAMPLE_INTERVAL_SECONDS = 0.1
+
+# Throttle events kept per run; later ones are only counted
+MAX_THROTTLE_EVENTS = 1000
+
+
+def read_rss(pid: int | str = "self") -> int | None:
+    """Read a process's resident set size from /proc.
+
+    Args:
+        pid: Process ID, or "self"
+
+    Returns:
+        Resident memory in bytes, or None if unavailable
+    """
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+def child_pids() -> list[int]:
+    """List the direct children of this process (e.g. process pool workers).
+
+    Returns:
+        Child process IDs, empty if /proc does not expose them
+    """
+    pids: list[int] = []
+    for children_file in Path("/proc/self/task").glob("*/children"):
+        try:
+            pids.extend(int(pid) for pid in children_file.read_text().split())
+        except (OSError, ValueError):
+            continue
+    return pids
+
+
+def total_rss() -> int | None:
+    """Resident memory of this process plus its children.
+
+    Returns:
+        Total resident memory in bytes, or None if unavailable
+    """
+    own = read_rss()
+    if own is None:
+        return None
+    return own + sum(read_rss(pid) or 0 for pid in child_pids())
+
+
+class MemoryGovernor:
+    """Adapt the number of in-flight tasks to stay under a memory cap.
+
+    Concurrency is halved when memory crosses the high-water mark, dispatch is
+    paused entirely above the cap (while at least one task is still running to
+    free memory), and concurrency grows back one task at a time once memory
+    falls below the low-water mark. Memory is sampled at most every
+    SAMPLE_INTERVAL_SECONDS and each sample is acted on once, so a single
+    reading changes concurrency by at most one step. Only the first MAX_THROTTLE_EVENTS
+    actions are recorded as events, so a run oscillating around its cap for
+    hours does not grow without bound; later ones are counted in
+    dropped_events.
+    """
+
+    def __init__(
+        self,
+        max_rss: int,
+        max_concurrency: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a governor.
+
+        Args:
+            max_rss: Memory cap in bytes for this process and its workers
+            max_concurrency: Upper bound on in-flight tasks
+            clock: Monotonic clock (replaceable for tests)
+        """
+        self.max_rss = max_rss
+        self.max_concurrency = max(1, max_concurrency)
+        self.concurrency = self.max_concurrency
+        self.peak_rss = 0
+        self.events: list[ThrottleEvent] = []
+        self.dropped_events = 0
+        self._paused = False
+        self._clock = clock
+        self._started = clock()
+        self._last_sample: float | None = None
+        self._rss: int | None = None
+
+    def _sample(self) -> tuple[int | None, bool]:
+        """Return the latest RSS reading, and whether it was just taken."""
+        now = self._clock()
+        if self._last_sample is not None and now - self._last_sample < SAMPLE_INTERVAL_SECONDS:
+            return self._rss, False
+        self._last_sample = now
+        self._rss = total_rss()
+        if self._rss is not None:
+            self.peak_rss = max(self.peak_rss, self._rss)
+        return self._rss, True
+
+    def _record(self, action: str, rss: int) -> None:
+        if len(self.events) >= MAX_THROTTLE_EVENTS:
+            self.dropped_events += 1
+            return
+        self.events.append(
+            ThrottleEvent(
+                elapsed_seconds=round(self._clock() - self._started, 3),
+                action=action,
+                rss_bytes=rss,
+                concurrency=0 if self._paused else self.concurrency,
+            )
+        )
+
+    def limit(self, in_flight: int) -> int:
+        """Return how many tasks may be in flight right now.
+
+        Args:
+            in_flight: Tasks currently running or queued in the pool
+
+        Returns:
+            Allowed number of in-flight tasks (at least 1 when nothing is running)
+        """
+        rss, fresh = self._sample()
+        if rss is None:
+            return self.max_concurrency
+
+        if not fresh:
+            # Between samples, keep the decision taken on the last reading
+            return 0 if self._paused and in_flight > 0 else self.concurrency
+
+        if rss >= self.max_rss and in_flight > 0:
+            if not self._paused:
+                self._paused = True
+                self._record("pause", rss)
+            return 0
+
+        if self._paused:
+            self._paused = False
+            self._record("resume", rss)
+
+        if rss >= self.max_rss * HIGH_WATER_RATIO and self.concurrency > 1:
+            self.concurrency = max(1, self.concurrency // 2)
+            self._record("reduce", rss)
+        elif rss < self.max_rss * LOW_WATER_RATIO and self.concurrency < self.max_concurrency:
+            self.concurrency += 1
+            self._record("increase", rss)
+
+        return self.concurrency
@@ -0,0 +1,386 @@
+"""Merging of batch summaries and output directories from sharded runs."""
+
+import json
+import os
+import re
+import shutil
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Literal, TextIO
+
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic import ValidationError as PydanticValidationError
+
+from parser.batch import duplicate_output_result, result_from_dict
+from parser.models import BatchSummary, ParseResult
+from parser.signatures import ErrorSignatureCounter
+
+# Type aliases
+LinkMode = Literal["hardlink", "copy"]
+
+# Characters read from a summary file at a time
+READ_CHUNK_SIZE = 1 << 16
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"\s*")
+# First record of an ``argocd-parse --json-stream`` summary
+_STREAM_START = re.compile(r'\s*\{\s*"type"\s*:')
+
+
+class _JsonReader:
+    """Incremental reader for the tokens of a large JSON document."""
+
+    def __init__(self, f: TextIO) -> None:
+        self._f = f
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+
+    def _fill(self, size: int = READ_CHUNK_SIZE) -> bool:
+        chunk = self._f.read(size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._position :] + chunk
+        self._position = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or "" at the end of the file."""
+        while True:
+            match = _WHITESPACE.match(self._buffer, self._position)
+            self._position = match.end() if match else self._position
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._fill():
+                return ""
+
+    def expect(self, characters: str) -> str:
+        """Consume the next non-whitespace character, one of characters.
+
+        Raises:
+            ValueError: If the next character is not one of characters
+        """
+        character = self.peek()
+        if not character or character not in characters:
+            raise ValueError(f"expected one of {characters!r}")
+        self._position += 1
+        return character
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value.
+
+        Raises:
+            ValueError: If the value is not valid JSON
+        """
+        self.peek()
+        size = READ_CHUNK_SIZE
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            else:
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(self._buffer) or self._eof:
+                    self._position = end
+                    return value
+            # Grow reads geometrically so a large value is not re-decoded too often
+            self._fill(size)
+            size *= 2
+
+
+def _read_json_summary(f: TextIO, header: dict[str, Any]) -> Iterator[Any]:
+    """Stream the results of an ``argocd-parse --json`` summary.
+
+    Args:
+        f: Summary file, positioned at the start
+        header: Filled with every other top-level field as it is read; fields
+            written before the results are present when the first is yielded
+
+    Yields:
+        Each result record
+
+    Raises:
+        ValueError: If the file is not a JSON object with a results array
+    """
+    reader = _JsonReader(f)
+    reader.expect("{")
+    has_results = False
+    if reader.peek() != "}":
+        while True:
+            key = reader.value()
+            reader.expect(":")
+            if key == "results" and reader.peek() == "[":
+                has_results = True
+                reader.expect("[")
+                if reader.peek() != "]":
+                    while True:
+                        yield reader.value()
+                        if reader.expect(",]") == "]":
+                            break
+                else:
+                    reader.expect("]")
+            else:
+                header[str(key)] = reader.value()
+            if reader.expect(",}") == "}":
+                break
+    if not has_results:
+        raise ValueError("no results array")
+
+
+def _last_line(path: Path) -> bytes:
+    """Read the last non-empty line of a file without reading the whole file."""
+    with open(path, "rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        tail = b""
+        while end > 0:
+            start = max(0, end - READ_CHUNK_SIZE)
+            f.seek(start)
+            tail = f.read(end - start) + tail
+            end = start
+            stripped = tail.rstrip()
+            if b"\n" in stripped:
+                return stripped.rsplit(b"\n", 1)[1]
+        return tail.strip()
+
+
+def _read_stream_summary(
+    f: TextIO, summary_file: Path, header: dict[str, Any]
+) -> Iterator[Any]:
+    """Stream the results of an ``argocd-parse --json-stream`` summary.
+
+    The final summary record is read first, from the end of the file, so the
+    run's output directory is known before its results are merged.
+
+    Args:
+        f: Summary file, positioned at the start
+        summary_file: Path of f
+        header: Filled with the fields of the summary record
+
+    Yields:
+        Each result record
+
+    Raises:
+        ValueError: If the stream has no final summary record
+    """
+    try:
+        last = json.loads(_last_line(summary_file))
+    except json.JSONDecodeError:
+        last = None
+    if not isinstance(last, dict) or last.get("type") != "summary":
+        raise ValueError("no final summary record (was the run interrupted?)")
+    header.update(last)
+    for line in f:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        kind = record.get("type") if isinstance(record, dict) else None
+        if kind == "summary":
+            return
+        if kind == "result":
+            yield record
+
+
+class NameCollision(BaseModel):
+    """Two merged results that produce the same application output."""
+
+    model_config = ConfigDict(frozen=True)
+
+    application_name: str = Field(description="Application name shared by both results")
+    first_file: str = Field(description="Source manifest whose output is kept")
+    duplicate_file: str = Field(description="Source manifest whose output is dropped")
+    summary_file: str = Field(description="Summary the duplicate was read from")
+
+
+class SummaryMerger:
+    """Fold ``argocd-parse --json`` or ``--json-stream`` summaries into one summary.
+
+    Summary files are read incrementally and their results streamed to the
+    caller, so memory holds only counters, failed results and the names seen
+    so far, however large each shard is. A manifest reported by more than
+    one summary is counted once (first wins). When two different manifests
+    produce the same application name, the first keeps it and the later one
+    is recorded as a collision and a DUPLICATE_OUTPUT failure, as a single
+    run over all the manifests would report it.
+    """
+
+    def __init__(self) -> None:
+        self.successful = 0
+        self.failed = 0
+        self.skipped = 0
+        self.written = 0
+        self.unchanged = 0
+        self.failed_results: list[ParseResult] = []
+        self._signatures = ErrorSignatureCounter()
+        self.collisions: list[NameCollision] = []
+        self.duplicate_files: list[str] = []
+        self.shards: dict[int, set[int]] = {}
+        self._seen_files: set[str] = set()
+        self._names: dict[str, str] = {}
+
+    def add_summary(self, summary_file: Path) -> Iterator[tuple[ParseResult, str | None]]:
+        """Merge one summary file.
+
+        Args:
+            summary_file: Path to a ``--json`` summary or ``--json-stream`` output
+
+        Yields:
+            Each newly merged result, with the output directory recorded by the
+            run that produced it (None for summaries that predate the field)
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a batch summary
+        """
+        header: dict[str, Any] = {}
+        with open(summary_file, encoding="utf-8") as f:
+            is_stream = _STREAM_START.match(f.read(64)) is not None
+            f.seek(0)
+            records = (
+                _read_stream_summary(f, summary_file, header)
+                if is_stream
+                else _read_json_summary(f, header)
+            )
+            try:
+                for record in records:
+                    try:
+                        result = result_from_dict(record)
+                    except (KeyError, TypeError, PydanticValidationError) as e:
+                        raise ValueError(f"invalid result record: {e}") from e
+                    merged = self._merge_result(result, summary_file)
+                    if merged is not None:
+                        yield merged, header.get("output_dir")
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON in summary {summary_file}: {e}") from e
+            except ValueError as e:
+                raise ValueError(f"Not a batch summary: {summary_file}: {e}") from e
+
+        counts = header.get("summary")
+        if isinstance(counts, dict):
+            self.written += counts.get("written", 0)
+            self.unchanged += counts.get("unchanged", 0)
+
+        shard = header.get("shard")
+        if isinstance(shard, dict):
+            self.shards.setdefault(shard["count"], set()).add(shard["index"])
+
+    def _merge_result(self, result: ParseResult, summary_file: Path) -> ParseResult | None:
+        """Count one result; returns it as merged, or None for a repeated file."""
+        if result.file_path in self._seen_files:
+            self.duplicate_files.append(result.file_path)
+            return None
+        self._seen_files.add(result.file_path)
+
+        if result.status == "success":
+            name = result.application_name or ""
+            first_file = self._names.setdefault(name, result.file_path)
+            if first_file != result.file_path:
+                self.collisions.append(
+                    NameCollision(
+                        application_name=name,
+                        first_file=first_file,
+                        duplicate_file=result.file_path,
+                        summary_file=str(summary_file),
+                    )
+                )
+                result = duplicate_output_result(result, first_file)
+
+        if result.status == "success":
+            self.successful += 1
+        elif result.status == "failed":
+            self.failed += 1
+            self.failed_results.append(result)
+            self._signatures.add(result)
+        else:
+            self.skipped += 1
+        return result
+
+    @property
+    def missing_shards(self) -> list[str]:
+        """Shards that were expected from the shard counts seen but not merged."""
+        return [
+            f"{index}/{count}"
+            for count, indexes in sorted(self.shards.items())
+            for index in range(1, count + 1)
+            if index not in indexes
+        ]
+
+    @property
+    def summary(self) -> BatchSummary:
+        """Aggregate summary; results hold only the failed files."""
+        return BatchSummary(
+            total=self.successful + self.failed + self.skipped,
+            successful=self.successful,
+            failed=self.failed,
+            skipped=self.skipped,
+            written=self.written,
+            unchanged=self.unchanged,
+            results=self.failed_results,
+            error_signatures=self._signatures.signatures(),
+        )
+
+
+def relative_output_path(result: ParseResult, run_output_dir: str | None) -> Path:
+    """Return a result's output file path relative to its run's output directory.
+
+    Args:
+        result: Successful parse result
+        run_output_dir: Output directory recorded by the producing run, if any
+
+    Returns:
+        Relative path (just the file name for summaries without output_dir)
+    """
+    recorded = Path(result.output_path or "")
+    if run_output_dir is not None:
+        try:
+            return recorded.relative_to(run_output_dir)
+        except ValueError:
+            pass
+    return Path(recorded.name)
+
+
+def _place_file(source: Path, destination: Path, mode: LinkMode) -> str | None:
+    """Hard-link or copy one file into place, replacing any existing file.
+
+    Returns:
+        Error message, or None on success
+    """
+    temp = destination.with_name(f".{destination.name}.{os.getpid()}.tmp")
+    try:
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        if mode == "hardlink":
+            try:
+                os.link(source, temp)
+            except OSError:
+                # Cross-device or unsupported filesystem: fall back to copying
+                shutil.copyfile(source, temp)
+        else:
+            shutil.copyfile(source, temp)
+        os.replace(temp, destination)
+        return None
+    except OSError as e:
+        temp.unlink(missing_ok=True)
+        return f"{source}: {e.strerror or e}"
+
+
+def place_outputs(
+    placements: list[tuple[Path, Path]],
+    mode: LinkMode = "hardlink",
+    max_workers: int = 8,
+) -> list[str]:
+    """Hard-link or copy output files into a combined directory in parallel.
+
+    Args:
+        placements: (source, destination) file pairs
+        mode: "hardlink" (falls back to copy across devices) or "copy"
+        max_workers: Number of parallel I/O threads
+
+    Returns:
+        Error messages for files that could not be placed
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        outcomes = pool.map(lambda pair: _place_file(pair[0], pair[1], mode), placements)
+        return [error for error in outcomes if error is not None]
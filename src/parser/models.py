@@ -56,6 +56,35 @@ class ParseResult(BaseModel):
     )
 
 
+class ThrottleEvent(BaseModel):
+    """Concurrency change made to keep a batch run under its memory cap."""
+
+    model_config = ConfigDict(frozen=True)
+
+    elapsed_seconds: float = Field(description="Seconds since the run started")
+    action: str = Field(description="Throttle action: reduce, pause, resume, or increase")
+    rss_bytes: int = Field(description="Resident memory of the run when the action was taken")
+    concurrency: int = Field(description="Allowed in-flight tasks after the action")
+
+
+class ErrorSignature(BaseModel):
+    """Failures sharing an error type, field and message template."""
+
+    model_config = ConfigDict(frozen=True)
+
+    error_type: str = Field(description="Error type code")
+    field: str | None = Field(
+        default=None, description="Field path, with list indexes replaced by <n>"
+    )
+    message: str = Field(
+        description="Message template, with values, paths and numbers replaced by placeholders"
+    )
+    count: int = Field(description="Number of failed files with this signature")
+    sample_files: list[str] = Field(
+        default_factory=list, description="A few of those files (the first by path)"
+    )
+
+
 class BatchSummary(BaseModel):
     """Summary of batch processing operation."""
 
@@ -65,10 +94,33 @@ class BatchSummary(BaseModel):
     successful: int = Field(description="Number of successfully parsed files")
     failed: int = Field(description="Number of files that failed parsing")
     skipped: int = Field(default=0, description="Number of files skipped")
+    written: int = Field(default=0, description="Number of output files written")
+    unchanged: int = Field(
+        default=0, description="Number of output files left untouched because they were identical"
+    )
+    stopped_early: bool = Field(
+        default=False,
+        description=(
+            "Whether the run was cancelled after reaching its failure limit or losing a "
+            "worker process"
+        ),
+    )
     results: list[ParseResult] = Field(
         default_factory=list,
         description="Individual parse results for each file"
     )
+    throttle_events: list[ThrottleEvent] = Field(
+        default_factory=list,
+        description="Memory throttling actions taken during the run"
+    )
+    throttle_events_dropped: int = Field(
+        default=0,
+        description="Throttling actions beyond the recorded throttle_events limit"
+    )
+    error_signatures: list[ErrorSignature] = Field(
+        default_factory=list,
+        description="Failures grouped by signature, most frequent first"
+    )
 
     @property
     def success_rate(self) -> float:
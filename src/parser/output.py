@@ -0,0 +1,638 @@
+"""Output sinks: concurrency-safe JSON files, or one aggregated stream.
+
+Files are written to a temporary name in the target directory and renamed
+into place, so readers (and a crashed run) never leave a partial JSON file.
+A batch run holds an advisory ``flock`` on the directory for its duration
+and claims each application name before writing it: a second manifest with
+the same ``metadata.name`` in the same run, or a manifest from another run
+whose claim is still on record, is reported instead of silently overwriting
+the first output. Claims are kept in memory and persisted once per run, so
+no per-file stat or mkdir is needed. Files can also be fanned out into
+subdirectories (see parser.layout), with an index of where each one went.
+
+Alternatively, every output can be streamed into one NDJSON or JSON array
+file through a buffered (optionally gzip or zstd compressed) writer, trading
+100k small files for a single sequential write.
+"""
+
+import gzip
+import io
+import json
+import os
+import threading
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Any, Literal, Protocol
+
+from parser.layout import INDEX_FILE_NAME, OutputLayout
+from parser.serializer import JsonStyle
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None  # type: ignore[assignment]
+
+# Type aliases
+OutputFormat = Literal["files", "grouped", "ndjson", "json-array"]
+Compression = Literal["auto", "none", "gzip", "zstd"]
+
+# Claims ledger kept in the output directory (hidden, and not matched by *.json)
+CLAIMS_FILE_NAME = ".argocd-parse.claims"
+
+# Write buffer for aggregated output files
+AGGREGATE_BUFFER_BYTES = 1024 * 1024
+
+
+class OutputSink(Protocol):
+    """Destination for rendered outputs, driven from the batch's calling thread.
+
+    Sinks are context managers: entering prepares the destination and exiting
+    finalizes it. Only the calling thread uses a sink, so implementations
+    need no locking.
+    """
+
+    written: int
+    unchanged: int
+    json_style: JsonStyle | None
+    """Style the sink requires (e.g. compact for NDJSON), or None for any."""
+
+    def __enter__(self) -> "OutputSink": ...
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None: ...
+
+    def claim(self, name: str, source: str) -> str | None:
+        """Claim an application name; return the current owner if already taken."""
+        ...
+
+    def write(self, name: str, data: bytes) -> Path:
+        """Store one rendered output and return where it went."""
+        ...
+
+
+class OutputConflictError(Exception):
+    """A sink refuses an output that would take the place of another one."""
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write bytes to a file atomically via a temporary file and rename.
+
+    The parent directory is only created if the first attempt finds it
+    missing, so callers writing many files into one directory pay no mkdir.
+
+    Args:
+        path: Destination file
+        data: Content to write
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    temp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        f = open(temp, "wb")
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        f = open(temp, "wb")
+    try:
+        with f:
+            f.write(data)
+        os.replace(temp, path)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write UTF-8 text to a file atomically via a temporary file and rename.
+
+    Args:
+        path: Destination file
+        text: Content to write
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    atomic_write_bytes(path, text.encode("utf-8"))
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """Atomically write a file unless it already holds exactly these bytes.
+
+    The existing file's size is checked first; contents are only read and
+    compared when the sizes match. Skipping identical writes keeps mtimes
+    stable for rsync and build tools and avoids needless SSD writes.
+
+    Args:
+        path: Destination file
+        data: Content to write
+
+    Returns:
+        True if the file was written, False if it was already up to date
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == len(data) and f.read() == data:
+                return False
+    except OSError:
+        # Missing or unreadable: fall through and (re)write it
+        pass
+    atomic_write_bytes(path, data)
+    return True
+
+
+def load_mapping(path: Path) -> dict[str, str]:
+    """Read a JSON object of strings, such as the claims ledger or a layout index.
+
+    Args:
+        path: JSON file
+
+    Returns:
+        Its entries as strings, or an empty mapping if the file is missing,
+        unreadable or not a JSON object
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {str(key): str(value) for key, value in data.items()}
+
+
+class NameClaims:
+    """Application-name claims of one run, checked against earlier runs' claims.
+
+    Every sink claims names through this class, so the rule is the same
+    everywhere: within a run the first manifest keeps a name, and a claim
+    left by an earlier run keeps it too, unless that manifest is part of
+    this run (which decides its names afresh) or no longer exists.
+    """
+
+    def __init__(
+        self,
+        sources: Iterable[str] = (),
+        prior_owner: Callable[[str], str | None] | None = None,
+    ) -> None:
+        """Start a run with no claims.
+
+        Args:
+            sources: Manifests this run processes
+            prior_owner: Looks up the manifest an earlier run recorded for a
+                name (e.g. in the claims ledger); None if there are no
+                earlier runs
+        """
+        self.sources = set(sources)
+        self.claims: dict[str, str] = {}
+        self._prior_owner = prior_owner
+
+    def claim(self, name: str, source: str) -> str | None:
+        """Claim an application name for a source manifest.
+
+        Args:
+            name: Application name
+            source: Manifest producing the output
+
+        Returns:
+            The manifest that already owns the name, or None if the claim
+            succeeded
+        """
+        owner = self.claims.get(name)
+        if owner is None and self._prior_owner is not None:
+            owner = self._prior_owner(name)
+            if owner is not None and (owner in self.sources or not os.path.exists(owner)):
+                owner = None
+        if owner is not None and owner != source:
+            return owner
+        self.claims[name] = source
+        return None
+
+
+class DirectoryClaims:
+    """Claims of one run on an output directory, over the ledger of earlier runs.
+
+    Names are claimed with the NameClaims rule. A template layout sanitizes
+    names into its paths, so two names with the same path component (e.g.
+    "a b" and "a_b") would share a file; the later one is refused as a
+    duplicate of the first, even when other fields place them apart, so a
+    file name always identifies one application.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        sources: Iterable[str] = (),
+        layout: OutputLayout | None = None,
+    ) -> None:
+        """Start a run with no claims; earlier runs' claims are read by load().
+
+        Args:
+            path: Output directory
+            sources: Manifests this run processes; their earlier claims are
+                released, since this run decides their names afresh
+            layout: Layout of the directory (default: flat)
+        """
+        self.path = path
+        self.layout = layout or OutputLayout()
+        self.sources = set(sources)
+        self.prior: dict[str, str] = {}
+        self._names = NameClaims(self.sources)
+        self._components: dict[str, str] = {}
+
+    def load(self) -> None:
+        """Read the claims ledger left by earlier runs (missing means none)."""
+        self.prior = {
+            name: source
+            for name, source in load_mapping(self.path / CLAIMS_FILE_NAME).items()
+            if source not in self.sources
+        }
+        self._names = NameClaims(self.sources, self.prior.get)
+        self._components = {self.layout.name_component(name): name for name in self.prior}
+
+    @property
+    def claims(self) -> dict[str, str]:
+        """Names claimed by this run, mapped to their manifests."""
+        return self._names.claims
+
+    def ledger(self) -> dict[str, str]:
+        """Earlier runs' claims updated with this run's, as persisted after the run."""
+        return {**self.prior, **self._names.claims}
+
+    def claim(self, name: str, source: str) -> str | None:
+        """Claim an application name for a source manifest.
+
+        Args:
+            name: Application name
+            source: Manifest producing the output
+
+        Returns:
+            The manifest that already owns the name, or another name with the
+            same path component, or None if the claim succeeded
+        """
+        component = self.layout.name_component(name)
+        other = self._components.get(component, name)
+        if other != name:
+            owner = self._names.claims.get(other)
+            if owner is None:
+                owner = self.prior.get(other)
+                if owner is not None and not os.path.exists(owner):
+                    # Its manifest is gone, so the file can be taken over
+                    del self.prior[other]
+                    owner = None
+            if owner is not None and owner != source:
+                return owner
+        owner = self._names.claim(name, source)
+        if owner is None:
+            self._components[component] = name
+        return owner
+
+
+def lock_directory(path: Path, on_wait: Callable[[], None] | None = None) -> int:
+    """Create a directory if needed and take an exclusive run lock on it.
+
+    The lock is an advisory ``flock`` on the directory itself, so no lock
+    file is left behind. It is released by closing the returned descriptor.
+
+    Args:
+        path: Directory to lock
+        on_wait: Called once if another run holds the lock and this one has
+            to wait for it
+
+    Returns:
+        Open descriptor holding the lock
+
+    Raises:
+        OSError: If the directory cannot be created or opened
+    """
+    path.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDONLY)
+    if fcntl is not None:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            if on_wait is not None:
+                on_wait()
+            fcntl.flock(fd, fcntl.LOCK_EX)
+    return fd
+
+
+def check_not_index(layout: OutputLayout, relative: str) -> None:
+    """Refuse an output path that a non-flat layout keeps its index at.
+
+    Args:
+        layout: Layout of the output directory
+        relative: Output path rendered by the layout
+
+    Raises:
+        OutputConflictError: If the path is the index file (compared
+            case-insensitively, for case-insensitive file systems)
+    """
+    if not layout.is_flat and relative.casefold() == INDEX_FILE_NAME:
+        raise OutputConflictError(f"{relative} is reserved for the layout index")
+
+
+class OutputDirectory:
+    """Locked output directory that hands out per-name claims to one run."""
+
+    def __init__(
+        self,
+        path: Path,
+        sources: Iterable[str] = (),
+        on_wait: Callable[[], None] | None = None,
+        layout: OutputLayout | None = None,
+    ) -> None:
+        """Prepare an output directory; it is opened by entering the context.
+
+        Args:
+            path: Output directory (created once if missing)
+            sources: Manifests this run will process; their claims from earlier
+                runs are released, since this run decides their names afresh
+            on_wait: Called once if another run holds the lock and this run
+                has to wait for it
+            layout: Where each output goes within the directory (default: flat)
+        """
+        self.path = path
+        self.on_wait = on_wait
+        self.layout = layout or OutputLayout()
+        self._claims = DirectoryClaims(path, sources, self.layout)
+        self._index: dict[str, str] = {}
+        self._prior_index: dict[str, str] = {}
+        self._lock_fd: int | None = None
+        self.written = 0
+        self.unchanged = 0
+        self.json_style: JsonStyle | None = None
+
+    def __enter__(self) -> "OutputDirectory":
+        """Create the directory, take the run lock and load earlier claims.
+
+        Raises:
+            OSError: If the directory cannot be created or opened
+        """
+        self._lock_fd = lock_directory(self.path, self.on_wait)
+        self._claims.load()
+        if not self.layout.is_flat:
+            self._prior_index = load_mapping(self.path / INDEX_FILE_NAME)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Persist claims (and the index of a non-flat layout) and release the run lock."""
+        try:
+            claims = self._claims.ledger()
+            atomic_write_text(
+                self.path / CLAIMS_FILE_NAME, json.dumps(claims, indent=0, sort_keys=True)
+            )
+            if not self.layout.is_flat:
+                locations = {**self._prior_index, **self._index}
+                index = {name: locations[name] for name in claims if name in locations}
+                write_if_changed(
+                    self.path / INDEX_FILE_NAME,
+                    (json.dumps(index, indent=0, sort_keys=True) + "\n").encode("utf-8"),
+                )
+        finally:
+            if self._lock_fd is not None:
+                # Closing the descriptor releases the flock
+                os.close(self._lock_fd)
+                self._lock_fd = None
+
+    def claim(self, name: str, source: str) -> str | None:
+        """Claim an application name for a source manifest.
+
+        A claim left by an earlier run yields to the new source if that
+        run's manifest no longer exists (it was renamed or removed). See
+        DirectoryClaims for names that a template layout sanitizes alike.
+
+        Args:
+            name: Application name (the output file stem)
+            source: Manifest producing the output
+
+        Returns:
+            The manifest that already owns the name, or None if the claim
+            succeeded
+        """
+        return self._claims.claim(name, source)
+
+    def write(self, name: str, data: bytes) -> Path:
+        """Atomically write an application's JSON output if it changed.
+
+        Counts the file in ``written`` or ``unchanged``. If the layout moved
+        the application since the last run (e.g. its cluster changed), the
+        file at the old location is removed.
+
+        Args:
+            name: Application name (the output file stem)
+            data: Rendered JSON
+
+        Returns:
+            Path of the written file
+
+        Raises:
+            OutputConflictError: If the layout renders the path of its index
+            OSError: If the file cannot be written
+        """
+        relative = self.layout.relative_path(name, data)
+        check_not_index(self.layout, relative)
+        output_file = self.path / relative
+        if write_if_changed(output_file, data):
+            self.written += 1
+        else:
+            self.unchanged += 1
+        if not self.layout.is_flat:
+            previous = self._prior_index.get(name)
+            if previous is not None and previous != relative and ".." not in previous.split("/"):
+                (self.path / previous).unlink(missing_ok=True)
+            self._index[name] = relative
+        return output_file
+
+
+class ValidationOutput:
+    """Sink for validate-only runs: reports duplicate names and writes nothing."""
+
+    def __init__(self) -> None:
+        """Prepare an empty set of claims."""
+        self.json_style: JsonStyle | None = None
+        self.written = 0
+        self.unchanged = 0
+        self._claims = NameClaims()
+
+    def __enter__(self) -> "ValidationOutput":
+        """Start the run; nothing is opened."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Finish the run; nothing is written."""
+
+    def claim(self, name: str, source: str) -> str | None:
+        """Claim an application name for this run.
+
+        Args:
+            name: Application name
+            source: Manifest producing the output
+
+        Returns:
+            The manifest that already owns the name, or None if the claim
+            succeeded
+        """
+        return self._claims.claim(name, source)
+
+    def write(self, name: str, data: bytes) -> Path:
+        """Reject writes: validate-only runs render no outputs.
+
+        Raises:
+            OSError: Always
+        """
+        raise OSError(f"Validate-only run cannot write {name}.json")
+
+
+def resolve_compression(path: Path, compression: Compression = "auto") -> Compression:
+    """Pick the compression for an aggregated output file.
+
+    Args:
+        path: Output file; with "auto", a .gz or .zst suffix selects compression
+        compression: Requested compression
+
+    Returns:
+        "none", "gzip" or "zstd"
+
+    Raises:
+        ValueError: If zstd is needed but the zstandard package is not installed
+    """
+    if compression == "auto":
+        suffix = path.suffix.lower()
+        if suffix == ".gz":
+            compression = "gzip"
+        elif suffix in (".zst", ".zstd"):
+            compression = "zstd"
+        else:
+            compression = "none"
+    if compression == "zstd":
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            raise ValueError(
+                "zstd compression needs the zstandard package: "
+                "pip install 'argocd-migrator[zstd]'"
+            ) from None
+    return compression
+
+
+class AggregateOutputFile:
+    """Stream every output into one NDJSON or JSON array file.
+
+    Records are appended as they arrive through a buffered, optionally
+    compressed writer, so memory stays constant however many applications
+    are written. The file is assembled under a temporary name and renamed
+    into place when the run finishes (including runs stopped early); it is
+    discarded if the run aborts with an exception. Names are not claimed:
+    nothing is overwritten, so every record is kept.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        output_format: Literal["ndjson", "json-array"] = "ndjson",
+        compression: Compression = "auto",
+    ) -> None:
+        """Prepare an aggregated output file; it is opened by entering the context.
+
+        Args:
+            path: Output file
+            output_format: "ndjson" (one compact record per line) or "json-array"
+            compression: "auto" (from the file suffix), "none", "gzip" or "zstd"
+
+        Raises:
+            ValueError: If the compression is unavailable
+        """
+        self.path = path
+        self.output_format = output_format
+        self.compression = resolve_compression(path, compression)
+        self.json_style: JsonStyle | None = "compact" if output_format == "ndjson" else None
+        self.written = 0
+        self.unchanged = 0
+        self._temp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        self._raw: IO[bytes] | None = None
+        self._stream: IO[bytes] | None = None
+
+    def __enter__(self) -> "AggregateOutputFile":
+        """Open the temporary file and the (compressing) buffered writer.
+
+        Raises:
+            OSError: If the file cannot be created
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Unbuffered: the BufferedWriter below is the only buffer
+        self._raw = open(self._temp, "wb", buffering=0)
+        compressed: Any
+        if self.compression == "gzip":
+            # mtime=0 keeps identical runs byte-identical
+            compressed = gzip.GzipFile(fileobj=self._raw, mode="wb", mtime=0)
+        elif self.compression == "zstd":
+            import zstandard
+
+            compressed = zstandard.ZstdCompressor().stream_writer(self._raw, closefd=False)
+        else:
+            compressed = self._raw
+        self._stream = io.BufferedWriter(compressed, buffer_size=AGGREGATE_BUFFER_BYTES)
+        if self.output_format == "json-array":
+            self._stream.write(b"[")
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Finish the file and move it into place, or discard it on error."""
+        assert self._stream is not None and self._raw is not None
+        try:
+            if exc_type is None and self.output_format == "json-array":
+                self._stream.write(b"\n]\n" if self.written else b"]\n")
+            # Closing the buffer closes the compressor, which writes its trailer
+            self._stream.close()
+            self._raw.close()
+            if exc_type is None:
+                os.replace(self._temp, self.path)
+        finally:
+            self._raw.close()
+            self._temp.unlink(missing_ok=True)
+
+    def claim(self, name: str, source: str) -> str | None:
+        """Accept every name; aggregated records never overwrite each other."""
+        return None
+
+    def write(self, name: str, data: bytes) -> Path:
+        """Append one rendered output record.
+
+        Args:
+            name: Application name
+            data: Rendered JSON (compact for NDJSON)
+
+        Returns:
+            Path of the aggregated file
+        """
+        assert self._stream is not None
+        if self.output_format == "ndjson":
+            self._stream.write(data + b"\n")
+        else:
+            separator = b"\n  " if self.written == 0 else b",\n  "
+            self._stream.write(separator + data.replace(b"\n", b"\n  "))
+        self.written += 1
+        return self.path
@@ -0,0 +1,263 @@
+"""Execution planning for batch runs.
+
+Chooses between serial, thread and process execution, and sizes the worker
+pool and task chunks, from the number of files, their total size and a small
+calibration profile cached on the local machine.
+"""
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+from parser.core import parse_argocd_manifest
+from parser.executor import (
+    CHUNKS_PER_WORKER,
+    ExecutionPlan,
+    ExecutorKind,
+    default_worker_count,
+    file_sizes,
+    gil_enabled,
+)
+from scanner.throttle import IOThrottle
+
+# Batches below either limit always run serially without calibrating
+MIN_PARALLEL_FILES = 32
+MIN_PARALLEL_BYTES = 256 * 1024
+
+# Parallelism must save at least this much estimated wall time to be chosen
+MIN_PARALLEL_SAVING_SECONDS = 0.5
+
+# Upper bound on files per process pool task
+MAX_CHUNK_SIZE = 256
+
+CALIBRATION_SAMPLE_FILES = 8
+
+PROFILE_ENV_VAR = "ARGOCD_MIGRATOR_PROFILE"
+
+
+class CalibrationProfile(BaseModel):
+    """Measured costs of the local machine, cached between runs."""
+
+    model_config = ConfigDict(frozen=True)
+
+    interpreter: str = Field(description="Interpreter the profile was measured with")
+    seconds_per_file: float = Field(description="Fixed parsing cost per file")
+    seconds_per_kib: float = Field(description="Parsing cost per KiB of YAML")
+    process_startup_seconds: float = Field(
+        description="Cost of starting a process pool worker and running one task"
+    )
+
+
+def interpreter_id() -> str:
+    """Identify the running interpreter build for profile caching."""
+    build = "gil" if gil_enabled() else "nogil"
+    return f"{sys.implementation.name}-{sys.version_info.major}.{sys.version_info.minor}-{build}"
+
+
+def default_profile_path() -> Path:
+    """Return the calibration profile location.
+
+    Honors ARGOCD_MIGRATOR_PROFILE, then XDG_CACHE_HOME, then ~/.cache.
+    """
+    override = os.environ.get(PROFILE_ENV_VAR)
+    if override:
+        return Path(override)
+    cache_home = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_home) / "argocd-migrator" / "executor-profile.json"
+
+
+def load_profile(profile_path: Path) -> CalibrationProfile | None:
+    """Load a cached calibration profile for the running interpreter.
+
+    Args:
+        profile_path: Path to the profile JSON file
+
+    Returns:
+        Profile, or None if missing, unreadable or measured on another interpreter
+    """
+    try:
+        with open(profile_path, encoding="utf-8") as f:
+            profile = CalibrationProfile.model_validate(json.load(f))
+    except (OSError, json.JSONDecodeError, ValidationError):
+        return None
+    if profile.interpreter != interpreter_id():
+        return None
+    return profile
+
+
+def save_profile(profile: CalibrationProfile, profile_path: Path) -> None:
+    """Save a calibration profile, ignoring unwritable cache locations.
+
+    Args:
+        profile: Profile to save
+        profile_path: Destination path
+    """
+    try:
+        profile_path.parent.mkdir(parents=True, exist_ok=True)
+        profile_path.write_text(profile.model_dump_json(indent=2), encoding="utf-8")
+    except OSError:
+        pass
+
+
+def _noop() -> None:
+    """Empty task used to time process pool startup."""
+
+
+def calibrate(sample_files: list[Path], throttle: IOThrottle | None = None) -> CalibrationProfile:
+    """Measure parsing and process startup costs on this machine.
+
+    Parses the sample files in memory (nothing is written) and times a
+    one-worker process pool running an empty task.
+
+    Args:
+        sample_files: Representative files to parse
+        throttle: I/O throttle of the run, charged for the sample reads; time
+            spent waiting for it is not counted as parsing cost
+
+    Returns:
+        Measured calibration profile
+    """
+    total_seconds = 0.0
+    total_kib = 0.0
+    waited = throttle.stats().throttled_seconds if throttle is not None else 0.0
+    for path in sample_files:
+        try:
+            total_kib += path.stat().st_size / 1024
+        except OSError:
+            continue
+        start = time.perf_counter()
+        try:
+            parse_argocd_manifest(path, throttle=throttle)
+        except Exception:
+            # Invalid manifests cost time too; only the timing matters here
+            pass
+        total_seconds += time.perf_counter() - start
+    if throttle is not None:
+        # The profile is cached for unthrottled runs too. A shared bucket also
+        # counts other commands' waits, hence the clamp
+        waited = throttle.stats().throttled_seconds - waited
+        total_seconds = max(0.0, total_seconds - waited)
+
+    count = max(1, len(sample_files))
+    # Attribute half of the measured cost to fixed per-file overhead
+    seconds_per_file = total_seconds / count / 2
+    seconds_per_kib = (total_seconds / 2) / total_kib if total_kib > 0 else 0.0
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        pool.submit(_noop).result()
+    process_startup_seconds = time.perf_counter() - start
+
+    return CalibrationProfile(
+        interpreter=interpreter_id(),
+        seconds_per_file=seconds_per_file,
+        seconds_per_kib=seconds_per_kib,
+        process_startup_seconds=process_startup_seconds,
+    )
+
+
+def plan_execution(
+    files: list[Path],
+    executor: ExecutorKind = "auto",
+    max_workers: int | None = None,
+    profile_path: Path | None = None,
+    throttle: IOThrottle | None = None,
+) -> ExecutionPlan:
+    """Build an execution plan for a batch of files.
+
+    Explicit executors are honored as-is. With "auto", small batches run
+    serially; larger ones are calibrated (once per machine and interpreter)
+    and run in parallel only when the estimated saving outweighs pool startup.
+    Threads are preferred over processes on free-threaded interpreters.
+
+    Args:
+        files: Files to process
+        executor: Requested strategy, or "auto" to choose one
+        max_workers: Upper bound on workers (defaults to one per CPU)
+        profile_path: Calibration profile location (defaults to default_profile_path())
+        throttle: I/O throttle of the run, applied to calibration reads
+
+    Returns:
+        Resolved execution plan
+    """
+    workers = max(1, min(max_workers or default_worker_count(), len(files) or 1))
+
+    if executor == "serial":
+        return ExecutionPlan(executor="serial", workers=1, chunk_size=1, reason="requested")
+    if executor == "threads":
+        return ExecutionPlan(executor="threads", workers=workers, chunk_size=1, reason="requested")
+    if executor == "processes":
+        return ExecutionPlan(
+            executor="processes",
+            workers=workers,
+            chunk_size=_process_chunk_size(len(files), workers),
+            reason="requested",
+        )
+
+    if len(files) < MIN_PARALLEL_FILES:
+        return ExecutionPlan(
+            executor="serial", workers=1, chunk_size=1, reason=f"only {len(files)} files"
+        )
+
+    total_bytes = sum(file_sizes(files))
+    if total_bytes < MIN_PARALLEL_BYTES:
+        return ExecutionPlan(
+            executor="serial",
+            workers=1,
+            chunk_size=1,
+            reason=f"only {total_bytes / 1024:.0f} KiB of input",
+        )
+
+    if workers == 1:
+        return ExecutionPlan(executor="serial", workers=1, chunk_size=1, reason="single CPU")
+
+    profile_path = profile_path or default_profile_path()
+    profile = load_profile(profile_path)
+    if profile is None:
+        step = max(1, len(files) // CALIBRATION_SAMPLE_FILES)
+        profile = calibrate(files[::step][:CALIBRATION_SAMPLE_FILES], throttle)
+        save_profile(profile, profile_path)
+
+    serial_seconds = (
+        len(files) * profile.seconds_per_file + total_bytes / 1024 * profile.seconds_per_kib
+    )
+    estimate = f"~{serial_seconds:.1f}s serial"
+
+    if not gil_enabled():
+        # Threads share the interpreter: no pickling and no process startup
+        threads_seconds = serial_seconds / workers
+        if serial_seconds - threads_seconds < MIN_PARALLEL_SAVING_SECONDS:
+            return ExecutionPlan(
+                executor="serial", workers=1, chunk_size=1, reason=f"{estimate}, too short"
+            )
+        return ExecutionPlan(
+            executor="threads",
+            workers=workers,
+            chunk_size=1,
+            reason=f"{estimate}, free-threaded interpreter",
+        )
+
+    process_seconds = serial_seconds / workers + profile.process_startup_seconds * workers
+    if serial_seconds - process_seconds < MIN_PARALLEL_SAVING_SECONDS:
+        return ExecutionPlan(
+            executor="serial",
+            workers=1,
+            chunk_size=1,
+            reason=f"{estimate}, process startup outweighs the saving",
+        )
+    return ExecutionPlan(
+        executor="processes",
+        workers=workers,
+        chunk_size=_process_chunk_size(len(files), workers),
+        reason=f"{estimate}, ~{process_seconds:.1f}s with {workers} processes",
+    )
+
+
+def _process_chunk_size(file_count: int, workers: int) -> int:
+    """Cap process pool tasks to amortize IPC while keeping workers balanced."""
+    return max(1, min(MAX_CHUNK_SIZE, file_count // (workers * CHUNKS_PER_WORKER)))
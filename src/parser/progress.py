@@ -0,0 +1,164 @@
+"""Progress reporting for batch runs that stays cheap at any batch size.
+
+On a terminal, a Rich progress bar is redrawn at a fixed rate instead of
+after every file. Elsewhere (CI logs, redirected output) there is no bar;
+a plain-text line with the rate and ETA is printed periodically instead.
+In both cases only failures get a line of their own, unless verbose.
+"""
+
+import time
+from collections.abc import Callable
+from pathlib import Path
+from types import TracebackType
+
+from rich.console import Console
+from rich.markup import escape
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    SpinnerColumn,
+    TextColumn,
+    TimeElapsedColumn,
+    TimeRemainingColumn,
+)
+
+from parser.models import ParseResult
+
+# Progress bar redraws per second on a terminal
+PROGRESS_REFRESH_PER_SECOND = 4.0
+
+# Seconds between plain-text progress lines when output is not a terminal
+PLAIN_PROGRESS_INTERVAL_SECONDS = 10.0
+
+
+def format_duration(seconds: float) -> str:
+    """Format a duration as e.g. "42s", "3m 05s" or "1h 02m".
+
+    Args:
+        seconds: Duration in seconds
+
+    Returns:
+        Short human-readable duration
+    """
+    seconds = max(0, round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m {seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
+
+
+class BatchProgress:
+    """Report the progress of a batch run, throttled to a fixed rate."""
+
+    def __init__(
+        self,
+        total: int,
+        console: Console,
+        verbose: bool = False,
+        refresh_per_second: float = PROGRESS_REFRESH_PER_SECOND,
+        plain_interval: float = PLAIN_PROGRESS_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Prepare progress reporting; nothing is shown until entered.
+
+        Args:
+            total: Number of files in the run
+            console: Console to report to; a progress bar is only drawn if it
+                is a terminal
+            verbose: Print a line for every file, not only failures
+            refresh_per_second: Progress bar redraws per second
+            plain_interval: Seconds between plain-text progress lines
+            clock: Monotonic clock (replaceable for tests)
+        """
+        self.total = total
+        self.console = console
+        self.verbose = verbose
+        self.plain_interval = plain_interval
+        self.completed = 0
+        self._clock = clock
+        self._started = clock()
+        self._last_line = self._started
+        self._progress: Progress | None = None
+        if console.is_terminal:
+            self._progress = Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                MofNCompleteColumn(),
+                TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+                TimeElapsedColumn(),
+                TimeRemainingColumn(),
+                console=console,
+                refresh_per_second=refresh_per_second,
+            )
+            self._task = self._progress.add_task("Processing files...", total=total)
+
+    def __enter__(self) -> "BatchProgress":
+        """Start reporting."""
+        self._started = self._last_line = self._clock()
+        if self._progress is not None:
+            self._progress.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop reporting; without a bar, print a final progress line."""
+        if self._progress is not None:
+            self._progress.stop()
+        elif self.completed:
+            self.console.print(self.status_line(), markup=False, highlight=False)
+
+    def advance(self, file_path: Path, result: ParseResult) -> None:
+        """Record one completed file.
+
+        Args:
+            file_path: File that completed
+            result: Its result
+        """
+        self.completed += 1
+        if result.status == "failed":
+            error_msg = result.errors[0].message if result.errors else "Unknown error"
+            self._print(f"[red]✗[/red] {escape(file_path.name)}: {escape(error_msg)}")
+        elif self.verbose and result.status == "success":
+            self._print(
+                f"[green]✓[/green] {escape(file_path.name)}: "
+                f"{escape(result.application_name or '')}"
+            )
+        elif self.verbose:
+            self._print(f"[yellow]⊘[/yellow] {escape(file_path.name)}: Skipped")
+
+        if self._progress is not None:
+            # Redrawn by the progress bar's own refresh thread
+            self._progress.advance(self._task)
+            return
+        now = self._clock()
+        if now - self._last_line >= self.plain_interval:
+            self._last_line = now
+            self.console.print(self.status_line(), markup=False, highlight=False)
+
+    def _print(self, line: str) -> None:
+        if self._progress is not None:
+            self._progress.console.print(line)
+        else:
+            self.console.print(line)
+
+    def status_line(self) -> str:
+        """Plain-text progress: files done, rate and estimated time remaining."""
+        elapsed = self._clock() - self._started
+        rate = self.completed / elapsed if elapsed > 0 else 0.0
+        line = (
+            f"Processed {self.completed}/{self.total} files "
+            f"in {format_duration(elapsed)} ({rate:.1f} files/s"
+        )
+        remaining = self.total - self.completed
+        if remaining and rate > 0:
+            line += f", ETA {format_duration(remaining / rate)}"
+        return line + ")"
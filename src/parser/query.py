@@ -0,0 +1,257 @@
+"""Indexed queries over an existing output directory.
+
+``argocd-parse query`` answers questions such as "which apps target cluster
+X and belong to team Y" from an inverted index of field values to output
+files, persisted in the output directory. The first query builds the index;
+later queries only re-read outputs whose mtime or size changed (and drop
+removed ones), so repeated queries cost one directory walk plus lookups.
+
+Queries are predicates joined with ``and``::
+
+    destination.clusterName=prod-east and team=payments   # equality
+    source.repoURL=https://github.com/org/*               # prefix
+    label:tier                                            # field exists
+
+Fields accept the same aliases as ``--group-by`` (see parser.fields).
+"""
+
+import json
+import os
+import shlex
+from pathlib import Path
+from typing import Any, Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from parser.fields import parse_field
+from parser.output import atomic_write_text
+
+# Inverted index kept in the output directory (hidden, and not matched by *.json)
+QUERY_INDEX_FILE_NAME = ".argocd-parse.query-index"
+
+# Bump when the persisted index format changes
+QUERY_INDEX_VERSION = 1
+
+
+class Predicate(BaseModel):
+    """One condition of a query."""
+
+    model_config = ConfigDict(frozen=True)
+
+    field: str = Field(description="Dotted field path in the output JSON")
+    op: Literal["eq", "prefix", "exists"] = Field(description="Comparison operator")
+    value: str | None = Field(default=None, description="Value or prefix to compare with")
+
+
+def parse_query(expression: str) -> list[Predicate]:
+    """Parse a query expression into predicates.
+
+    Args:
+        expression: Predicates joined with "and": FIELD=VALUE (equality),
+            FIELD=PREFIX* (prefix) or FIELD (existence); values may be quoted
+
+    Returns:
+        Predicates, all of which must match
+
+    Raises:
+        ValueError: If the expression is empty or malformed
+    """
+    try:
+        tokens = shlex.split(expression)
+    except ValueError as e:
+        raise ValueError(f"Invalid query '{expression}': {e}") from None
+    if not tokens:
+        raise ValueError("Empty query")
+
+    predicates = []
+    for position, token in enumerate(tokens):
+        if position % 2 == 1:
+            if token.lower() != "and":
+                raise ValueError(f"Invalid query '{expression}'. Expected 'and' before '{token}'")
+            continue
+        field, separator, value = token.partition("=")
+        path = ".".join(parse_field(field))
+        if not separator:
+            predicates.append(Predicate(field=path, op="exists"))
+        elif value.endswith("*"):
+            predicates.append(Predicate(field=path, op="prefix", value=value[:-1]))
+        else:
+            predicates.append(Predicate(field=path, op="eq", value=value))
+    if len(tokens) % 2 == 0:
+        raise ValueError(f"Invalid query '{expression}'. Expected a predicate after 'and'")
+    return predicates
+
+
+def flatten_fields(record: dict[str, Any], prefix: str = "") -> dict[str, str]:
+    """Flatten an output record into dotted field paths and string values.
+
+    Args:
+        record: Output JSON object
+        prefix: Path of record within the enclosing object
+
+    Returns:
+        Mapping of dotted path to value; nulls and empty strings are omitted
+        and booleans become "true"/"false"
+    """
+    fields: dict[str, str] = {}
+    for key, value in record.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            fields.update(flatten_fields(value, f"{path}."))
+        elif isinstance(value, bool):
+            fields[path] = "true" if value else "false"
+        elif value is not None and value != "" and not isinstance(value, list):
+            fields[path] = str(value)
+    return fields
+
+
+def _scan_outputs(output_dir: Path) -> dict[str, tuple[int, int]]:
+    """Return (mtime_ns, size) of every visible *.json file, by relative path."""
+    found: dict[str, tuple[int, int]] = {}
+    pending = [output_dir]
+    while pending:
+        directory = pending.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(Path(entry.path))
+                elif entry.name.endswith(".json") and entry.is_file():
+                    stat = entry.stat()
+                    relative = os.path.relpath(entry.path, output_dir).replace(os.sep, "/")
+                    found[relative] = (stat.st_mtime_ns, stat.st_size)
+    return found
+
+
+def _load_output_fields(path: Path) -> dict[str, str]:
+    """Read one output's fields; files that are not application outputs have none."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            record = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(record, dict) or not isinstance(record.get("metadata"), dict):
+        # E.g. a layout's index.json or a grouped config.json array
+        return {}
+    return flatten_fields(record)
+
+
+class QueryIndex:
+    """Inverted index of output field values, persisted in the output directory."""
+
+    def __init__(self, output_dir: Path) -> None:
+        """Create an empty index; use open() to load and refresh a persisted one.
+
+        Args:
+            output_dir: Output directory the index describes
+        """
+        self.output_dir = output_dir
+        self.files: dict[str, tuple[int, int]] = {}
+        self.postings: dict[str, dict[str, list[str]]] = {}
+        self.reindexed = 0
+        self.removed = 0
+
+    @classmethod
+    def open(cls, output_dir: Path, rebuild: bool = False) -> "QueryIndex":
+        """Load the persisted index, bring it up to date and save it if it changed.
+
+        Args:
+            output_dir: Output directory to index
+            rebuild: Ignore any persisted index and index every output again
+
+        Returns:
+            Up-to-date index
+
+        Raises:
+            OSError: If the directory cannot be read
+        """
+        index = cls(output_dir)
+        if not rebuild:
+            index._load()
+        index.refresh()
+        return index
+
+    @property
+    def index_file(self) -> Path:
+        """Location of the persisted index."""
+        return self.output_dir / QUERY_INDEX_FILE_NAME
+
+    def _load(self) -> None:
+        try:
+            with open(self.index_file, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != QUERY_INDEX_VERSION:
+            return
+        self.files = {path: (stamp[0], stamp[1]) for path, stamp in data["files"].items()}
+        self.postings = data["postings"]
+
+    def refresh(self) -> None:
+        """Re-index outputs whose mtime or size changed and drop removed ones.
+
+        Raises:
+            OSError: If the directory cannot be read
+        """
+        current = _scan_outputs(self.output_dir)
+        stale = {path for path, stamp in self.files.items() if current.get(path) != stamp}
+        added = [path for path, stamp in current.items() if self.files.get(path) != stamp]
+        if not stale and not added:
+            return
+
+        if stale:
+            for values in self.postings.values():
+                for value, paths in list(values.items()):
+                    kept = [path for path in paths if path not in stale]
+                    if kept:
+                        values[value] = kept
+                    else:
+                        del values[value]
+            self.postings = {field: values for field, values in self.postings.items() if values}
+        for path in sorted(added):
+            for field, value in _load_output_fields(self.output_dir / path).items():
+                self.postings.setdefault(field, {}).setdefault(value, []).append(path)
+        self.reindexed = len(added)
+        self.removed = len(stale - set(added))
+        self.files = current
+        self._save()
+
+    def _save(self) -> None:
+        data = {
+            "version": QUERY_INDEX_VERSION,
+            "files": {path: list(stamp) for path, stamp in sorted(self.files.items())},
+            "postings": self.postings,
+        }
+        atomic_write_text(self.index_file, json.dumps(data, separators=(",", ":")))
+
+    def _paths_for(self, predicate: Predicate) -> set[str]:
+        values = self.postings.get(predicate.field, {})
+        if predicate.op == "eq":
+            return set(values.get(predicate.value or "", ()))
+        if predicate.op == "prefix":
+            prefix = predicate.value or ""
+            return {
+                path
+                for value, paths in values.items()
+                if value.startswith(prefix)
+                for path in paths
+            }
+        return {path for paths in values.values() for path in paths}
+
+    def match(self, predicates: list[Predicate]) -> list[str]:
+        """Find the outputs matching every predicate.
+
+        Args:
+            predicates: Predicates from parse_query()
+
+        Returns:
+            Sorted paths, relative to the output directory, of matching outputs
+        """
+        matches: set[str] | None = None
+        for predicate in predicates:
+            paths = self._paths_for(predicate)
+            matches = paths if matches is None else matches & paths
+            if not matches:
+                return []
+        return sorted(matches or ())
@@ -0,0 +1,214 @@
+"""Bounded-memory storage for the per-file results of a batch run.
+
+A frozen ParseResult (plus its ValidationError models) costs well over a
+kilobyte per file, so a million-file summary holds gigabytes of model
+overhead. ResultStore keeps each result as a CompactResult, a ``__slots__``
+record of plain strings and tuples, and keeps only the first failures in
+memory: the rest are appended to an anonymous temporary file and read back
+on demand. ParseResult models are only materialized while iterating, one at
+a time, for reporting.
+
+Measure the difference with ``benchmarks/bench_result_memory.py``.
+"""
+
+import json
+import os
+import sys
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+from types import TracebackType
+from typing import IO
+
+from parser.models import ParseResult, ValidationError
+
+# Failed results kept in memory before further failures are spilled to disk
+DEFAULT_FAILURES_IN_MEMORY = 1000
+
+# (error_type, field, message)
+CompactError = tuple[str, str | None, str]
+
+
+class CompactResult:
+    """Lightweight record of one parse result."""
+
+    __slots__ = ("file_path", "status", "output_path", "application_name", "errors")
+
+    def __init__(
+        self,
+        file_path: str,
+        status: str,
+        output_path: str | None = None,
+        application_name: str | None = None,
+        errors: tuple[CompactError, ...] = (),
+    ) -> None:
+        """Create a record.
+
+        Args:
+            file_path: Path to the source YAML file
+            status: Parse status: success, failed, or skipped
+            output_path: Output location if successful
+            application_name: ArgoCD Application name
+            errors: (error_type, field, message) of each validation error
+        """
+        self.file_path = file_path
+        self.status = status
+        self.output_path = output_path
+        self.application_name = application_name
+        self.errors = errors
+
+    @classmethod
+    def from_result(cls, result: ParseResult) -> "CompactResult":
+        """Compact a parse result.
+
+        Status and error type strings are interned: results returned by
+        process workers are unpickled, so each would otherwise carry its own
+        copy.
+
+        Args:
+            result: Parse result to compact
+
+        Returns:
+            Equivalent record
+        """
+        return cls(
+            result.file_path,
+            sys.intern(result.status),
+            result.output_path,
+            result.application_name,
+            tuple(
+                (sys.intern(error.error_type), error.field, error.message)
+                for error in result.errors
+            ),
+        )
+
+    def to_result(self) -> ParseResult:
+        """Materialize the equivalent parse result."""
+        return ParseResult(
+            file_path=self.file_path,
+            status=self.status,
+            output_path=self.output_path,
+            application_name=self.application_name,
+            errors=[
+                ValidationError(error_type=error_type, field=field, message=message)
+                for error_type, field, message in self.errors
+            ],
+        )
+
+
+class ResultStore:
+    """Per-file results of a batch run, kept in input order with bounded memory."""
+
+    def __init__(
+        self,
+        failures_in_memory: int = DEFAULT_FAILURES_IN_MEMORY,
+        spill_dir: Path | None = None,
+    ) -> None:
+        """Create an empty store.
+
+        Args:
+            failures_in_memory: Failed results kept in memory; later failures
+                are spilled to a temporary file
+            spill_dir: Directory for the spill file (default: the system
+                temporary directory)
+        """
+        self.failures_in_memory = failures_in_memory
+        self.spill_dir = spill_dir
+        self.spilled = 0
+        # A CompactResult, the spill file offset of a failure, or None if unset
+        self._records: list[CompactResult | int | None] = []
+        self._failures_kept = 0
+        self._spill: IO[bytes] | None = None
+
+    def __enter__(self) -> "ResultStore":
+        """Use the store; the spill file is removed on exit."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the store."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Number of results stored."""
+        return sum(1 for record in self._records if record is not None)
+
+    def add(self, index: int, result: ParseResult) -> None:
+        """Store the result of the file at an input position.
+
+        Args:
+            index: Position of the file in the batch input
+            result: Its parse result
+
+        Raises:
+            OSError: If a failure cannot be spilled to disk
+        """
+        if index >= len(self._records):
+            self._records.extend([None] * (index + 1 - len(self._records)))
+        record = CompactResult.from_result(result)
+        if record.status == "failed":
+            if self._failures_kept >= self.failures_in_memory:
+                self._records[index] = self._spill_record(record)
+                return
+            self._failures_kept += 1
+        self._records[index] = record
+
+    def _spill_record(self, record: CompactResult) -> int:
+        if self._spill is None:
+            self._spill = tempfile.TemporaryFile(prefix="argocd-parse-results-", dir=self.spill_dir)
+        self._spill.seek(0, os.SEEK_END)
+        offset = self._spill.tell()
+        line = json.dumps(
+            [
+                record.file_path,
+                record.status,
+                record.output_path,
+                record.application_name,
+                record.errors,
+            ],
+            ensure_ascii=False,
+        )
+        self._spill.write(line.encode() + b"\n")
+        self.spilled += 1
+        return offset
+
+    def _load_record(self, offset: int) -> CompactResult:
+        assert self._spill is not None
+        self._spill.seek(offset)
+        file_path, status, output_path, application_name, errors = json.loads(
+            self._spill.readline()
+        )
+        return CompactResult(
+            file_path,
+            status,
+            output_path,
+            application_name,
+            tuple((error_type, field, message) for error_type, field, message in errors),
+        )
+
+    def _records_in_order(self, failed_only: bool) -> Iterator[CompactResult]:
+        for record in self._records:
+            if isinstance(record, int):
+                yield self._load_record(record)
+            elif record is not None and (not failed_only or record.status == "failed"):
+                yield record
+
+    def __iter__(self) -> Iterator[ParseResult]:
+        """Materialize every result, one at a time, in input order."""
+        for record in self._records_in_order(failed_only=False):
+            yield record.to_result()
+
+    def failures(self) -> Iterator[ParseResult]:
+        """Materialize the failed results, one at a time, in input order."""
+        for record in self._records_in_order(failed_only=True):
+            yield record.to_result()
+
+    def close(self) -> None:
+        """Remove the spill file; spilled failures can no longer be read."""
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
@@ -0,0 +1,88 @@
+"""JSON serialization backends for migration output.
+
+Outputs are serialized straight to bytes in one pass, either by Pydantic's
+Rust serializer or by the optional ``orjson`` package, instead of building an
+intermediate dict for the standard library encoder. Pretty output from every
+backend is byte-identical to ``json.dumps(..., indent=2, ensure_ascii=False)``
+for the migration output schema, which contains only strings, booleans and
+nulls.
+"""
+
+import json
+from typing import Literal
+
+from pydantic import BaseModel
+
+# Type aliases
+JsonStyle = Literal["pretty", "compact"]
+SerializerBackend = Literal["auto", "pydantic", "orjson", "json"]
+ResolvedBackend = Literal["pydantic", "orjson", "json"]
+
+PRETTY_INDENT = 2
+
+
+def orjson_available() -> bool:
+    """Check whether the optional orjson package is installed."""
+    try:
+        import orjson  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_backend(backend: SerializerBackend = "auto") -> ResolvedBackend:
+    """Pick a concrete serializer backend.
+
+    Args:
+        backend: "auto" (orjson if installed, otherwise pydantic), or a
+            specific backend
+
+    Returns:
+        Concrete backend name
+
+    Raises:
+        ValueError: If orjson is requested but not installed
+    """
+    if backend == "auto":
+        return "orjson" if orjson_available() else "pydantic"
+    if backend == "orjson" and not orjson_available():
+        raise ValueError(
+            "The orjson serializer needs the orjson package: pip install 'argocd-migrator[fast]'"
+        )
+    return backend
+
+
+def serialize_model(
+    model: BaseModel,
+    style: JsonStyle = "pretty",
+    backend: ResolvedBackend = "pydantic",
+) -> bytes:
+    """Serialize a model to UTF-8 JSON.
+
+    Args:
+        model: Model to serialize
+        style: "pretty" (2-space indent) or "compact" (no whitespace)
+        backend: Concrete backend from resolve_backend()
+
+    Returns:
+        Encoded JSON document (no trailing newline)
+    """
+    indent = PRETTY_INDENT if style == "pretty" else None
+
+    if backend == "pydantic":
+        # The Rust serializer writes bytes directly; model_dump_json() would
+        # only decode them to str for us to encode again
+        return type(model).__pydantic_serializer__.to_json(model, indent=indent)
+
+    data = model.model_dump(mode="json")
+    if backend == "orjson":
+        import orjson
+
+        option = orjson.OPT_INDENT_2 if indent is not None else 0
+        encoded: bytes = orjson.dumps(data, option=option)
+        return encoded
+
+    separators = (",", ": ") if indent is not None else (",", ":")
+    return json.dumps(data, indent=indent, ensure_ascii=False, separators=separators).encode(
+        "utf-8"
+    )
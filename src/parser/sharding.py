@@ -0,0 +1,83 @@
+"""Deterministic sharding of batch runs across machines.
+
+Each file is assigned to a shard by a stable hash of its path relative to the
+scanned directory, so a file's shard never depends on which other files exist.
+Adding or removing unrelated manifests leaves every other assignment intact,
+unlike splitting a sorted file list by position.
+"""
+
+import hashlib
+from pathlib import Path
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ShardSpec(BaseModel):
+    """One slice of a sharded batch run (1-based index)."""
+
+    model_config = ConfigDict(frozen=True)
+
+    index: int = Field(ge=1, description="Shard number, from 1 to count")
+    count: int = Field(ge=1, description="Total number of shards")
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
+def parse_shard_spec(spec: str) -> ShardSpec:
+    """Parse an ``INDEX/COUNT`` shard specification.
+
+    Args:
+        spec: Shard specification such as "2/8" (index is 1-based)
+
+    Returns:
+        Parsed shard specification
+
+    Raises:
+        ValueError: If spec is malformed or index is outside 1..count
+    """
+    index_text, separator, count_text = spec.partition("/")
+    if not separator:
+        raise ValueError(f"Invalid shard '{spec}'. Expected INDEX/COUNT, e.g. 1/4")
+    try:
+        index = int(index_text)
+        count = int(count_text)
+    except ValueError:
+        raise ValueError(f"Invalid shard '{spec}'. INDEX and COUNT must be integers") from None
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{spec}'. Expected 1 <= INDEX <= COUNT")
+    return ShardSpec(index=index, count=count)
+
+
+def shard_for_path(relative_path: str, count: int) -> int:
+    """Return the 1-based shard a relative path belongs to.
+
+    Args:
+        relative_path: POSIX-style path relative to the scanned directory
+        count: Total number of shards
+
+    Returns:
+        Shard number from 1 to count
+    """
+    digest = hashlib.blake2b(relative_path.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count + 1
+
+
+def select_shard(files: list[Path], base_dir: Path, shard: ShardSpec) -> list[Path]:
+    """Keep only the files assigned to a shard.
+
+    Args:
+        files: Discovered files (absolute paths under base_dir)
+        base_dir: Directory the files were discovered in
+        shard: Shard to keep
+
+    Returns:
+        Files belonging to the shard, in their original order
+    """
+    if shard.count == 1:
+        return list(files)
+    return [
+        path
+        for path in files
+        if shard_for_path(path.relative_to(base_dir).as_posix(), shard.count) == shard.index
+    ]
@@ -0,0 +1,167 @@
+"""Group failures by error signature.
+
+When a shared template breaks thousands of manifests, listing every failed
+file buries the one underlying problem. A signature is an error's type, its
+field path and its message with the variable parts (quoted values, paths,
+URLs, file names, numbers) replaced by placeholders, so the same mistake in
+different files maps to one signature. Signatures are counted as results
+arrive, keeping a few sample files for each.
+"""
+
+import bisect
+import re
+from collections.abc import Iterable
+
+from parser.models import ErrorSignature, ParseResult, ValidationError
+
+# Sample files kept per signature
+DEFAULT_SAMPLE_FILES = 3
+
+_URL = re.compile(r"\b[a-z][a-z0-9+.-]*://[^\s,;'\"()<>]+")
+_QUOTED = re.compile(r"'[^'\n]*'|\"[^\"\n]*\"")
+_PATH = re.compile(r"(?<![\w.<])/[^\s,;:'\"()<>]+")
+_FILE = re.compile(r"\b[\w.-]+\.(?:json|ya?ml)\b")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+
+# (error_type, field template, message template)
+SignatureKey = tuple[str, str | None, str]
+
+
+def message_template(message: str) -> str:
+    """Replace the variable parts of an error message with placeholders.
+
+    Args:
+        message: Error message
+
+    Returns:
+        Message with URLs as <url>, quoted values as <value>, absolute
+        paths as <path>, YAML/JSON file names as <file> and numbers as <n>,
+        on one line
+    """
+    template = _URL.sub("<url>", message)
+    template = _QUOTED.sub("<value>", template)
+    template = _PATH.sub("<path>", template)
+    template = _FILE.sub("<file>", template)
+    template = _NUMBER.sub("<n>", template)
+    return " ".join(template.split())
+
+
+def field_template(field: str | None) -> str | None:
+    """Replace list indexes in a dotted field path with <n>.
+
+    Args:
+        field: Field path, or None
+
+    Returns:
+        Field path template, or None
+    """
+    if field is None:
+        return None
+    return ".".join("<n>" if part.isdigit() else part for part in field.split("."))
+
+
+def signature_key(error: ValidationError) -> SignatureKey:
+    """Compute the signature of one error.
+
+    Args:
+        error: Validation error
+
+    Returns:
+        (error_type, field template, message template)
+    """
+    return error.error_type, field_template(error.field), message_template(error.message)
+
+
+def _frequency_order(item: tuple[SignatureKey, int]) -> tuple[int, str, str, str]:
+    (error_type, field, message), count = item
+    return -count, error_type, field or "", message
+
+
+class ErrorSignatureCounter:
+    """Count failed files by error signature, incrementally."""
+
+    def __init__(self, sample_files: int = DEFAULT_SAMPLE_FILES) -> None:
+        """Create an empty counter.
+
+        Args:
+            sample_files: Sample files kept per signature
+        """
+        self.sample_files = sample_files
+        self._counts: dict[SignatureKey, int] = {}
+        self._samples: dict[SignatureKey, list[str]] = {}
+
+    def add(self, result: ParseResult) -> None:
+        """Count a result's errors; results that did not fail are ignored.
+
+        A file is counted once per signature, however many of its errors
+        share it.
+
+        Args:
+            result: Parse result
+        """
+        if result.status != "failed":
+            return
+        for key in dict.fromkeys(signature_key(error) for error in result.errors):
+            self._count(key, 1, (result.file_path,))
+
+    def update(self, signatures: Iterable[ErrorSignature]) -> None:
+        """Add signatures counted elsewhere (e.g. by an earlier run).
+
+        Args:
+            signatures: Signatures to add
+        """
+        for signature in signatures:
+            key = (signature.error_type, signature.field, signature.message)
+            self._count(key, signature.count, signature.sample_files)
+
+    def _count(self, key: SignatureKey, count: int, files: Iterable[str]) -> None:
+        self._counts[key] = self._counts.get(key, 0) + count
+        # Keep the first files by path, so samples do not depend on completion order
+        samples = self._samples.setdefault(key, [])
+        for file_path in files:
+            if file_path not in samples:
+                bisect.insort(samples, file_path)
+        del samples[self.sample_files :]
+
+    def signatures(self) -> list[ErrorSignature]:
+        """Signatures counted so far, most frequent first."""
+        return [
+            ErrorSignature(
+                error_type=key[0],
+                field=key[1],
+                message=key[2],
+                count=count,
+                sample_files=list(self._samples[key]),
+            )
+            for key, count in sorted(self._counts.items(), key=_frequency_order)
+        ]
+
+
+def count_signatures(results: Iterable[ParseResult]) -> list[ErrorSignature]:
+    """Group the failures among results by signature.
+
+    Args:
+        results: Parse results
+
+    Returns:
+        Signatures, most frequent first
+    """
+    counter = ErrorSignatureCounter()
+    for result in results:
+        counter.add(result)
+    return counter.signatures()
+
+
+def combine_signatures(*groups: Iterable[ErrorSignature]) -> list[ErrorSignature]:
+    """Combine signatures counted separately (e.g. before and after a restart).
+
+    Args:
+        groups: Signature lists to combine
+
+    Returns:
+        Combined signatures, most frequent first
+    """
+    counter = ErrorSignatureCounter()
+    for signatures in groups:
+        counter.update(signatures)
+    return counter.signatures()
@@ -2,6 +2,8 @@
 
 from typing import Any
 
+from parser.models import ValidationError
+
 
 def is_argocd_application(document: dict[str, Any]) -> bool:
     """Check if a YAML document is an ArgoCD Application manifest.
@@ -123,3 +125,227 @@ def validate_empty_null_fields(document: dict[str, Any]) -> list[str]:
                 empty_fields.append("spec.destination.namespace")
 
     return empty_fields
+
+
+# Messages Pydantic reports for ArgoCDApplication; check_manifest_structure
+# reproduces them so its errors match a failed model_validate()
+_REQUIRED = "Field required"
+_NOT_A_STRING = "Input should be a valid string"
+_EMPTY_STRING = "Value error, Field cannot be empty or whitespace-only"
+_NOT_A_DICT = "Input should be a valid dictionary"
+_NOT_A_LIST = "Input should be a valid list"
+_MISSING = object()
+
+# Non-list sequences Pydantic's lax mode accepts for a list field (YAML's
+# !!set loads as a set); their errors are left to Pydantic
+_LAX_SEQUENCES = (tuple, set, frozenset)
+
+
+class _DeferError(Exception):
+    """The document has a problem the walker does not report like Pydantic."""
+
+
+class _StructureWalker:
+    """Walk a manifest once, collecting errors in Pydantic's order."""
+
+    def __init__(self) -> None:
+        self.errors: list[ValidationError] = []
+
+    def error(self, field: str, message: str) -> None:
+        self.errors.append(
+            ValidationError(error_type="VALIDATION_ERROR", field=field, message=message)
+        )
+
+    def model(
+        self, parent: dict[Any, Any], key: str, field: str, name: str
+    ) -> dict[Any, Any] | None:
+        """Return a required nested model's mapping, or None after reporting it."""
+        value = parent.get(key, _MISSING)
+        if isinstance(value, dict):
+            return value
+        if value is _MISSING:
+            self.error(field, _REQUIRED)
+        else:
+            self.error(field, f"Input should be a valid dictionary or instance of {name}")
+        return None
+
+    def string(
+        self,
+        parent: dict[Any, Any],
+        key: str,
+        field: str,
+        required: bool = False,
+        nullable: bool = False,
+        non_empty: bool = False,
+    ) -> None:
+        """Check a string field (required, str | None, or str with a default)."""
+        value = parent.get(key, _MISSING)
+        if isinstance(value, str):
+            if non_empty and not value.strip():
+                self.error(field, _EMPTY_STRING)
+        elif value is _MISSING:
+            if required:
+                self.error(field, _REQUIRED)
+        elif isinstance(value, (bytes, bytearray)):
+            # Pydantic decodes bytes in lax mode
+            raise _DeferError
+        elif value is not None or not nullable:
+            self.error(field, _NOT_A_STRING)
+
+    def mapping(self, value: Any, field: str, str_values: bool = False) -> None:
+        """Check a dict[str, Any] (or dict[str, str]) field."""
+        if not isinstance(value, dict):
+            self.error(field, _NOT_A_DICT)
+            return
+        for key, item in value.items():
+            if not isinstance(key, str):
+                # Pydantic reports key errors at a "[key]" location
+                raise _DeferError
+            if str_values and not isinstance(item, str):
+                if isinstance(item, (bytes, bytearray)):
+                    raise _DeferError
+                self.error(f"{field}.{key}", _NOT_A_STRING)
+
+    def mappings(self, value: Any, field: str, str_values: bool = False) -> None:
+        """Check a list of dict[str, Any] (or dict[str, str]) field."""
+        if isinstance(value, _LAX_SEQUENCES):
+            raise _DeferError
+        if not isinstance(value, list):
+            self.error(field, _NOT_A_LIST)
+            return
+        for index, item in enumerate(value):
+            self.mapping(item, f"{field}.{index}", str_values)
+
+    def walk(self, document: dict[Any, Any]) -> None:
+        self.string(document, "apiVersion", "apiVersion", required=True)
+        self.string(document, "kind", "kind", required=True)
+
+        metadata = self.model(document, "metadata", "metadata", "ArgoCDMetadata")
+        if metadata is not None:
+            self.string(metadata, "name", "metadata.name", required=True, non_empty=True)
+            self.string(metadata, "namespace", "metadata.namespace")
+            if "labels" in metadata:
+                self.mapping(metadata["labels"], "metadata.labels", str_values=True)
+            if "annotations" in metadata:
+                self.mapping(metadata["annotations"], "metadata.annotations", str_values=True)
+
+        spec = self.model(document, "spec", "spec", "ArgoCDSpec")
+        if spec is not None:
+            self.string(spec, "project", "spec.project")
+            source = self.model(spec, "source", "spec.source", "ArgoCDSource")
+            if source is not None:
+                self.source(source)
+            destination = self.model(spec, "destination", "spec.destination", "ArgoCDDestination")
+            if destination is not None:
+                self.destination(destination)
+            if spec.get("syncPolicy") is not None:
+                self.sync_policy(spec["syncPolicy"])
+            if "ignoreDifferences" in spec:
+                self.mappings(spec["ignoreDifferences"], "spec.ignoreDifferences")
+            if "info" in spec:
+                self.mappings(spec["info"], "spec.info", str_values=True)
+
+        if not self.errors:
+            # ArgoCDApplication.model_post_init
+            if document["apiVersion"] != "argoproj.io/v1alpha1":
+                self.error(
+                    "",
+                    f"Value error, Invalid apiVersion '{document['apiVersion']}'. "
+                    "Expected 'argoproj.io/v1alpha1'",
+                )
+            elif document["kind"] != "Application":
+                self.error(
+                    "", f"Value error, Invalid kind '{document['kind']}'. Expected 'Application'"
+                )
+
+    def source(self, source: dict[Any, Any]) -> None:
+        before = len(self.errors)
+        self.string(source, "repoURL", "spec.source.repoURL", required=True, non_empty=True)
+        self.string(source, "targetRevision", "spec.source.targetRevision")
+        self.string(source, "path", "spec.source.path", nullable=True)
+        self.string(source, "chart", "spec.source.chart", nullable=True)
+        if len(self.errors) > before:
+            return
+        # ArgoCDSource.model_post_init
+        has_path = source.get("path") is not None
+        has_chart = source.get("chart") is not None
+        if not has_path and not has_chart:
+            self.error(
+                "spec.source", "Value error, Either 'path' or 'chart' must be specified in source"
+            )
+        elif has_path and has_chart:
+            self.error(
+                "spec.source", "Value error, Cannot specify both 'path' and 'chart' in source"
+            )
+
+    def destination(self, destination: dict[Any, Any]) -> None:
+        before = len(self.errors)
+        self.string(destination, "server", "spec.destination.server", nullable=True)
+        self.string(destination, "name", "spec.destination.name", nullable=True)
+        self.string(
+            destination, "namespace", "spec.destination.namespace", required=True, non_empty=True
+        )
+        if len(self.errors) > before:
+            return
+        # ArgoCDDestination.model_post_init
+        has_server = destination.get("server") is not None
+        has_name = destination.get("name") is not None
+        if not has_server and not has_name:
+            self.error(
+                "spec.destination",
+                "Value error, Either 'server' or 'name' must be specified in destination",
+            )
+        elif has_server and has_name:
+            self.error(
+                "spec.destination",
+                "Value error, Cannot specify both 'server' and 'name' in destination",
+            )
+
+    def sync_policy(self, value: Any) -> None:
+        if not isinstance(value, dict):
+            self.error(
+                "spec.syncPolicy",
+                "Input should be a valid dictionary or instance of ArgoCDSyncPolicy",
+            )
+            return
+        if value.get("automated") is not None:
+            self.mapping(value["automated"], "spec.syncPolicy.automated")
+        options = value.get("syncOptions", [])
+        if isinstance(options, _LAX_SEQUENCES):
+            raise _DeferError
+        if not isinstance(options, list):
+            self.error("spec.syncPolicy.syncOptions", _NOT_A_LIST)
+        else:
+            for index, option in enumerate(options):
+                if not isinstance(option, str):
+                    if isinstance(option, (bytes, bytearray)):
+                        raise _DeferError
+                    self.error(f"spec.syncPolicy.syncOptions.{index}", _NOT_A_STRING)
+        if value.get("retry") is not None:
+            self.mapping(value["retry"], "spec.syncPolicy.retry")
+
+
+def check_manifest_structure(document: dict[str, Any]) -> list[ValidationError] | None:
+    """Find every structural error in a manifest in one traversal.
+
+    Reports the same errors, in the same order and with the same field paths
+    and messages, as converting the Pydantic errors of a failed
+    ``ArgoCDApplication.model_validate(document)`` (missing fields, values of
+    the wrong type, empty required strings, and the path/chart, server/name,
+    apiVersion and kind rules), without building models or raising.
+
+    Args:
+        document: Parsed YAML document (a mapping)
+
+    Returns:
+        The VALIDATION_ERROR errors (empty if the document is sound), or
+        None for the rare documents whose errors only Pydantic describes
+        exactly (non-string mapping keys, bytes values, sets or tuples
+        for list fields)
+    """
+    walker = _StructureWalker()
+    try:
+        walker.walk(document)
+    except _DeferError:
+        return None
+    return walker.errors
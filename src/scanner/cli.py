@@ -2,6 +2,7 @@
 
 import json
 import sys
+from contextlib import nullcontext
 from pathlib import Path
 
 import typer
@@ -15,6 +16,7 @@ from scanner.core import (
     VerbosityLevel,
     scan_directory,
 )
+from scanner.throttle import IO_BUCKET_ENV_VAR, MAX_OPEN_RATE_ENV_VAR, IOThrottle
 
 # Initialize Typer app and Rich console
 app = typer.Typer(help="YAML File Scanner - Stage 1 of ArgoCD Application Migration Pipeline")
@@ -53,6 +55,21 @@ def scan(
         "-v",
         help="Output verbosity: 'quiet' (errors only), 'info' (summary), 'verbose' (detailed)",
     ),
+    max_open_rate: float | None = typer.Option(
+        None,
+        "--max-open-rate",
+        help="Limit the directory walk to this many paths per second",
+        envvar=MAX_OPEN_RATE_ENV_VAR,
+        min=0.001,
+    ),
+    io_bucket: Path | None = typer.Option(
+        None,
+        "--io-bucket",
+        help="Shared I/O budget state file; commands using the same file share one budget",
+        envvar=IO_BUCKET_ENV_VAR,
+        dir_okay=False,
+        resolve_path=True,
+    ),
 ) -> None:
     """
     Scan a directory for YAML files (.yaml and .yml extensions).
@@ -70,6 +87,9 @@ def scan(
 
         # Verbose output
         argocd-scan -i ./apps -v verbose
+
+        # Gentle on a shared host, sharing one budget with argocd-parse
+        argocd-scan -i ./apps -r --max-open-rate 200 --io-bucket /tmp/argocd-io.bucket
     """
     try:
         # Create and validate options
@@ -81,13 +101,22 @@ def scan(
         )
 
         # Perform scan
-        result = scan_directory(options)
+        throttle = (
+            IOThrottle(files_per_second=max_open_rate, state_path=io_bucket)
+            if max_open_rate is not None
+            else None
+        )
+        with throttle if throttle is not None else nullcontext():
+            result = scan_directory(options, throttle)
+            io_stats = throttle.stats() if throttle is not None else None
 
         # Output results
         if format == "json":
             _output_json(result)
         else:
             _output_human(result, verbosity)
+            if io_stats is not None and verbosity != "quiet":
+                console.print(f"I/O: {io_stats.describe()}")
 
         # Output errors to stderr if any
         if result.has_errors:
@@ -5,6 +5,8 @@ from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, Field, computed_field, field_validator
 
+from scanner.throttle import IOThrottle
+
 # Type aliases
 OutputFormat = Literal["json", "human"]
 VerbosityLevel = Literal["quiet", "info", "verbose"]
@@ -87,12 +89,13 @@ class ScanResult(BaseModel):
         return [str(f) for f in self.files]
 
 
-def scan_directory(options: ScanOptions) -> ScanResult:
+def scan_directory(options: ScanOptions, throttle: IOThrottle | None = None) -> ScanResult:
     """
     Scan directory for YAML files according to options.
 
     Args:
         options: Validated scan configuration
+        throttle: Optional I/O throttle charged one file operation per path visited
 
     Returns:
         ScanResult containing discovered files and any errors
@@ -114,6 +117,8 @@ def scan_directory(options: ScanOptions) -> ScanResult:
                     iterator = options.input_dir.glob(pattern)
 
                 for path in iterator:
+                    if throttle is not None:
+                        throttle.acquire(files=1)
                     try:
                         # Skip hidden directories
                         if _is_hidden(path):
@@ -0,0 +1,342 @@
+"""Token-bucket I/O throttling shared by the scanner and the parser.
+
+Two buckets limit bytes read per second and files opened per second. Bucket
+state lives in a small memory-mapped file guarded by ``flock``, so every
+process that opens the same state file draws from the same budget: the
+parser's worker processes, and separately launched ``argocd-scan`` and
+``argocd-parse`` commands pointed at one ``--io-bucket`` file.
+
+Throttles are picklable (only the path and rates travel), so they can be
+handed to process pool workers as part of a job. Acquiring more tokens than
+the bucket holds is allowed and paid back by sleeping, which keeps pacing
+correct for files larger than one second's byte budget.
+"""
+
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field, computed_field
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None  # type: ignore[assignment]
+
+# Environment variables backing the CLI options
+MAX_READ_RATE_ENV_VAR = "ARGOCD_MAX_READ_RATE"
+MAX_OPEN_RATE_ENV_VAR = "ARGOCD_MAX_OPEN_RATE"
+IO_BUCKET_ENV_VAR = "ARGOCD_IO_BUCKET"
+
+# Seconds of budget a full bucket holds (how large a burst may be)
+DEFAULT_BURST_SECONDS = 1.0
+
+# Shared state: bytes tokens, bytes refill time, files tokens, files refill
+# time, then cumulative bytes, files and seconds spent waiting
+_STATE_FORMAT = "7d"
+_STATE_SIZE = struct.calcsize(_STATE_FORMAT)
+
+_SIZE_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmgt]?)(i?b?)\s*$", re.IGNORECASE)
+_SIZE_UNITS = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3, "t": 1024**4}
+
+
+def parse_size(text: str) -> int:
+    """Parse a human-readable size such as "512M", "2GiB" or "1048576".
+
+    Units are binary (K = 1024 bytes).
+
+    Args:
+        text: Size to parse
+
+    Returns:
+        Size in bytes
+
+    Raises:
+        ValueError: If text is not a valid size
+    """
+    match = _SIZE_PATTERN.match(text)
+    if not match:
+        raise ValueError(f"Invalid size '{text}'. Expected a number with optional K, M, G or T")
+    number, unit, _suffix = match.groups()
+    size = int(float(number) * _SIZE_UNITS[unit.lower()])
+    if size <= 0:
+        raise ValueError(f"Invalid size '{text}'. Size must be positive")
+    return size
+
+
+def parse_rate(text: str) -> int:
+    """Parse a bytes-per-second rate such as "20M" or "20MiB/s".
+
+    Args:
+        text: Rate to parse; a trailing "/s" is optional
+
+    Returns:
+        Rate in bytes per second
+
+    Raises:
+        ValueError: If text is not a valid rate
+    """
+    return parse_size(text.strip().removesuffix("/s"))
+
+
+class IOStats(BaseModel):
+    """I/O performed through a throttle and the throughput achieved."""
+
+    model_config = ConfigDict(frozen=True)
+
+    bytes_read: int = Field(default=0, description="Bytes charged to the bucket")
+    files_opened: int = Field(default=0, description="File operations charged to the bucket")
+    elapsed_seconds: float = Field(default=0.0, description="Wall-clock duration measured")
+    throttled_seconds: float = Field(
+        default=0.0, description="Total time callers slept waiting for tokens"
+    )
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def bytes_per_second(self) -> float:
+        """Effective read throughput"""
+        return self.bytes_read / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def files_per_second(self) -> float:
+        """Effective file throughput"""
+        return self.files_opened / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def describe(self) -> str:
+        """Return a one-line human-readable description of the throughput."""
+        return (
+            f"{self.files_opened} file(s), {self.bytes_read / 1024**2:.1f} MiB in "
+            f"{self.elapsed_seconds:.1f}s ({self.files_per_second:.1f} files/s, "
+            f"{self.bytes_per_second / 1024**2:.2f} MiB/s); "
+            f"waited {self.throttled_seconds:.1f}s for I/O budget"
+        )
+
+
+class _SharedState:
+    """Memory-mapped bucket state, locked across threads and processes."""
+
+    def __init__(self, path: str) -> None:
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._lock = threading.Lock()
+        with self:
+            if os.fstat(self._fd).st_size < _STATE_SIZE:
+                os.ftruncate(self._fd, _STATE_SIZE)
+        self._map = mmap.mmap(self._fd, _STATE_SIZE)
+
+    def __enter__(self) -> "_SharedState":
+        self._lock.acquire()
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._lock.release()
+
+    def read(self) -> list[float]:
+        return list(struct.unpack_from(_STATE_FORMAT, self._map))
+
+    def write(self, values: list[float]) -> None:
+        struct.pack_into(_STATE_FORMAT, self._map, 0, *values)
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+
+# State files opened by this process, keyed by (pid, path) so a forked worker
+# never reuses its parent's descriptor (flock is per open file description)
+_open_states: dict[tuple[int, str], _SharedState] = {}
+_open_states_lock = threading.Lock()
+
+
+def _state_for(path: str) -> _SharedState:
+    key = (os.getpid(), path)
+    with _open_states_lock:
+        state = _open_states.get(key)
+        if state is None:
+            state = _open_states[key] = _SharedState(path)
+        return state
+
+
+def _refill(tokens: float, last: float, now: float, rate: float, burst: float) -> float:
+    if last == 0.0:
+        # Fresh state file: start with a full bucket
+        return burst
+    # A refill time ahead of now was written under another monotonic clock (a
+    # shared state file that outlived a reboot or came from another container's
+    # time namespace); no time has passed since, rather than a negative amount
+    return min(burst, tokens + max(0.0, now - last) * rate)
+
+
+class IOThrottle:
+    """Limit bytes read and files opened per second, across processes.
+
+    A throttle created without a state path owns a private temporary state
+    file, removed by close(); worker processes that receive the throttle
+    still share it. Give several commands the same path to share one budget.
+    """
+
+    def __init__(
+        self,
+        bytes_per_second: float | None = None,
+        files_per_second: float | None = None,
+        state_path: Path | None = None,
+        burst_seconds: float = DEFAULT_BURST_SECONDS,
+    ) -> None:
+        """Create a throttle.
+
+        Args:
+            bytes_per_second: Read budget, or None for unlimited
+            files_per_second: File operation budget, or None for unlimited
+            state_path: Shared bucket state file (default: a private temporary file)
+            burst_seconds: Seconds of budget that may be spent at once after idling
+
+        Raises:
+            ValueError: If a rate or burst_seconds is not positive
+            OSError: If the state file cannot be created
+        """
+        for name, value in (
+            ("bytes_per_second", bytes_per_second),
+            ("files_per_second", files_per_second),
+            ("burst_seconds", burst_seconds),
+        ):
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive, got {value}")
+
+        self.bytes_per_second = bytes_per_second
+        self.files_per_second = files_per_second
+        self.burst_seconds = burst_seconds
+        self._owns_state = state_path is None
+        if state_path is None:
+            fd, temp_path = tempfile.mkstemp(prefix="argocd-io-", suffix=".bucket")
+            os.close(fd)
+            state_path = Path(temp_path)
+        self.state_path = state_path
+        self._state = _state_for(str(state_path))
+        self._started = time.monotonic()
+        self._baseline = self._counters()
+
+    @classmethod
+    def from_options(
+        cls,
+        max_read_rate: str | None,
+        max_open_rate: float | None,
+        state_path: Path | None = None,
+    ) -> "IOThrottle | None":
+        """Build a throttle from CLI/environment settings.
+
+        Args:
+            max_read_rate: Read budget such as "20M" (bytes per second)
+            max_open_rate: Files opened per second
+            state_path: Shared bucket state file
+
+        Returns:
+            Throttle, or None if no limit is configured
+
+        Raises:
+            ValueError: If a setting is invalid
+        """
+        if max_read_rate is None and max_open_rate is None:
+            return None
+        return cls(
+            bytes_per_second=parse_rate(max_read_rate) if max_read_rate else None,
+            files_per_second=max_open_rate,
+            state_path=state_path,
+        )
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {
+            "bytes_per_second": self.bytes_per_second,
+            "files_per_second": self.files_per_second,
+            "burst_seconds": self.burst_seconds,
+            "state_path": self.state_path,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._owns_state = False
+        self._state = _state_for(str(self.state_path))
+        self._started = time.monotonic()
+        self._baseline = [0.0, 0.0, 0.0]
+
+    def _counters(self) -> list[float]:
+        with self._state:
+            return self._state.read()[4:]
+
+    def acquire(self, nbytes: int = 0, files: int = 0) -> float:
+        """Charge I/O to the buckets, sleeping until it fits the budget.
+
+        Args:
+            nbytes: Bytes about to be read
+            files: Files about to be opened (or directory entries visited)
+
+        Returns:
+            Seconds spent waiting
+        """
+        now = time.monotonic()
+        wait = 0.0
+        with self._state:
+            values = self._state.read()
+            if self.bytes_per_second is not None and nbytes:
+                rate = self.bytes_per_second
+                tokens = _refill(values[0], values[1], now, rate, rate * self.burst_seconds)
+                values[0], values[1] = tokens - nbytes, now
+                wait = max(wait, -values[0] / rate)
+            if self.files_per_second is not None and files:
+                rate = self.files_per_second
+                tokens = _refill(values[2], values[3], now, rate, rate * self.burst_seconds)
+                values[2], values[3] = tokens - files, now
+                wait = max(wait, -values[2] / rate)
+            values[4] += nbytes
+            values[5] += files
+            values[6] += wait
+            self._state.write(values)
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def stats(self) -> IOStats:
+        """Return I/O charged to the shared state since this throttle was created.
+
+        With a shared ``state_path`` this includes I/O by other commands using
+        the same bucket during the same period.
+        """
+        counters = self._counters()
+        return IOStats(
+            bytes_read=int(counters[0] - self._baseline[0]),
+            files_opened=int(counters[1] - self._baseline[1]),
+            elapsed_seconds=time.monotonic() - self._started,
+            throttled_seconds=round(counters[2] - self._baseline[2], 3),
+        )
+
+    def close(self) -> None:
+        """Release the state file, deleting it if this throttle created it."""
+        if self._owns_state:
+            with _open_states_lock:
+                state = _open_states.pop((os.getpid(), str(self.state_path)), None)
+            if state is not None:
+                state.close()
+            self.state_path.unlink(missing_ok=True)
+            self._owns_state = False
+
+    def __enter__(self) -> "IOThrottle":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
@@ -1,8 +1,137 @@
-"""Pytest configuration for test discovery."""
+"""Pytest configuration for test discovery and shared test helpers.
 
+Test modules import the helpers directly (``from conftest import
+write_manifests``); pytest puts this directory on sys.path.
+"""
+
+import json
 import sys
 from pathlib import Path
+from typing import Any
 
 # Add src directory to Python path for imports
 src_path = Path(__file__).parent.parent / "src"
 sys.path.insert(0, str(src_path))
+
+MANIFEST_TEMPLATE = """
+apiVersion: argoproj.io/v1alpha1
+kind: Application
+metadata:
+  name: {name}
+{labels}spec:
+  project: {project}
+  source:
+    repoURL: {repo_url}
+    path: ./{name}
+  destination:
+    {destination}
+    namespace: {namespace}
+"""
+
+
+def manifest_yaml(
+    name: str,
+    namespace: str = "default",
+    project: str = "default",
+    cluster: str | None = None,
+    repo_url: str = "https://github.com/org/repo.git",
+    **labels: str,
+) -> str:
+    """Render a valid ArgoCD Application manifest.
+
+    Args:
+        name: Application name (also the source path, ./NAME)
+        namespace: Destination namespace
+        project: ArgoCD project
+        cluster: Destination cluster name; the in-cluster server URL if None
+        repo_url: Source repository URL
+        labels: Application labels
+
+    Returns:
+        Manifest YAML
+    """
+    label_lines = "".join(f"    {key}: {value}\n" for key, value in labels.items())
+    return MANIFEST_TEMPLATE.format(
+        name=name,
+        labels=f"  labels:\n{label_lines}" if labels else "",
+        project=project,
+        repo_url=repo_url,
+        destination=(
+            "server: https://kubernetes.default.svc" if cluster is None else f"name: {cluster}"
+        ),
+        namespace=namespace,
+    )
+
+
+def write_manifests(directory: Path, names: list[str], **fields: Any) -> list[Path]:
+    """Write one valid manifest per name, as NAME.yaml.
+
+    Args:
+        directory: Directory to write to
+        names: Application names
+        fields: Keyword arguments for manifest_yaml()
+
+    Returns:
+        Written files, in the order of names
+    """
+    files = []
+    for name in names:
+        path = directory / f"{name}.yaml"
+        path.write_text(manifest_yaml(name, **fields))
+        files.append(path)
+    return files
+
+
+def output_record(
+    name: str,
+    cluster: str = "prod",
+    namespace: str = "default",
+    project: str | None = None,
+    **labels: str,
+) -> bytes:
+    """Render a compact migration output, as sinks receive it.
+
+    Args:
+        name: Application name
+        cluster: Destination cluster name
+        namespace: Destination namespace
+        project: ArgoCD project; omitted if None
+        labels: Output labels
+
+    Returns:
+        Output JSON
+    """
+    record: dict[str, Any] = {
+        "metadata": {"name": name, "labels": labels, "annotations": {"owner": "ops"}},
+    }
+    if project is not None:
+        record["project"] = project
+    record["source"] = {"repoURL": f"https://example.com/{name}.git", "revision": "HEAD"}
+    record["destination"] = {"clusterName": cluster, "namespace": namespace}
+    record["enableSyncPolicy"] = True
+    return json.dumps(record, separators=(",", ":")).encode()
+
+
+def result_record(file: str, status: str = "success", name: str | None = None) -> dict[str, Any]:
+    """Build a result record in the ``--json`` format.
+
+    Args:
+        file: Manifest path
+        status: success, failed or skipped
+        name: Application name of a successful result
+
+    Returns:
+        Result record; failed results carry one VALIDATION_ERROR
+    """
+    errors = (
+        [{"type": "VALIDATION_ERROR", "field": "spec", "message": "Field required"}]
+        if status == "failed"
+        else []
+    )
+    return {
+        "file": file,
+        "status": status,
+        "output": f"/runs/out/{name}.json" if status == "success" else None,
+        "application_name": name if status == "success" else None,
+        "errors": errors,
+    }
@@ -1,6 +1,10 @@
 """Integration tests for CLI and end-to-end parsing."""
 
+import gzip
 import json
+import shutil
+import sqlite3
+import tarfile
 import tempfile
 from pathlib import Path
 
@@ -366,3 +370,785 @@ spec:
             # Quiet mode suppresses all output including progress and summary
             # Verify output file was created
             assert (Path(output_dir) / "test-app.json").exists()
+
+
+def test_batch_mode_threads_executor():
+    """Test batch mode with the thread executor."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for name in ("app-a", "app-b", "app-c"):
+            (Path(temp_dir) / f"{name}.yaml").write_text(f"""
+apiVersion: argoproj.io/v1alpha1
+kind: Application
+metadata:
+  name: {name}
+spec:
+  project: default
+  source:
+    repoURL: https://github.com/org/repo.git
+    path: ./app
+  destination:
+    server: https://kubernetes.default.svc
+    namespace: default
+""")
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            result = runner.invoke(
+                app,
+                [
+                    "--directory", temp_dir,
+                    "--output-dir", output_dir,
+                    "--executor", "threads",
+                    "--workers", "2",
+                    "--json",
+                ],
+            )
+
+            assert result.exit_code == 0
+            output = json.loads(result.stdout)
+            assert output["summary"]["successful"] == 3
+            assert sorted(p.name for p in Path(output_dir).glob("*.json")) == [
+                "app-a.json", "app-b.json", "app-c.json"
+            ]
+
+
+def test_batch_mode_shards_cover_all_files():
+    """Test that running every shard processes each manifest exactly once."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for i in range(12):
+            (Path(temp_dir) / f"app-{i}.yaml").write_text(f"""
+apiVersion: argoproj.io/v1alpha1
+kind: Application
+metadata:
+  name: app-{i}
+spec:
+  source:
+    repoURL: https://github.com/org/repo.git
+    path: ./app
+  destination:
+    server: https://kubernetes.default.svc
+    namespace: default
+""")
+
+        processed = []
+        with tempfile.TemporaryDirectory() as output_dir:
+            for index in (1, 2, 3):
+                result = runner.invoke(
+                    app,
+                    [
+                        "--directory", temp_dir,
+                        "--output-dir", output_dir,
+                        "--shard", f"{index}/3",
+                        "--json",
+                    ],
+                )
+
+                assert result.exit_code == 0
+                output = json.loads(result.stdout)
+                assert output["shard"] == {"index": index, "count": 3, "discovered": 12}
+                processed.extend(r["file"] for r in output["results"])
+
+        assert len(processed) == 12
+        assert len(set(processed)) == 12
+
+
+def test_batch_mode_invalid_shard():
+    """Test error handling for a malformed shard specification."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        result = runner.invoke(app, ["--directory", temp_dir, "--shard", "4/3"])
+
+        assert result.exit_code == 1
+        assert "Invalid shard" in result.stdout
+
+
+def test_merge_shard_summaries_matches_single_run():
+    """Test that merging shard summaries reproduces a single run's report."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manifests = Path(temp_dir) / "manifests"
+        manifests.mkdir()
+        for i in range(9):
+            (manifests / f"app-{i}.yaml").write_text(f"""
+apiVersion: argoproj.io/v1alpha1
+kind: Application
+metadata:
+  name: app-{i}
+spec:
+  source:
+    repoURL: https://github.com/org/repo.git
+    path: ./app
+  destination:
+    server: https://kubernetes.default.svc
+    namespace: default
+""")
+        (manifests / "broken.yaml").write_text("apiVersion: v1\nkind: Service\n")
+
+        single = runner.invoke(app, ["--directory", str(manifests), "--output-dir",
+                                     str(Path(temp_dir) / "single"), "--json"])
+        summaries = []
+        for index in (1, 2):
+            result = runner.invoke(app, [
+                "--directory", str(manifests),
+                "--output-dir", str(Path(temp_dir) / f"out-{index}"),
+                "--shard", f"{index}/2",
+                "--json",
+            ])
+            summary_file = Path(temp_dir) / f"shard-{index}.json"
+            summary_file.write_text(result.stdout)
+            summaries.append(str(summary_file))
+
+        combined = Path(temp_dir) / "combined"
+        merged = runner.invoke(app, ["merge", *summaries, "--output-dir", str(combined), "--json"])
+
+        assert merged.exit_code == 1  # broken.yaml failed
+        merged_output = json.loads(merged.stdout)
+        assert merged_output["summary"] == json.loads(single.stdout)["summary"]
+        assert merged_output["missing_shards"] == []
+        assert len(merged_output["results"]) == 10
+        assert sorted(p.name for p in combined.glob("*.json")) == sorted(
+            p.name for p in (Path(temp_dir) / "single").glob("*.json")
+        )
+
+
+def test_merge_json_stream_shards():
+    """Test that --json-stream shard outputs merge like --json summaries."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manifests = Path(temp_dir) / "manifests"
+        manifests.mkdir()
+        _write_app_manifests(manifests, 6)
+
+        summaries = []
+        for index in (1, 2):
+            result = runner.invoke(app, [
+                "--directory", str(manifests),
+                "--output-dir", str(Path(temp_dir) / f"out-{index}"),
+                "--shard", f"{index}/2",
+                "--json-stream",
+            ])
+            summary_file = Path(temp_dir) / f"shard-{index}.ndjson"
+            summary_file.write_text(result.stdout)
+            summaries.append(str(summary_file))
+
+        combined = Path(temp_dir) / "combined"
+        merged = runner.invoke(app, ["merge", *summaries, "--output-dir", str(combined), "--json"])
+
+        assert merged.exit_code == 0
+        merged_output = json.loads(merged.stdout)
+        assert merged_output["summary"]["successful"] == 6
+        assert merged_output["missing_shards"] == []
+        assert len(list(combined.glob("*.json"))) == 6
+
+
+def test_merge_reports_collisions():
+    """Test that merge flags the same application produced by two manifests."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        summaries = []
+        for team in ("a", "b"):
+            summary_file = Path(temp_dir) / f"{team}.json"
+            summary_file.write_text(json.dumps({"results": [{
+                "file": f"/repo/team-{team}/app.yaml",
+                "status": "success",
+                "output": "/out/shared.json",
+                "application_name": "shared",
+                "errors": [],
+            }]}))
+            summaries.append(str(summary_file))
+
+        result = runner.invoke(app, ["merge", *summaries])
+
+        assert result.exit_code == 1
+        assert "Application Name Collisions" in result.stdout
+        assert "team-b/app.yaml" in result.stdout
+        assert "Failed: 1" in result.stdout
+        assert "shared.json is already produced by /repo/team-a/app.yaml" in result.stdout
+
+
+def _write_app_manifests(directory: Path, count: int) -> None:
+    """Write count valid manifests into directory."""
+    for i in range(count):
+        (directory / f"app-{i}.yaml").write_text(f"""
+apiVersion: argoproj.io/v1alpha1
+kind: Application
+metadata:
+  name: app-{i}
+spec:
+  source:
+    repoURL: https://github.com/org/repo.git
+    path: ./app
+  destination:
+    server: https://kubernetes.default.svc
+    namespace: default
+""")
+
+
+def test_batch_mode_resume_from_journal():
+    """Test that --resume skips files recorded by an interrupted run."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manifests = Path(temp_dir) / "manifests"
+        manifests.mkdir()
+        _write_app_manifests(manifests, 4)
+        output_dir = Path(temp_dir) / "output"
+        journal = Path(temp_dir) / "run.jsonl"
+
+        # Simulate a run that died after recording two results
+        first = runner.invoke(app, ["--directory", str(manifests), "--output-dir",
+                                    str(output_dir), "--journal", str(journal)])
+        assert first.exit_code == 0
+        journal.write_text("".join(journal.read_text().splitlines(keepends=True)[:2]))
+        done = [json.loads(line)["file"] for line in journal.read_text().splitlines()]
+
+        result = runner.invoke(app, [
+            "--directory", str(manifests),
+            "--output-dir", str(output_dir),
+            "--journal", str(journal),
+            "--resume",
+            "--json",
+        ])
+
+        assert result.exit_code == 0
+        output = json.loads(result.stdout)
+        assert output["summary"]["total"] == 4
+        assert output["summary"]["successful"] == 4
+        journal_files = [json.loads(line)["file"] for line in journal.read_text().splitlines()]
+        assert len(journal_files) == 4
+        assert journal_files[:2] == done
+        assert not set(done) & set(journal_files[2:])
+
+
+def test_batch_mode_retry_failed():
+    """Test that --retry-failed reprocesses only previous failures."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manifests = Path(temp_dir) / "manifests"
+        manifests.mkdir()
+        _write_app_manifests(manifests, 3)
+        broken = manifests / "broken.yaml"
+        broken.write_text("apiVersion: v1\nkind: Service\n")
+        output_dir = Path(temp_dir) / "output"
+
+        first = runner.invoke(app, ["--directory", str(manifests), "--output-dir",
+                                    str(output_dir), "--json"])
+        assert first.exit_code == 1
+        summary_file = Path(temp_dir) / "summary.json"
+        summary_file.write_text(first.stdout)
+
+        result = runner.invoke(app, [
+            "--directory", str(manifests),
+            "--output-dir", str(output_dir),
+            "--retry-failed", str(summary_file),
+            "--json",
+        ])
+
+        output = json.loads(result.stdout)
+        assert [r["file"] for r in output["results"]] == [str(broken.resolve())]
+
+
+@pytest.mark.parametrize("option", ["--resume", "--retry-failed"])
+@pytest.mark.parametrize(
+    "output", [["--output-format", "ndjson", "--output-file", "apps.ndjson"],
+               ["--output-format", "grouped"],
+               ["--output-bundle", "out.tar.gz"]]
+)
+def test_resume_rejects_rebuilt_outputs(option, output):
+    """Test that outputs rebuilt by every run cannot be resumed or retried."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        journal = Path(temp_dir) / "run.journal"
+        journal.write_text("")
+        extra = ["--journal", str(journal), "--resume"] if option == "--resume" else [
+            "--retry-failed", str(journal)
+        ]
+        output = [
+            str(Path(temp_dir) / arg) if arg.endswith((".ndjson", ".gz")) else arg
+            for arg in output
+        ]
+
+        result = runner.invoke(app, ["--directory", temp_dir, *output, *extra])
+
+        assert result.exit_code == 1
+        assert "cannot be combined with --resume" in " ".join(result.stdout.split())
+
+
+def test_resume_requires_journal():
+    """Test that --resume without --journal is rejected."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        result = runner.invoke(app, ["--directory", temp_dir, "--resume"])
+
+        assert result.exit_code == 1
+        assert "--resume requires --journal" in result.stdout
+
+
+def test_batch_mode_fail_fast():
+    """Test that --fail-fast stops at the first failure with a partial summary."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manifests = Path(temp_dir) / "manifests"
+        manifests.mkdir()
+        _write_app_manifests(manifests, 5)
+        (manifests / "aaa-broken.yaml").write_text("apiVersion: v1\nkind: Service\n")
+
+        result = runner.invoke(app, [
+            "--directory", str(manifests),
+            "--output-dir", str(Path(temp_dir) / "output"),
+            "--executor", "serial",
+            "--fail-fast",
+            "--json",
+        ])
+
+        assert result.exit_code == 1
+        summary = json.loads(result.stdout)["summary"]
+        assert summary["failed"] == 1
+        assert summary["skipped"] == 5
+        assert summary["stopped_early"] is True
+
+
+def test_batch_mode_invalid_max_rss():
+    """Test error handling for a malformed --max-rss value."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        result = runner.invoke(app, ["--directory", temp_dir, "--max-rss", "lots"])
+
+        assert result.exit_code == 1
+        assert "Invalid size" in result.stdout
+
+
+def test_batch_mode_io_throttle_reports_throughput(tmp_path, monkeypatch):
+    """Test that a throttled run reports its effective throughput."""
+    manifests = tmp_path / "manifests"
+    manifests.mkdir()
+    _write_app_manifests(manifests, 3)
+    monkeypatch.setenv("ARGOCD_MAX_OPEN_RATE", "1000")
+
+    result = runner.invoke(
+        app,
+        [
+            "--directory", str(manifests), "--output-dir", str(tmp_path / "out"),
+            "--max-read-rate", "10M/s", "--json",
+        ],
+    )
+
+    assert result.exit_code == 0
+    data = json.loads(result.stdout)
+    assert data["io"]["files_opened"] == 3
+    assert data["io"]["bytes_read"] > 0
+
+
+def test_batch_mode_invalid_max_read_rate(tmp_path):
+    """Test error handling for a malformed --max-read-rate value."""
+    result = runner.invoke(app, ["--directory", str(tmp_path), "--max-read-rate", "fast"])
+
+    assert result.exit_code == 1
+    assert "Invalid size" in result.stdout
+
+
+def test_batch_mode_unusable_output_dir(tmp_path):
+    """Test that an output path that cannot be a directory is reported once."""
+    manifests = tmp_path / "manifests"
+    manifests.mkdir()
+    _write_app_manifests(manifests, 2)
+    blocker = tmp_path / "out"
+    blocker.write_text("not a directory")
+
+    result = runner.invoke(app, ["--directory", str(manifests), "--output-dir", str(blocker)])
+
+    assert result.exit_code == 1
+    assert "Error" in result.stdout
+
+
+def test_batch_mode_compact_output(tmp_path):
+    """Test that --compact writes single-line JSON with the same content."""
+    manifests = tmp_path / "manifests"
+    manifests.mkdir()
+    _write_app_manifests(manifests, 2)
+
+    pretty = runner.invoke(
+        app, ["--directory", str(manifests), "--output-dir", str(tmp_path / "pretty"), "-q"]
+    )
+    compact = runner.invoke(
+        app,
+        [
+            "--directory", str(manifests), "--output-dir", str(tmp_path / "compact"), "-q",
+            "--compact", "--serializer", "json",
+        ],
+    )
+
+    assert pretty.exit_code == 0
+    assert compact.exit_code == 0
+    for path in (tmp_path / "pretty").glob("*.json"):
+        compact_text = (tmp_path / "compact" / path.name).read_text()
+        assert "\n" not in compact_text
+        assert json.loads(compact_text) == json.loads(path.read_text())
+
+
+def test_batch_mode_ndjson_output_file(tmp_path):
+    """Test streaming all applications into one gzip-compressed NDJSON file."""
+    manifests = tmp_path / "manifests"
+    manifests.mkdir()
+    _write_app_manifests(manifests, 3)
+    target = tmp_path / "apps.ndjson.gz"
+
+    result = runner.invoke(
+        app,
+        [
+            "--directory", str(manifests), "--output-format", "ndjson",
+            "--output-file", str(target), "--json",
+        ],
+    )
+
+    assert result.exit_code == 0
+    assert json.loads(result.stdout)["output_file"] == str(target)
+    lines = gzip.decompress(target.read_bytes()).decode().splitlines()
+    assert len(lines) == 3
+
+
+def test_output_file_requires_aggregate_format(tmp_path):
+    """Test that --output-file without an aggregate --output-format is rejected."""
+    result = runner.invoke(
+        app, ["--directory", str(tmp_path), "--output-file", str(tmp_path / "a.ndjson")]
+    )
+
+    assert result.exit_code == 1
+    assert "--output-format" in result.stdout
+
+
+def test_batch_mode_grouped_output(tmp_path):
+    """Test writing one ApplicationSet config.json per group."""
+    manifests = tmp_path / "manifests"
+    manifests.mkdir()
+    _write_app_manifests(manifests, 3)
+    output = tmp_path / "output"
+
+    result = runner.invoke(
+        app,
+        [
+            "--directory", str(manifests), "--output-dir", str(output),
+            "--output-format", "grouped", "--group-by", "project", "--quiet",
+        ],
+    )
+
+    assert result.exit_code == 0
+    records = json.loads((output / "default" / "config.json").read_text())
+    assert [r["metadata"]["name"] for r in records] == ["app-0", "app-1", "app-2"]
+
+
+def test_batch_mode_invalid_group_by(tmp_path):
+    """Test that a malformed --group-by is reported as an error."""
+    manifests = tmp_path / "manifests"
+    manifests.mkdir()
+    _write_app_manifests(manifests, 1)
+
+    result = runner.invoke(
+        app, ["--directory", str(manifests), "--output-format", "grouped", "--group-by", "a..b"]
+    )
+
+    assert result.exit_code == 1
+    assert "Invalid field" in result.stdout
+
+
+def test_batch_mode_hash_layout(tmp_path):
+    """Test fanning outputs out by hash with an index of their paths."""
+    manifests = tmp_path / "manifests"
+    manifests.mkdir()
+    _write_app_manifests(manifests, 3)
+    output = tmp_path / "output"
+
+    result = runner.invoke(
+        app,
+        ["--directory", str(manifests), "--output-dir", str(output), "--layout", "hash", "--json"],
+    )
+
+    assert result.exit_code == 0
+    index = json.loads((output / "index.json").read_text())
+    assert sorted(index) == ["app-0", "app-1", "app-2"]
+    outputs = {r["output"] for r in json.loads(result.stdout)["results"]}
+    assert outputs == {str(output / path) for path in index.values()}
+
+
+def test_batch_mode_output_bundle(tmp_path):
+    """Test writing every application into a compressed tar bundle."""
+    manifests = tmp_path / "manifests"
+    manifests.mkdir()
+    _write_app_manifests(manifests, 3)
+    target = tmp_path / "out.tar.gz"
+
+    result = runner.invoke(
+        app, ["--directory", str(manifests), "--output-bundle", str(target), "--json"]
+    )
+
+    assert result.exit_code == 0
+    assert json.loads(result.stdout)["output_bundle"] == str(target)
+    with tarfile.open(target) as tar:
+        assert tar.getnames() == ["app-0.json", "app-1.json", "app-2.json"]
+
+
+def test_output_bundle_excludes_output_format(tmp_path):
+    """Test that --output-bundle cannot be combined with an aggregate format."""
+    result = runner.invoke(
+        app,
+        [
+            "--directory", str(tmp_path), "--output-bundle", str(tmp_path / "out.tar"),
+            "--output-format", "ndjson", "--output-file", str(tmp_path / "a.ndjson"),
+        ],
+    )
+
+    assert result.exit_code == 1
+    assert "--output-bundle" in result.stdout
+
+
+def test_batch_mode_output_sqlite(tmp_path):
+    """Test upserting every application into a SQLite database."""
+    manifests = tmp_path / "manifests"
+    manifests.mkdir()
+    _write_app_manifests(manifests, 3)
+    db = tmp_path / "apps.db"
+
+    for _ in range(2):
+        result = runner.invoke(
+            app, ["--directory", str(manifests), "--output-sqlite", str(db), "--json"]
+        )
+        assert result.exit_code == 0
+
+    summary = json.loads(result.stdout)["summary"]
+    assert (summary["written"], summary["unchanged"]) == (0, 3)
+    with sqlite3.connect(db) as connection:
+        assert connection.execute("SELECT count(*) FROM applications").fetchone() == (3,)
+
+
+def test_query_output_directory(tmp_path):
+    """Test querying a parsed output directory, before and after a change."""
+    manifests = tmp_path / "manifests"
+    manifests.mkdir()
+    _write_app_manifests(manifests, 3)
+    output = tmp_path / "output"
+    runner.invoke(app, ["--directory", str(manifests), "--output-dir", str(output), "-q"])
+
+    result = runner.invoke(app, ["query", "-o", str(output), "name=app-1 and namespace=default"])
+
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [r["metadata"]["name"] for r in records] == ["app-1"]
+
+    result = runner.invoke(app, ["query", "-o", str(output), "name=app-*", "--paths"])
+    assert result.stdout.splitlines() == [str(output / f"app-{i}.json") for i in range(3)]
+
+
+def test_query_invalid_expression(tmp_path):
+    """Test that a malformed query is reported as an error."""
+    result = runner.invoke(app, ["query", "-o", str(tmp_path), "a=1 or b=2"])
+
+    assert result.exit_code == 1
+    assert "Invalid query" in result.stdout
+
+
+def test_batch_mode_plan(tmp_path):
+    """Test that --plan reports changes without touching the output directory."""
+    manifests = tmp_path / "manifests"
+    manifests.mkdir()
+    _write_app_manifests(manifests, 2)
+    output = tmp_path / "output"
+    runner.invoke(app, ["--directory", str(manifests), "--output-dir", str(output), "-q"])
+    (manifests / "app-1.yaml").unlink()
+    before = sorted(p.name for p in output.iterdir())
+
+    result = runner.invoke(
+        app, ["--directory", str(manifests), "--output-dir", str(output), "--plan", "--json"]
+    )
+
+    assert result.exit_code == 0
+    plan = json.loads(result.stdout)["plan"]
+    assert plan["counts"] == {"create": 0, "change": 0, "delete": 1, "unchanged": 1}
+    assert plan["changes"][0]["application_name"] == "app-1"
+    assert sorted(p.name for p in output.iterdir()) == before
+
+    result = runner.invoke(
+        app, ["--directory", str(manifests), "--output-dir", str(output), "--plan"]
+    )
+    assert "Plan: 0 to create, 0 to change, 1 to delete, 1 unchanged" in result.stdout
+
+
+def test_plan_requires_directory(tmp_path):
+    """Test that --plan is rejected in single file mode."""
+    manifest = tmp_path / "app.yaml"
+    manifest.write_text("kind: Application\n")
+
+    result = runner.invoke(app, ["--file", str(manifest), "--plan"])
+
+    assert result.exit_code == 1
+    assert "--plan" in result.stdout
+
+
+def test_plan_rejects_journal(tmp_path):
+    """Test that --plan cannot record its results in a journal."""
+    result = runner.invoke(app, [
+        "--directory", str(tmp_path), "--plan", "--journal", str(tmp_path / "run.journal")
+    ])
+
+    assert result.exit_code == 1
+    assert "cannot be combined with --journal" in " ".join(result.stdout.split())
+
+
+@pytest.mark.parametrize(
+    "option", [["--journal", "run.journal"], ["--journal", "run.journal", "--resume"],
+               ["--retry-failed", "run.journal"]]
+)
+def test_validate_only_rejects_journal(tmp_path, option):
+    """Test that --validate-only cannot record, resume or retry a journal."""
+    (tmp_path / "run.journal").write_text("")
+    option = [str(tmp_path / arg) if arg == "run.journal" else arg for arg in option]
+
+    result = runner.invoke(app, ["--directory", str(tmp_path), "--validate-only", *option])
+
+    assert result.exit_code == 1
+    assert "cannot be combined with --journal" in " ".join(result.stdout.split())
+
+
+def test_batch_mode_validate_only(tmp_path):
+    """Test that --validate-only reports per-file status and writes nothing."""
+    manifests = tmp_path / "manifests"
+    manifests.mkdir()
+    _write_app_manifests(manifests, 2)
+    (manifests / "broken.yaml").write_text("kind: Application\n")
+    output = tmp_path / "output"
+
+    result = runner.invoke(
+        app,
+        ["--directory", str(manifests), "--output-dir", str(output), "--validate-only", "--json"],
+    )
+
+    assert result.exit_code == 1
+    data = json.loads(result.stdout)
+    assert data["output_dir"] is None
+    assert data["summary"]["successful"] == 2
+    assert [r["status"] for r in data["results"]] == ["success", "success", "failed"]
+    assert all(r["output"] is None for r in data["results"])
+    assert not output.exists()
+
+
+def test_single_file_validate_only(tmp_path):
+    """Test validating one manifest without writing its output."""
+    manifests = tmp_path / "manifests"
+    manifests.mkdir()
+    _write_app_manifests(manifests, 1)
+    output = tmp_path / "output"
+
+    result = runner.invoke(
+        app,
+        ["--file", str(manifests / "app-0.yaml"), "--output-dir", str(output), "--validate-only"],
+    )
+
+    assert result.exit_code == 0
+    assert "app-0" in result.stdout
+    assert not output.exists()
+
+
+def test_batch_mode_json_stream(tmp_path):
+    """Test NDJSON result records followed by a summary record."""
+    manifests = tmp_path / "manifests"
+    manifests.mkdir()
+    _write_app_manifests(manifests, 2)
+    (manifests / "broken.yaml").write_text("kind: Application\n")
+
+    result = runner.invoke(
+        app,
+        ["--directory", str(manifests), "--output-dir", str(tmp_path / "out"), "--json-stream"],
+    )
+
+    assert result.exit_code == 1
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [r["type"] for r in records] == ["result", "result", "result", "summary"]
+    assert sorted(r["status"] for r in records[:3]) == ["failed", "success", "success"]
+    assert records[-1]["summary"]["total"] == 3
+    assert "results" not in records[-1]
+
+    # The stream doubles as a --retry-failed input
+    stream = tmp_path / "stream.ndjson"
+    stream.write_text(result.stdout)
+    result = runner.invoke(
+        app,
+        [
+            "--directory", str(manifests), "--output-dir", str(tmp_path / "out"),
+            "--retry-failed", str(stream), "--json-stream",
+        ],
+    )
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [r["file"] for r in records[:-1]] == [str(manifests / "broken.yaml")]
+
+
+def test_json_stream_resume_includes_journaled_results(tmp_path):
+    """Test that a resumed stream replays journaled results and counts them."""
+    manifests = tmp_path / "manifests"
+    manifests.mkdir()
+    _write_app_manifests(manifests, 2)
+    journal = tmp_path / "run.jsonl"
+    args = ["--directory", str(manifests), "--output-dir", str(tmp_path / "out")]
+    runner.invoke(app, [*args, "--journal", str(journal), "-q"])
+    _write_app_manifests(manifests, 3)
+
+    result = runner.invoke(app, [*args, "--journal", str(journal), "--resume", "--json-stream"])
+
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [r["type"] for r in records] == ["result"] * 3 + ["summary"]
+    assert records[-1]["summary"]["successful"] == 3
+
+
+def test_low_memory_json_matches_default(tmp_path):
+    """Test that --low-memory reports the same results as a default run."""
+    manifests = tmp_path / "manifests"
+    manifests.mkdir()
+    _write_app_manifests(manifests, 3)
+    (manifests / "broken.yaml").write_text("kind: Broken\n")
+    output_dir = tmp_path / "out"
+    args = ["--directory", str(manifests), "--output-dir", str(output_dir), "--json"]
+
+    default = runner.invoke(app, args)
+    # Start from an empty directory again, so both runs write every output
+    shutil.rmtree(output_dir)
+    low_memory = runner.invoke(app, [*args, "--low-memory"])
+
+    assert low_memory.exit_code == default.exit_code == 1
+    assert json.loads(low_memory.stdout) == json.loads(default.stdout)
+
+
+def test_low_memory_human_summary_lists_failures(tmp_path):
+    """Test that failed files are still detailed with --low-memory."""
+    manifests = tmp_path / "manifests"
+    manifests.mkdir()
+    _write_app_manifests(manifests, 1)
+    (manifests / "broken.yaml").write_text("kind: Broken\n")
+
+    result = runner.invoke(app, ["--directory", str(manifests), "--output-dir",
+                                 str(tmp_path / "out"), "--low-memory"])
+
+    assert result.exit_code == 1
+    assert "Failed Files:" in result.stdout
+    assert "broken.yaml" in result.stdout
+
+
+def test_batch_progress_lines_for_failures_only(tmp_path):
+    """Test that redirected batch output lists failures and a rate line, not successes."""
+    manifests = tmp_path / "manifests"
+    manifests.mkdir()
+    _write_app_manifests(manifests, 2)
+    (manifests / "broken.yaml").write_text("kind: Broken\n")
+    args = ["--directory", str(manifests), "--output-dir", str(tmp_path / "out")]
+
+    quiet_progress = runner.invoke(app, args)
+    verbose_progress = runner.invoke(app, [*args, "--verbose"])
+
+    assert "✗ broken.yaml" in quiet_progress.stdout
+    assert "app-0.yaml: app-0" not in quiet_progress.stdout
+    assert "Processed 3/3 files" in quiet_progress.stdout
+    assert "app-0.yaml: app-0" in verbose_progress.stdout
+
+
+def test_batch_failures_grouped_by_signature(tmp_path):
+    """Test that many identical failures are summarized by signature."""
+    manifests = tmp_path / "manifests"
+    manifests.mkdir()
+    for i in range(25):
+        (manifests / f"broken-{i:02d}.yaml").write_text("kind: Broken\n")
+    args = ["--directory", str(manifests), "--output-dir", str(tmp_path / "out")]
+
+    human = runner.invoke(app, args)
+    machine = runner.invoke(app, [*args, "--json"])
+
+    assert "Failures by Signature:" in human.stdout
+    assert "25 ×" in human.stdout
+    assert "Failed Files:" not in human.stdout
+    signatures = json.loads(machine.stdout)["error_signatures"]
+    assert signatures[0]["count"] == 25
+    assert len(signatures[0]["sample_files"]) == 3
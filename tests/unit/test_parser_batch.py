@@ -4,7 +4,10 @@ import pytest
 import tempfile
 from pathlib import Path
 
+from conftest import manifest_yaml, write_manifests
+
 from parser.batch import find_yaml_files, process_files_batch
+from parser.executor import ExecutionPlan
 from parser.models import BatchSummary
 
 
@@ -297,3 +300,80 @@ spec:
 
         assert output["destination"]["clusterName"] == "prod-cluster"
         assert output["metadata"]["labels"]["team"] == "platform"
+
+    def test_process_batch_validate_only(self, tmp_path):
+        """Test that validate-only runs report results without creating outputs."""
+        manifest = """
+apiVersion: argoproj.io/v1alpha1
+kind: Application
+metadata:
+  name: {name}
+spec:
+  source:
+    repoURL: https://github.com/org/repo.git
+    path: ./app
+  destination:
+    server: https://kubernetes.default.svc
+    namespace: default
+"""
+        files = []
+        for file_name, app_name in (("a.yaml", "app"), ("b.yaml", "app"), ("c.yaml", "other")):
+            path = tmp_path / file_name
+            path.write_text(manifest.format(name=app_name))
+            files.append(path)
+        (tmp_path / "broken.yaml").write_text("kind: Application\n")
+        files.append(tmp_path / "broken.yaml")
+        output_dir = tmp_path / "output"
+
+        summary = process_files_batch(files, output_dir, show_progress=False, validate_only=True)
+
+        assert not output_dir.exists()
+        assert [r.status for r in summary.results] == ["success", "failed", "success", "failed"]
+        assert summary.results[1].errors[0].error_type == "DUPLICATE_OUTPUT"
+        assert all(r.output_path is None for r in summary.results)
+        assert (summary.written, summary.unchanged) == (0, 0)
+
+    @pytest.mark.parametrize("executor", ["serial", "threads", "processes"])
+    def test_duplicate_names_resolved_in_input_order(self, tmp_path, executor):
+        """Test that the first manifest in input order wins a name with every executor."""
+        files = write_manifests(tmp_path, [f"app{i:02d}" for i in range(12)])
+        first = tmp_path / "a.yaml"
+        first.write_text(manifest_yaml("shared"))
+        # The largest file, which largest-first dispatch would start first
+        last = tmp_path / "z.yaml"
+        last.write_text(manifest_yaml("shared") + "#" * 200_000 + "\n")
+        files = [first, *files, last]
+        handled = []
+
+        summary = process_files_batch(
+            files,
+            tmp_path / "output",
+            show_progress=False,
+            result_callback=lambda result: handled.append(result.file_path),
+            plan=ExecutionPlan(executor=executor, workers=4, chunk_size=1),
+        )
+
+        assert summary.results[0].status == "success"
+        assert summary.results[-1].errors[0].error_type == "DUPLICATE_OUTPUT"
+        assert f"produced by {first}" in summary.results[-1].errors[0].message
+        assert handled == [str(path) for path in files]
+
+    def test_process_batch_without_keeping_results(self, tmp_path):
+        """Test that results can be consumed by callback instead of being kept."""
+        files = []
+        for i in range(3):
+            path = tmp_path / f"broken{i}.yaml"
+            path.write_text("kind: Application\n")
+            files.append(path)
+        streamed = []
+
+        summary = process_files_batch(
+            files, tmp_path / "output", show_progress=False, executor="serial",
+            result_callback=streamed.append, max_failures=2, keep_results=False,
+        )
+
+        assert [r.status for r in streamed] == ["failed", "failed"]
+        assert (summary.failed, summary.skipped) == (2, 1)
+        assert [(r.file_path, r.status) for r in summary.results] == [
+            (str(files[2]), "skipped")
+        ]
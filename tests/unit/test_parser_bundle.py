@@ -0,0 +1,140 @@
+"""Unit tests for tar bundle output and single-member extraction."""
+
+import gzip
+import io
+import json
+import tarfile
+
+import pytest
+from conftest import write_manifests
+
+from parser import bundle as bundle_module
+from parser.batch import process_files_batch
+from parser.bundle import OutputBundle, bundle_index_path, read_bundle_member
+from parser.executor import ExecutionPlan
+
+try:
+    import zstandard  # noqa: F401
+except ImportError:
+    zstd_installed = False
+else:
+    zstd_installed = True
+
+COMPRESSIONS = [
+    "out.tar",
+    "out.tar.gz",
+    pytest.param(
+        "out.tar.zst",
+        marks=pytest.mark.skipif(not zstd_installed, reason="zstandard not installed"),
+    ),
+]
+
+
+def _write_bundle(path, names):
+    with OutputBundle(path) as sink:
+        for name in names:
+            assert sink.claim(name, f"{name}.yaml") is None
+            sink.write(name, json.dumps({"name": name}).encode())
+    return sink
+
+
+def _decompress(path):
+    data = path.read_bytes()
+    if path.suffix == ".gz":
+        return gzip.decompress(data)
+    if path.suffix == ".zst":
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return data
+
+
+class TestOutputBundle:
+    """Tests for writing bundles."""
+
+    @pytest.mark.parametrize("file_name", COMPRESSIONS)
+    def test_members_in_write_order_with_fixed_metadata(self, tmp_path, file_name):
+        """Test that members keep write order with zero mtimes and are readable by tarfile."""
+        target = tmp_path / file_name
+
+        sink = _write_bundle(target, ["b", "c", "a"])
+
+        with tarfile.open(fileobj=io.BytesIO(_decompress(target))) as tar:
+            members = tar.getmembers()
+            assert [m.name for m in members] == ["b.json", "c.json", "a.json"]
+            assert {m.mtime for m in members} == {0}
+            assert json.load(tar.extractfile("b.json")) == {"name": "b"}
+        assert sink.written == 3
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            file_name, file_name + ".index.json"
+        ]
+
+    @pytest.mark.parametrize("file_name", COMPRESSIONS)
+    def test_read_single_member_across_frames(self, tmp_path, file_name, monkeypatch):
+        """Test extracting members that live in different compressed frames."""
+        monkeypatch.setattr(bundle_module, "BUNDLE_FRAME_BYTES", 2048)
+        target = tmp_path / file_name
+        names = [f"app{i:03d}" for i in range(50)]
+
+        _write_bundle(target, names)
+
+        index = json.loads(bundle_index_path(target).read_text())
+        assert len({entry["frame_offset"] for entry in index["members"].values()}) > 1
+        for name in ("app000", "app025", "app049"):
+            assert json.loads(read_bundle_member(target, name)) == {"name": name}
+        with pytest.raises(KeyError):
+            read_bundle_member(target, "missing")
+
+    @pytest.mark.parametrize("executor", ["threads", "processes"])
+    def test_identical_runs_identical_bundles(self, tmp_path, executor):
+        """Test that parallel batch runs produce the bundle of a serial run."""
+        files = write_manifests(tmp_path, [f"app{i:02d}" for i in range(40)])
+        serial = tmp_path / "serial.tar.gz"
+        parallel = tmp_path / "parallel.tar.gz"
+
+        process_files_batch(files, tmp_path, show_progress=False, sink=OutputBundle(serial))
+        process_files_batch(
+            files,
+            tmp_path,
+            show_progress=False,
+            sink=OutputBundle(parallel),
+            plan=ExecutionPlan(executor=executor, workers=4, chunk_size=3),
+        )
+
+        assert serial.read_bytes() == parallel.read_bytes()
+
+    def test_source_date_epoch(self, tmp_path, monkeypatch):
+        """Test that SOURCE_DATE_EPOCH sets member mtimes."""
+        monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+
+        _write_bundle(tmp_path / "out.tar", ["a"])
+
+        with tarfile.open(tmp_path / "out.tar") as tar:
+            assert tar.getmember("a.json").mtime == 1700000000
+
+    def test_failed_run_leaves_nothing(self, tmp_path):
+        """Test that an aborted run removes its temporary file and writes no bundle."""
+        with pytest.raises(RuntimeError):
+            with OutputBundle(tmp_path / "out.tar") as sink:
+                sink.write("a", b"{}")
+                raise RuntimeError("boom")
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_batch_members_match_file_output(self, tmp_path):
+        """Test that bundled members are byte-identical to per-file outputs."""
+        files = write_manifests(tmp_path, [f"app{i}" for i in range(4)])
+        target = tmp_path / "out.tar.gz"
+
+        summary = process_files_batch(
+            files, tmp_path / "unused", show_progress=False, sink=OutputBundle(target)
+        )
+        process_files_batch(files, tmp_path / "files", show_progress=False)
+
+        assert summary.successful == summary.written == 4
+        assert all(r.output_path == str(target) for r in summary.results)
+        assert not (tmp_path / "unused").exists()
+        for i in range(4):
+            assert read_bundle_member(target, f"app{i}") == (
+                tmp_path / "files" / f"app{i}.json"
+            ).read_bytes()
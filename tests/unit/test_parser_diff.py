@@ -0,0 +1,121 @@
+"""Unit tests for dry-run output plans."""
+
+import json
+
+from conftest import manifest_yaml, write_manifests
+
+from parser.batch import process_files_batch
+from parser.diff import FieldChange, OutputPlan, diff_fields
+from parser.layout import OutputLayout
+
+
+def test_diff_fields():
+    """Test field-level differences, including added and removed fields."""
+    old = json.dumps({"a": {"b": "1"}, "c": "x"}).encode()
+    new = json.dumps({"a": {"b": "2"}, "d": True}).encode()
+
+    assert diff_fields(old, new) == [
+        FieldChange(field="a.b", old="1", new="2"),
+        FieldChange(field="c", old="x", new=None),
+        FieldChange(field="d", old=None, new="true"),
+    ]
+    assert diff_fields(b"garbage", new)[0].field == "(document)"
+
+
+class TestOutputPlan:
+    """Tests for planning against an output directory."""
+
+    def test_plan_writes_nothing(self, tmp_path):
+        """Test that planning against a missing directory only plans creations."""
+        files = write_manifests(tmp_path, ["a", "b"])
+        output = tmp_path / "output"
+        plan = OutputPlan(output, [str(f) for f in files])
+
+        summary = process_files_batch(files, output, show_progress=False, sink=plan)
+
+        assert not output.exists()
+        assert summary.successful == 2
+        assert (summary.written, summary.unchanged) == (0, 0)
+        assert plan.counts() == {"create": 2, "change": 0, "delete": 0, "unchanged": 0}
+
+    def test_create_change_delete(self, tmp_path):
+        """Test a plan after manifests are edited, added and removed."""
+        manifests = tmp_path / "manifests"
+        manifests.mkdir()
+        output = tmp_path / "output"
+        files = write_manifests(manifests, ["a", "b", "c"])
+        process_files_batch(files, output, show_progress=False)
+        before = {p.name: p.read_bytes() for p in output.glob("*.json")}
+
+        files[2].unlink()
+        files = write_manifests(manifests, ["a", "b"]) + write_manifests(manifests, ["d"])
+        files[1].write_text(manifest_yaml("b", namespace="other"))
+        plan = OutputPlan(output, [str(f) for f in files])
+        process_files_batch(files, output, show_progress=False, sink=plan)
+
+        assert [(c.action, c.application_name) for c in plan.changes] == [
+            ("create", "d"), ("change", "b"), ("delete", "c")
+        ]
+        assert plan.changes[1].fields == [
+            FieldChange(field="destination.namespace", old="default", new="other")
+        ]
+        assert plan.counts()["unchanged"] == 1
+        assert {p.name: p.read_bytes() for p in output.glob("*.json")} == before
+
+    def test_failed_manifest_is_not_deleted(self, tmp_path):
+        """Test that an output whose manifest now fails is not planned for deletion."""
+        output = tmp_path / "output"
+        files = write_manifests(tmp_path, ["a"])
+        process_files_batch(files, output, show_progress=False)
+        files[0].write_text("kind: Broken\n")
+
+        plan = OutputPlan(output, [str(files[0])])
+        summary = process_files_batch(files, output, show_progress=False, sink=plan)
+
+        assert summary.failed == 1
+        assert plan.changes == []
+
+    def test_hash_layout(self, tmp_path):
+        """Test planning against a non-flat layout through its index."""
+        output = tmp_path / "output"
+        files = write_manifests(tmp_path, ["a", "b"])
+        process_files_batch(files, output, show_progress=False, layout=OutputLayout("hash"))
+        files[1].unlink()
+
+        plan = OutputPlan(output, [str(files[0])], OutputLayout("hash"))
+        process_files_batch(files[:1], output, show_progress=False, sink=plan)
+
+        assert [(c.action, c.application_name) for c in plan.changes] == [("delete", "b")]
+        assert plan.counts()["unchanged"] == 1
+
+    def test_moved_output_deletes_old_location(self, tmp_path):
+        """Test that an output a template layout moves is planned at both locations."""
+        output = tmp_path / "output"
+        layout = OutputLayout("{namespace}/{name}.json")
+        files = write_manifests(tmp_path, ["a"])
+        process_files_batch(files, output, show_progress=False, layout=layout)
+        files[0].write_text(manifest_yaml("a", namespace="other"))
+
+        plan = OutputPlan(output, [str(files[0])], layout)
+        process_files_batch(files, output, show_progress=False, sink=plan)
+
+        assert [(c.action, c.output_path) for c in plan.changes] == [
+            ("create", str(output / "other" / "a.json")),
+            ("delete", str(output / "default" / "a.json")),
+        ]
+
+    def test_claims_follow_the_ledger(self, tmp_path):
+        """Test that a name owned by a live manifest outside this run is a duplicate."""
+        output = tmp_path / "output"
+        owner = write_manifests(tmp_path, ["a"])
+        process_files_batch(owner, output, show_progress=False)
+        other = tmp_path / "other"
+        other.mkdir()
+        files = write_manifests(other, ["a"])
+
+        plan = OutputPlan(output, [str(f) for f in files])
+        summary = process_files_batch(files, output, show_progress=False, sink=plan)
+
+        assert summary.failed == 1
+        assert summary.results[0].errors[0].error_type == "DUPLICATE_OUTPUT"
+        assert plan.changes == []
@@ -0,0 +1,327 @@
+"""Unit tests for batch execution strategies."""
+
+import os
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import pytest
+from conftest import write_manifests
+
+from parser import batch as batch_module
+from parser.batch import process_files_batch
+from parser.core import parse_and_render
+from parser.executor import ExecutionPlan, gil_enabled, iter_job_results, schedule_chunks
+
+
+def _write_manifests(directory: Path, count: int) -> list[Path]:
+    """Create count valid manifests plus one invalid manifest."""
+    files = write_manifests(directory, [f"app{i:03d}" for i in range(count)])
+    invalid = directory / "invalid.yaml"
+    invalid.write_text("apiVersion: v1\nkind: Service\nmetadata:\n  name: svc\n")
+    files.append(invalid)
+    return sorted(files)
+
+
+def _path_name(path: Path) -> str:
+    """Picklable job used by the process executor tests."""
+    return path.name
+
+
+class TestIterJobResults:
+    """Tests for the generic job runner."""
+
+    @pytest.mark.parametrize("executor", ["serial", "threads", "processes"])
+    def test_every_file_yielded_once(self, executor):
+        """Test that each index is yielded exactly once with its own result."""
+        files = [Path(f"file{i}.yaml") for i in range(25)]
+        plan = ExecutionPlan(executor=executor, workers=4, chunk_size=3)
+
+        results = dict(iter_job_results(files, _path_name, plan))
+
+        assert sorted(results) == list(range(25))
+        assert all(results[i] == files[i].name for i in range(25))
+
+    def test_threads_run_on_worker_threads(self):
+        """Test that the thread executor does not run jobs on the calling thread."""
+        main_thread = threading.get_ident()
+        files = [Path(f"file{i}.yaml") for i in range(8)]
+        plan = ExecutionPlan(executor="threads", workers=2)
+
+        thread_ids = [
+            result
+            for _, result in iter_job_results(files, lambda _path: threading.get_ident(), plan)
+        ]
+
+        assert main_thread not in thread_ids
+
+    def test_gil_enabled_reports_bool(self):
+        """Test GIL detection on the running interpreter."""
+        assert isinstance(gil_enabled(), bool)
+
+
+class TestParallelBatch:
+    """Tests that parallel batch runs match serial runs."""
+
+    @pytest.mark.parametrize("executor", ["threads", "processes"])
+    def test_parallel_matches_serial(self, tmp_path, executor):
+        """Test that parallel executors produce the same summary and outputs as serial."""
+        files = _write_manifests(tmp_path, 30)
+        serial_dir = tmp_path / "serial"
+        parallel_dir = tmp_path / executor
+
+        serial = process_files_batch(files, serial_dir, show_progress=False)
+        parallel = process_files_batch(
+            files, parallel_dir, show_progress=False, executor=executor, max_workers=4
+        )
+
+        assert (parallel.total, parallel.successful, parallel.failed) == (31, 30, 1)
+        assert [r.file_path for r in parallel.results] == [str(f) for f in files]
+        assert [r.status for r in parallel.results] == [r.status for r in serial.results]
+        for path in serial_dir.iterdir():
+            assert (parallel_dir / path.name).read_bytes() == path.read_bytes()
+
+    def test_progress_callback_runs_on_calling_thread(self, tmp_path):
+        """Test that callbacks are invoked from the caller's thread only."""
+        files = _write_manifests(tmp_path, 10)
+        main_thread = threading.get_ident()
+        callback_threads = set()
+
+        process_files_batch(
+            files,
+            tmp_path / "output",
+            show_progress=False,
+            progress_callback=lambda _file, _status: callback_threads.add(threading.get_ident()),
+            executor="threads",
+            max_workers=4,
+        )
+
+        assert callback_threads == {main_thread}
+
+
+class TestScheduleChunks:
+    """Tests for size-aware task scheduling."""
+
+    def test_every_index_scheduled_once(self):
+        """Test that scheduling is a partition of the input."""
+        sizes = [(i * 7919) % 5000 for i in range(500)]
+
+        chunks = schedule_chunks(sizes, workers=4, max_chunk_size=64)
+
+        scheduled = [index for chunk in chunks for index in chunk]
+        assert sorted(scheduled) == list(range(500))
+
+    def test_largest_files_dispatched_first(self):
+        """Test that the most expensive files are in the first tasks."""
+        sizes = [1_000] * 100
+        sizes[42] = 5_000_000
+        sizes[97] = 3_000_000
+
+        chunks = schedule_chunks(sizes, workers=4, max_chunk_size=64)
+
+        assert chunks[0] == [42]
+        assert chunks[1] == [97]
+
+    def test_tail_tasks_are_small(self):
+        """Test that task cost shrinks towards the end of the run."""
+        sizes = [2_000] * 1000
+
+        chunks = schedule_chunks(sizes, workers=4, max_chunk_size=1000)
+
+        assert len(chunks[0]) > len(chunks[-2]) >= len(chunks[-1])
+        assert len(chunks[-2]) <= 2
+
+    def test_max_chunk_size_respected(self):
+        """Test that tasks never exceed the configured file count."""
+        chunks = schedule_chunks([0] * 100, workers=1, max_chunk_size=8)
+
+        assert max(len(chunk) for chunk in chunks) <= 8
+
+    def test_parallel_results_restored_to_input_order(self, tmp_path):
+        """Test that a large file dispatched first is still reported in input order."""
+        files = _write_manifests(tmp_path, 12)
+        big = files[-1]
+        big.write_text(big.read_text() + "# padding\n" * 20000)
+
+        summary = process_files_batch(
+            files, tmp_path / "output", show_progress=False, executor="threads", max_workers=3
+        )
+
+        assert [r.file_path for r in summary.results] == [str(f) for f in files]
+
+
+def _slow_name(path: Path) -> str:
+    """Picklable job that takes long enough for cancellation to matter."""
+    time.sleep(0.01)
+    return path.name
+
+
+class TestCancellation:
+    """Tests for cooperative cancellation and priority scheduling."""
+
+    @pytest.mark.parametrize("executor", ["serial", "threads", "processes"])
+    def test_cancel_stops_dispatch(self, executor):
+        """Test that setting the cancel event stops the run well before the end."""
+        files = [Path(f"file{i:03d}.yaml") for i in range(200)]
+        plan = ExecutionPlan(executor=executor, workers=2, chunk_size=4)
+        cancel = threading.Event()
+        seen = []
+
+        for index, _ in iter_job_results(files, _slow_name, plan, cancel):
+            seen.append(index)
+            if len(seen) == 5:
+                cancel.set()
+
+        assert 5 <= len(seen) < 50
+        assert len(set(seen)) == len(seen)
+
+    def test_stopping_iteration_shuts_down_cleanly(self):
+        """Test that abandoning the generator does not run the remaining files."""
+        files = [Path(f"file{i:03d}.yaml") for i in range(200)]
+        started = []
+
+        def job(path):
+            started.append(path)
+            time.sleep(0.005)
+            return path.name
+
+        results = iter_job_results(files, job, ExecutionPlan(executor="threads", workers=2))
+        next(results)
+        results.close()
+
+        assert len(started) < 20
+
+    @pytest.mark.parametrize("executor", ["serial", "threads"])
+    def test_priority_files_run_first(self, executor):
+        """Test that priority files are dispatched before all others."""
+        files = [Path(f"file{i:03d}.yaml") for i in range(20)]
+        plan = ExecutionPlan(executor=executor, workers=1)
+
+        order = [index for index, _ in iter_job_results(files, _path_name, plan, priority={7, 13})]
+
+        assert order[:2] == [7, 13]
+
+    def test_schedule_chunks_priority(self):
+        """Test that priority outranks size when scheduling."""
+        sizes = [100] * 10
+        sizes[0] = 10_000
+
+        chunks = schedule_chunks(sizes, workers=2, max_chunk_size=1, priority={5})
+
+        assert chunks[0] == [5]
+        assert chunks[1] == [0]
+
+    def test_schedule_chunks_input_order(self):
+        """Test that without largest_first files are dispatched in input order."""
+        sizes = [10, 10_000, 100, 5_000, 1]
+
+        chunks = schedule_chunks(sizes, workers=2, max_chunk_size=1, largest_first=False)
+
+        assert [index for chunk in chunks for index in chunk] == [0, 1, 2, 3, 4]
+
+
+class TestMaxFailures:
+    """Tests for fail-fast batch runs."""
+
+    def test_stops_after_max_failures(self, tmp_path):
+        """Test that the run stops and reports unprocessed files as skipped."""
+        files = []
+        for i in range(10):
+            path = tmp_path / f"broken{i}.yaml"
+            path.write_text("apiVersion: v1\nkind: Service\n")
+            files.append(path)
+
+        summary = process_files_batch(
+            files, tmp_path / "output", show_progress=False, executor="serial", max_failures=2
+        )
+
+        assert summary.stopped_early
+        assert (summary.total, summary.failed, summary.skipped) == (10, 2, 8)
+        assert [r.file_path for r in summary.results] == [str(f) for f in files]
+
+    def test_failed_first_finds_failure_immediately(self, tmp_path):
+        """Test that scheduling a known failure first makes fail-fast stop at once."""
+        files = _write_manifests(tmp_path, 20)
+        invalid = str(tmp_path / "invalid.yaml")
+
+        summary = process_files_batch(
+            files,
+            tmp_path / "output",
+            show_progress=False,
+            executor="serial",
+            max_failures=1,
+            failed_first={invalid},
+        )
+
+        assert summary.failed == 1
+        assert summary.successful == 0
+        assert not list((tmp_path / "output").glob("*.json"))
+
+    def test_no_limit_processes_everything(self, tmp_path):
+        """Test that runs without a limit are not marked as stopped early."""
+        files = _write_manifests(tmp_path, 3)
+
+        summary = process_files_batch(files, tmp_path / "output", show_progress=False)
+
+        assert not summary.stopped_early
+        assert summary.skipped == 0
+
+
+def _exit_on_crash(path: Path) -> str:
+    """Picklable job whose worker process dies on crash.yaml, as if OOM-killed."""
+    if path.name == "crash.yaml":
+        os._exit(1)
+    return path.name
+
+
+def _render_or_exit(path: Path, **kwargs):
+    """Picklable parse_and_render that kills its worker on crash.yaml."""
+    if path.name == "crash.yaml":
+        os._exit(1)
+    return parse_and_render(path, **kwargs)
+
+
+class TestWorkerLoss:
+    """Tests for process workers that die mid-run."""
+
+    def test_lost_files_reported(self):
+        """Test that files of lost chunks are yielded through on_worker_lost."""
+        files = [Path(f"file{i:02d}.yaml") for i in range(20)]
+        files[5] = Path("crash.yaml")
+        plan = ExecutionPlan(executor="processes", workers=2, chunk_size=2)
+
+        results = dict(
+            iter_job_results(
+                files, _exit_on_crash, plan, on_worker_lost=lambda path, _e: f"lost:{path.name}"
+            )
+        )
+
+        assert results[5] == "lost:crash.yaml"
+        assert all(results[i] in (files[i].name, f"lost:{files[i].name}") for i in results)
+
+    def test_without_handler_raises(self):
+        """Test that a broken pool is raised when the caller does not handle it."""
+        files = [Path("crash.yaml"), Path("other.yaml")]
+        plan = ExecutionPlan(executor="processes", workers=2, chunk_size=1)
+
+        with pytest.raises(BrokenProcessPool):
+            list(iter_job_results(files, _exit_on_crash, plan))
+
+    def test_batch_stops_with_summary(self, tmp_path, monkeypatch):
+        """Test that a batch losing a worker fails the lost files and skips the rest."""
+        files = _write_manifests(tmp_path, 20)
+        crash = tmp_path / "crash.yaml"
+        crash.write_text("kind: Application\n")
+        files.insert(3, crash)
+        monkeypatch.setattr(batch_module, "parse_and_render", _render_or_exit)
+
+        summary = process_files_batch(
+            files, tmp_path / "output", show_progress=False, executor="processes",
+            max_workers=2,
+        )
+
+        assert summary.stopped_early
+        assert summary.total == summary.successful + summary.failed + summary.skipped == 22
+        lost = [r for r in summary.results if r.errors and r.errors[0].error_type == "WORKER_LOST"]
+        assert str(crash) in [r.file_path for r in lost]
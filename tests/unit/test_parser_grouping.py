@@ -0,0 +1,176 @@
+"""Unit tests for output record fields and grouped config.json output."""
+
+import json
+
+import pytest
+from conftest import output_record, write_manifests
+
+from parser.batch import process_files_batch
+from parser.fields import field_value, parse_field, safe_path_component
+from parser.grouping import GroupedConfigOutput
+from parser.output import OutputConflictError
+
+
+class TestFields:
+    """Tests for field specifications and lookups."""
+
+    def test_aliases_and_prefixes(self):
+        """Test alias, label:, annotation: and dotted path specifications."""
+        assert parse_field("cluster") == ("destination", "clusterName")
+        assert parse_field("label:app.kubernetes.io/part-of") == (
+            "metadata", "labels", "app.kubernetes.io/part-of"
+        )
+        assert parse_field("annotation:owner") == ("metadata", "annotations", "owner")
+        assert parse_field("source.revision") == ("source", "revision")
+
+    @pytest.mark.parametrize("spec", ["", "a..b", "label:", "tag:x"])
+    def test_invalid_specifications(self, spec):
+        """Test that malformed specifications are rejected."""
+        with pytest.raises(ValueError, match="Invalid field"):
+            parse_field(spec)
+
+    def test_field_value(self):
+        """Test lookups of present, missing, empty and boolean values."""
+        record = {"metadata": {"name": "a", "labels": {"team": ""}}, "enableSyncPolicy": False}
+
+        assert field_value(record, ("metadata", "name")) == "a"
+        assert field_value(record, ("metadata", "labels", "team")) is None
+        assert field_value(record, ("metadata", "name", "x")) is None
+        assert field_value(record, ("enableSyncPolicy",)) == "false"
+
+    def test_safe_path_component(self):
+        """Test that separators and leading dots cannot escape the output directory."""
+        assert safe_path_component("../etc/passwd") == "_etc_passwd"
+        assert safe_path_component("prod-eu.1") == "prod-eu.1"
+        assert safe_path_component("...") == "_"
+
+
+class TestGroupedConfigOutput:
+    """Tests for grouping outputs into config.json arrays."""
+
+    def test_groups_sorted_by_name(self, tmp_path):
+        """Test that each group's array holds its records sorted by name."""
+        with GroupedConfigOutput(tmp_path, "cluster") as sink:
+            sink.write("b", output_record("b"))
+            sink.write("c", output_record("c", cluster="dev"))
+            sink.write("a", output_record("a"))
+
+        prod = json.loads((tmp_path / "prod" / "config.json").read_text())
+        dev = json.loads((tmp_path / "dev" / "config.json").read_text())
+        assert [r["metadata"]["name"] for r in prod] == ["a", "b"]
+        assert [r["metadata"]["name"] for r in dev] == ["c"]
+        assert sink.written == 2
+        assert sorted(p.name for p in tmp_path.iterdir()) == [".argocd-parse.groups", "dev", "prod"]
+
+    def test_more_groups_than_open_files(self, tmp_path):
+        """Test that evicted part files are reopened and appended to."""
+        with GroupedConfigOutput(tmp_path, "cluster", max_open_files=1) as sink:
+            for i in range(12):
+                sink.write(f"app{i}", output_record(f"app{i}", cluster=f"c{i % 3}"))
+                assert len(sink._handles) <= 1
+
+        for group in range(3):
+            records = json.loads((tmp_path / f"c{group}" / "config.json").read_text())
+            assert len(records) == 4
+
+    def test_missing_value_goes_to_ungrouped(self, tmp_path):
+        """Test that records without the grouping field are kept together."""
+        with GroupedConfigOutput(tmp_path, "team") as sink:
+            sink.write("a", output_record("a", team="payments"))
+            sink.write("b", output_record("b"))
+
+        assert (tmp_path / "payments" / "config.json").exists()
+        assert (tmp_path / "_ungrouped" / "config.json").exists()
+
+    def test_failed_run_writes_nothing(self, tmp_path):
+        """Test that an aborted run leaves neither configs nor part files."""
+        with pytest.raises(RuntimeError):
+            with GroupedConfigOutput(tmp_path, "cluster") as sink:
+                sink.write("a", output_record("a"))
+                raise RuntimeError("boom")
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_invalid_options(self, tmp_path):
+        """Test that bad grouping options are rejected up front."""
+        with pytest.raises(ValueError, match="Invalid field"):
+            GroupedConfigOutput(tmp_path, "label:")
+        with pytest.raises(ValueError, match="max_open_files"):
+            GroupedConfigOutput(tmp_path, "cluster", max_open_files=0)
+
+    def test_batch_rerun_is_unchanged(self, tmp_path):
+        """Test grouping a parallel batch and rerunning it without changes."""
+        manifests = tmp_path / "manifests"
+        manifests.mkdir()
+        files = []
+        for i in range(6):
+            files += write_manifests(manifests, [f"app{i}"], cluster="prod", team=f"team{i % 2}")
+        output = tmp_path / "output"
+
+        def run():
+            return process_files_batch(
+                files, output, show_progress=False, executor="threads", max_workers=2,
+                sink=GroupedConfigOutput(output, "team"),
+            )
+
+        first = run()
+        before = (output / "team0" / "config.json").read_bytes()
+        second = run()
+
+        assert first.successful == 6 and first.written == 2
+        assert second.written == 0 and second.unchanged == 2
+        assert (output / "team0" / "config.json").read_bytes() == before
+        assert [r["metadata"]["name"] for r in json.loads(before)] == ["app0", "app2", "app4"]
+        assert all(
+            r.output_path == str(output / f"team{i % 2}" / "config.json")
+            for i, r in enumerate(sorted(second.results, key=lambda r: r.file_path))
+        )
+
+    def test_duplicate_name_across_groups(self, tmp_path):
+        """Test that one application name cannot appear in two groups."""
+        with GroupedConfigOutput(tmp_path, "cluster") as sink:
+            assert sink.claim("a", "one.yaml") is None
+            assert sink.claim("a", "two.yaml") == "one.yaml"
+
+    def test_sanitized_group_collision(self, tmp_path):
+        """Test that group values sanitized into one directory are not merged."""
+        with GroupedConfigOutput(tmp_path, "team") as sink:
+            sink.write("a", output_record("a", team="prod east"))
+            with pytest.raises(OutputConflictError, match="'prod/east' would share prod_east"):
+                sink.write("b", output_record("b", team="prod/east"))
+            sink.write("c", output_record("c"))
+            with pytest.raises(OutputConflictError, match="with group \\(no value\\)"):
+                sink.write("d", output_record("d", team="_ungrouped"))
+
+        records = json.loads((tmp_path / "prod_east" / "config.json").read_text())
+        assert [r["metadata"]["name"] for r in records] == ["a"]
+
+    def test_batch_reports_group_collision(self, tmp_path):
+        """Test that a refused group fails its manifest instead of the run."""
+        manifests = tmp_path / "manifests"
+        manifests.mkdir()
+        files = write_manifests(manifests, ["a"], team="prod east")
+        files += write_manifests(manifests, ["b"], team="prod/east")
+        output = tmp_path / "output"
+
+        summary = process_files_batch(
+            files, output, show_progress=False, sink=GroupedConfigOutput(output, "team")
+        )
+
+        assert [r.status for r in summary.results] == ["success", "failed"]
+        assert summary.results[1].errors[0].error_type == "DUPLICATE_OUTPUT"
+
+    def test_stale_groups_removed(self, tmp_path):
+        """Test that configs of groups a rerun no longer produces are removed."""
+        with GroupedConfigOutput(tmp_path, "cluster") as sink:
+            sink.write("a", output_record("a"))
+            sink.write("b", output_record("b", cluster="dev"))
+            sink.write("c", output_record("c", cluster="qa"))
+        (tmp_path / "qa" / "notes.txt").write_text("kept")
+
+        with GroupedConfigOutput(tmp_path, "cluster") as sink:
+            sink.write("a", output_record("a"))
+
+        assert (tmp_path / "prod" / "config.json").exists()
+        assert not (tmp_path / "dev").exists()
+        assert sorted(p.name for p in (tmp_path / "qa").iterdir()) == ["notes.txt"]
@@ -0,0 +1,102 @@
+"""Unit tests for the checkpoint journal."""
+
+import json
+
+import pytest
+
+from parser.journal import ResultJournal, load_failed_files, load_journal
+from parser.models import ParseResult, ValidationError
+
+
+def _success(file_path: str) -> ParseResult:
+    return ParseResult(file_path=file_path, status="success",
+                       output_path=f"/out/{file_path}.json", application_name=file_path)
+
+
+def _failure(file_path: str) -> ParseResult:
+    return ParseResult(
+        file_path=file_path,
+        status="failed",
+        errors=[ValidationError(error_type="VALIDATION_ERROR", field="spec", message="boom")],
+    )
+
+
+class TestResultJournal:
+    """Tests for writing and reading the journal."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that appended results are loaded back unchanged."""
+        path = tmp_path / "run.jsonl"
+        with ResultJournal(path) as journal:
+            journal.append(_success("a.yaml"))
+            journal.append(_failure("b.yaml"))
+
+        loaded = load_journal(path)
+
+        assert loaded == {"a.yaml": _success("a.yaml"), "b.yaml": _failure("b.yaml")}
+
+    def test_records_visible_before_close(self, tmp_path):
+        """Test that each record reaches the file immediately (crash safety)."""
+        path = tmp_path / "run.jsonl"
+        journal = ResultJournal(path, fsync_interval=3600, fsync_every=10_000)
+        journal.append(_success("a.yaml"))
+
+        assert list(load_journal(path)) == ["a.yaml"]
+        journal.close()
+
+    def test_appends_across_runs_latest_wins(self, tmp_path):
+        """Test that a later run's result for the same file supersedes the earlier one."""
+        path = tmp_path / "run.jsonl"
+        with ResultJournal(path) as journal:
+            journal.append(_failure("a.yaml"))
+        with ResultJournal(path) as journal:
+            journal.append(_success("a.yaml"))
+
+        assert load_journal(path)["a.yaml"].status == "success"
+        assert len(path.read_text().splitlines()) == 2
+
+    def test_torn_final_line_ignored(self, tmp_path):
+        """Test that a partial line left by a crash is skipped."""
+        path = tmp_path / "run.jsonl"
+        with ResultJournal(path) as journal:
+            journal.append(_success("a.yaml"))
+        with open(path, "a") as f:
+            f.write('{"file": "b.yaml", "sta')
+
+        assert list(load_journal(path)) == ["a.yaml"]
+
+    def test_missing_journal_is_empty(self, tmp_path):
+        """Test that resuming without a journal starts from scratch."""
+        assert load_journal(tmp_path / "missing.jsonl") == {}
+
+
+class TestLoadFailedFiles:
+    """Tests for selecting files to retry."""
+
+    def test_from_journal(self, tmp_path):
+        """Test failures are read from a journal."""
+        path = tmp_path / "run.jsonl"
+        with ResultJournal(path) as journal:
+            journal.append(_success("a.yaml"))
+            journal.append(_failure("b.yaml"))
+
+        assert load_failed_files(path) == {"b.yaml"}
+
+    def test_from_summary(self, tmp_path):
+        """Test failures are read from a --json summary."""
+        path = tmp_path / "summary.json"
+        path.write_text(json.dumps({"results": [
+            {"file": "a.yaml", "status": "success", "errors": []},
+            {"file": "b.yaml", "status": "failed",
+             "errors": [{"type": "YAML_DOCUMENT_ERROR", "field": None, "message": "x"}]},
+        ]}))
+
+        assert load_failed_files(path) == {"b.yaml"}
+
+    def test_unrecognized_file(self, tmp_path):
+        """Test that unrelated files are rejected."""
+        path = tmp_path / "notes.txt"
+        path.write_text("hello\n")
+
+        with pytest.raises(ValueError, match="Not a journal"):
+            load_failed_files(path)
@@ -0,0 +1,133 @@
+"""Unit tests for output directory layouts and the name index."""
+
+import json
+
+import pytest
+from conftest import output_record
+
+from parser.layout import INDEX_FILE_NAME, OutputLayout
+from parser.output import OutputDirectory
+
+
+class TestOutputLayout:
+    """Tests for mapping outputs to relative paths."""
+
+    def test_flat(self):
+        """Test the default flat layout."""
+        layout = OutputLayout()
+
+        assert layout.is_flat
+        assert layout.relative_path("app", b"{}") == "app.json"
+
+    def test_hash_is_stable_two_level_fan_out(self):
+        """Test that hashed paths are stable and use two 2-hex-digit levels."""
+        layout = OutputLayout("hash")
+
+        path = layout.relative_path("app", b"")
+        first, second, file_name = path.split("/")
+        assert len(first) == len(second) == 2
+        assert file_name == "app.json"
+        assert OutputLayout("hash").relative_path("app", b"") == path
+        assert layout.relative_path("other", b"") != path
+
+    def test_template_fields(self):
+        """Test placeholders for aliases, labels and missing fields."""
+        layout = OutputLayout("{cluster}/{label:team}/{project}/{name}.json")
+
+        assert (
+            layout.relative_path("app", output_record("app", cluster="eu/west", team="payments"))
+            == "eu_west/payments/_/app.json"
+        )
+
+    @pytest.mark.parametrize(
+        "spec", ["{cluster}.json", "/{name}.json", "a/../{name}.json", "{name.json", "{}/{name}"]
+    )
+    def test_invalid_templates(self, spec):
+        """Test that unsafe or malformed templates are rejected."""
+        with pytest.raises(ValueError, match="Invalid"):
+            OutputLayout(spec)
+
+
+class TestOutputDirectoryLayout:
+    """Tests for writing non-flat layouts and their index."""
+
+    def test_writes_index(self, tmp_path):
+        """Test that outputs land at their layout path and are indexed."""
+        layout = OutputLayout("{cluster}/{namespace}/{name}.json")
+
+        with OutputDirectory(tmp_path, layout=layout) as outputs:
+            outputs.claim("a", "a.yaml")
+            path = outputs.write("a", output_record("a", namespace="web"))
+
+        assert path == tmp_path / "prod" / "web" / "a.json"
+        assert json.loads((tmp_path / INDEX_FILE_NAME).read_text()) == {
+            "a": "prod/web/a.json"
+        }
+
+    def test_flat_layout_writes_no_index(self, tmp_path):
+        """Test that the flat layout needs no index."""
+        with OutputDirectory(tmp_path) as outputs:
+            outputs.claim("a", "a.yaml")
+            outputs.write("a", output_record("a", namespace="web"))
+
+        assert not (tmp_path / INDEX_FILE_NAME).exists()
+
+    def test_moved_output_replaces_old_file(self, tmp_path):
+        """Test that a changed cluster moves the file and updates the index."""
+        source = tmp_path / "a.yaml"
+        source.touch()
+        output = tmp_path / "output"
+        layout = OutputLayout("{cluster}/{name}.json")
+        for cluster in ("prod", "dev"):
+            with OutputDirectory(output, [str(source)], layout=layout) as outputs:
+                outputs.claim("a", str(source))
+                outputs.write("a", output_record("a", cluster=cluster))
+
+        assert not (output / "prod" / "a.json").exists()
+        assert (output / "dev" / "a.json").exists()
+        assert json.loads((output / INDEX_FILE_NAME).read_text()) == {"a": "dev/a.json"}
+
+    def test_index_keeps_other_runs_entries(self, tmp_path):
+        """Test that entries claimed by other manifests survive a partial run."""
+        for name in ("a", "b"):
+            source = tmp_path / f"{name}.yaml"
+            source.touch()
+            with OutputDirectory(
+                tmp_path / "output", [str(source)], layout=OutputLayout("hash")
+            ) as outputs:
+                outputs.claim(name, str(source))
+                outputs.write(name, output_record(name))
+
+        index = json.loads((tmp_path / "output" / INDEX_FILE_NAME).read_text())
+        assert sorted(index) == ["a", "b"]
+        assert all((tmp_path / "output" / path).is_file() for path in index.values())
+
+    def test_sanitized_names_collide(self, tmp_path):
+        """Test that names a template sanitizes alike cannot share a file."""
+        layout = OutputLayout("{cluster}/{name}.json")
+        first = tmp_path / "first.yaml"
+        first.touch()
+
+        with OutputDirectory(tmp_path / "output", [str(first)], layout=layout) as outputs:
+            assert outputs.claim("a b", str(first)) is None
+            assert outputs.claim("a_b", "/m/second.yaml") == str(first)
+            outputs.write("a b", output_record("a b"))
+
+        # The owner is remembered across runs through the claims ledger
+        with OutputDirectory(tmp_path / "output", ["/m/second.yaml"], layout=layout) as outputs:
+            assert outputs.claim("a_b", "/m/second.yaml") == str(first)
+
+        first.unlink()
+        with OutputDirectory(tmp_path / "output", ["/m/second.yaml"], layout=layout) as outputs:
+            assert outputs.claim("a_b", "/m/second.yaml") is None
+            outputs.write("a_b", output_record("a_b"))
+        assert json.loads((tmp_path / "output" / INDEX_FILE_NAME).read_text()) == {
+            "a_b": "prod/a_b.json"
+        }
+
+    def test_flat_names_are_not_sanitized(self, tmp_path):
+        """Test that flat and hash layouts keep similar names apart."""
+        for layout in (OutputLayout(), OutputLayout("hash")):
+            with OutputDirectory(tmp_path / layout.spec, layout=layout) as outputs:
+                assert outputs.claim("a b", "/m/first.yaml") is None
+                assert outputs.claim("a_b", "/m/second.yaml") is None
@@ -0,0 +1,155 @@
+"""Unit tests for memory monitoring and memory-capped concurrency."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from parser import memory
+from parser.batch import process_files_batch
+from parser.executor import ExecutionPlan, iter_job_results
+from parser.memory import MemoryGovernor, read_rss, total_rss
+
+linux_only = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="needs /proc")
+
+
+class TestReadRss:
+    """Tests for /proc sampling."""
+
+    @linux_only
+    def test_read_own_rss(self):
+        """Test that this process reports a plausible RSS."""
+        rss = read_rss()
+        assert rss is not None
+        assert 1024**2 < rss < 64 * 1024**3
+
+    def test_missing_process(self):
+        """Test that an unknown PID yields None."""
+        assert read_rss(2**31 - 1) is None
+
+    def test_total_sums_children(self, monkeypatch):
+        """Test that worker memory is added to this process's memory."""
+        sizes = {"self": 100, 11: 20, 12: None}
+        monkeypatch.setattr(memory, "read_rss", lambda pid="self": sizes[pid])
+        monkeypatch.setattr(memory, "child_pids", lambda: [11, 12])
+
+        assert total_rss() == 120
+
+
+class TestMemoryGovernor:
+    """Tests for the adaptive concurrency policy."""
+
+    def _governor(self, monkeypatch, readings, max_concurrency=8):
+        values = iter(readings)
+        monkeypatch.setattr(memory, "total_rss", lambda: next(values))
+        monkeypatch.setattr(memory, "SAMPLE_INTERVAL_SECONDS", 0)
+        return MemoryGovernor(max_rss=1000, max_concurrency=max_concurrency)
+
+    def test_reduce_pause_resume_increase(self, monkeypatch):
+        """Test the full throttle cycle as memory rises and falls."""
+        governor = self._governor(monkeypatch, [500, 950, 1200, 950, 500, 500])
+
+        limits = [governor.limit(in_flight=4) for _ in range(6)]
+
+        assert limits == [8, 4, 0, 2, 3, 4]
+        assert [event.action for event in governor.events] == [
+            "reduce", "pause", "resume", "reduce", "increase", "increase"
+        ]
+        assert governor.peak_rss == 1200
+
+    def test_each_sample_acts_once(self, monkeypatch):
+        """Test that one reading changes concurrency once, however often limit() is called."""
+        readings = iter([950, 950, 500])
+        monkeypatch.setattr(memory, "total_rss", lambda: next(readings))
+        now = 0.0
+        governor = MemoryGovernor(max_rss=1000, max_concurrency=16, clock=lambda: now)
+
+        limits = []
+        for now in [0.0, 0.02, 0.04, 0.06, 0.1, 0.12, 0.2, 0.22]:
+            limits.append(governor.limit(in_flight=4))
+
+        assert limits == [8, 8, 8, 8, 4, 4, 5, 5]
+        assert [event.action for event in governor.events] == ["reduce", "reduce", "increase"]
+
+    def test_events_are_capped(self, monkeypatch):
+        """Test that an oscillating run records a bounded number of events."""
+        monkeypatch.setattr(memory, "MAX_THROTTLE_EVENTS", 3)
+        governor = self._governor(monkeypatch, [1200, 500] * 5)
+
+        for _ in range(10):
+            governor.limit(in_flight=4)
+
+        assert [event.action for event in governor.events] == ["pause", "resume", "pause"]
+        assert governor.dropped_events == 7
+
+    def test_never_blocks_when_idle(self, monkeypatch):
+        """Test that dispatch continues when nothing is running, even over the cap."""
+        governor = self._governor(monkeypatch, [5000])
+
+        assert governor.limit(in_flight=0) >= 1
+
+    def test_unmeasurable_memory_never_throttles(self, monkeypatch):
+        """Test platforms without /proc run at full concurrency."""
+        governor = self._governor(monkeypatch, [None, None])
+
+        assert governor.limit(in_flight=3) == 8
+        assert governor.events == []
+
+
+class _RecordingLimiter:
+    """Limiter that allows a fixed number of tasks and records what it saw."""
+
+    def __init__(self, allowed):
+        self.allowed = allowed
+        self.max_seen = 0
+
+    def limit(self, in_flight):
+        self.max_seen = max(self.max_seen, in_flight)
+        return self.allowed
+
+
+def _name(path: Path) -> str:
+    return path.name
+
+
+class TestLimitedDispatch:
+    """Tests for limiter-driven dispatch in the executor."""
+
+    def test_limiter_caps_in_flight_tasks(self):
+        """Test that the executor never exceeds the limiter's allowance."""
+        files = [Path(f"file{i}.yaml") for i in range(30)]
+        limiter = _RecordingLimiter(allowed=1)
+        plan = ExecutionPlan(executor="threads", workers=4)
+
+        results = dict(iter_job_results(files, _name, plan, limiter=limiter))
+
+        assert len(results) == 30
+        assert limiter.max_seen <= 1
+
+    def test_zero_allowance_still_progresses(self):
+        """Test that a limiter returning 0 cannot stall an idle run."""
+        files = [Path(f"file{i}.yaml") for i in range(5)]
+        plan = ExecutionPlan(executor="threads", workers=2)
+
+        results = dict(iter_job_results(files, _name, plan, limiter=_RecordingLimiter(0)))
+
+        assert len(results) == 5
+
+    @linux_only
+    def test_batch_records_throttle_events(self, tmp_path):
+        """Test that a tiny cap throttles the run and is reported in the summary."""
+        files = []
+        for i in range(6):
+            path = tmp_path / f"broken{i}.yaml"
+            path.write_text("apiVersion: v1\nkind: Service\n")
+            files.append(path)
+
+        summary = process_files_batch(
+            files, tmp_path / "output", show_progress=False, executor="threads",
+            max_workers=2, max_rss=1024,
+        )
+
+        assert summary.total == 6
+        assert summary.failed == 6
+        assert summary.throttle_events
+        assert summary.throttle_events[0].action in ("reduce", "pause")
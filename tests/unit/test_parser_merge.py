@@ -0,0 +1,198 @@
+"""Unit tests for merging batch summaries."""
+
+import json
+from pathlib import Path
+
+import pytest
+from conftest import result_record
+
+from parser import merge as merge_module
+from parser.merge import SummaryMerger, place_outputs, relative_output_path
+from parser.models import ParseResult
+
+
+def _write_summary(path: Path, results: list[dict], shard: dict | None = None,
+                   output_dir: str | None = None) -> Path:
+    """Write a minimal --json summary file, with keys in the CLI's order."""
+    data: dict = {"success": True, "summary": {}}
+    if output_dir:
+        data["output_dir"] = output_dir
+    data["results"] = results
+    if shard:
+        data["shard"] = shard
+    path.write_text(json.dumps(data, indent=2))
+    return path
+
+
+def _write_stream(path: Path, results: list[dict], output_dir: str | None = None,
+                  complete: bool = True) -> Path:
+    """Write a minimal --json-stream output."""
+    lines = [json.dumps({"type": "result", **record}) for record in results]
+    if complete:
+        lines.append(json.dumps({"type": "summary", "summary": {"written": len(results)},
+                                 "output_dir": output_dir}))
+    path.write_text("".join(line + "\n" for line in lines))
+    return path
+
+
+class TestSummaryMerger:
+    """Tests for SummaryMerger."""
+
+    def test_counts_aggregate_across_summaries(self, tmp_path):
+        """Test that counters and success rate match a single combined run."""
+        first = _write_summary(tmp_path / "s1.json", [result_record("a.yaml", name="a"),
+                                                      result_record("b.yaml", "failed")])
+        second = _write_summary(tmp_path / "s2.json", [result_record("c.yaml", name="c"),
+                                                       result_record("d.yaml", name="d")])
+        merger = SummaryMerger()
+
+        merged = [r for f in (first, second) for r, _ in merger.add_summary(f)]
+
+        summary = merger.summary
+        assert len(merged) == 4
+        assert (summary.total, summary.successful, summary.failed) == (4, 3, 1)
+        assert summary.success_rate == 75.0
+        assert [r.file_path for r in summary.results] == ["b.yaml"]
+        assert summary.results[0].errors[0].field == "spec"
+
+    def test_name_collision_detected(self, tmp_path):
+        """Test that two manifests producing the same application are reported."""
+        first = _write_summary(tmp_path / "s1.json",
+                               [result_record("team-a/app.yaml", name="app")])
+        second = _write_summary(tmp_path / "s2.json",
+                                [result_record("team-b/app.yaml", name="app")])
+        merger = SummaryMerger()
+
+        for summary_file in (first, second):
+            list(merger.add_summary(summary_file))
+
+        assert len(merger.collisions) == 1
+        collision = merger.collisions[0]
+        assert collision.application_name == "app"
+        assert collision.first_file == "team-a/app.yaml"
+        assert collision.duplicate_file == "team-b/app.yaml"
+        assert collision.summary_file == str(second)
+        assert (merger.successful, merger.failed) == (1, 1)
+        duplicate = merger.summary.results[0]
+        assert duplicate.file_path == "team-b/app.yaml"
+        assert duplicate.errors[0].error_type == "DUPLICATE_OUTPUT"
+        assert "team-a/app.yaml" in duplicate.errors[0].message
+
+    def test_collision_rate_matches_single_run(self, tmp_path):
+        """Test that one name shared across shards counts one success, as one run does."""
+        merger = SummaryMerger()
+        for shard in range(2):
+            records = [result_record(f"s{shard}/app{i}.yaml", name="shared") for i in range(3)]
+            list(merger.add_summary(_write_summary(tmp_path / f"s{shard}.json", records)))
+
+        summary = merger.summary
+        assert (summary.successful, summary.failed) == (1, 5)
+        assert round(summary.success_rate, 1) == 16.7
+        assert [s.count for s in summary.error_signatures] == [5]
+
+    def test_duplicate_file_counted_once(self, tmp_path):
+        """Test that a file reported by two summaries is merged once."""
+        first = _write_summary(tmp_path / "s1.json", [result_record("a.yaml", name="a")])
+        second = _write_summary(tmp_path / "s2.json", [result_record("a.yaml", name="a")])
+        merger = SummaryMerger()
+
+        merged = [r for f in (first, second) for r, _ in merger.add_summary(f)]
+
+        assert len(merged) == 1
+        assert merger.duplicate_files == ["a.yaml"]
+        assert merger.collisions == []
+
+    def test_missing_shards_reported(self, tmp_path):
+        """Test that incomplete shard sets are detected."""
+        merger = SummaryMerger()
+        for index in (1, 3):
+            list(merger.add_summary(
+                _write_summary(tmp_path / f"s{index}.json", [], shard={"index": index, "count": 3})
+            ))
+
+        assert merger.missing_shards == ["2/3"]
+
+    def test_not_a_summary(self, tmp_path):
+        """Test that unrelated JSON files are rejected."""
+        path = tmp_path / "config.json"
+        path.write_text('{"clusterMappings": {}}')
+
+        with pytest.raises(ValueError, match="Not a batch summary"):
+            list(SummaryMerger().add_summary(path))
+
+    def test_json_stream_summary(self, tmp_path):
+        """Test merging --json-stream output, whose summary record comes last."""
+        path = _write_stream(tmp_path / "s.ndjson",
+                             [result_record("a.yaml", name="a"), result_record("b.yaml", "failed")],
+                             output_dir="/runs/out")
+        merger = SummaryMerger()
+
+        merged = list(merger.add_summary(path))
+
+        assert [(r.file_path, d) for r, d in merged] == [("a.yaml", "/runs/out"),
+                                                         ("b.yaml", "/runs/out")]
+        assert (merger.successful, merger.failed, merger.written) == (1, 1, 2)
+
+    def test_interrupted_stream_rejected(self, tmp_path):
+        """Test that a --json-stream output without its summary record is rejected."""
+        path = _write_stream(tmp_path / "s.ndjson", [result_record("a.yaml", name="a")],
+                             complete=False)
+
+        with pytest.raises(ValueError, match="no final summary record"):
+            list(SummaryMerger().add_summary(path))
+
+    def test_reads_across_chunk_boundaries(self, tmp_path, monkeypatch):
+        """Test that a summary read in tiny chunks merges like one read whole."""
+        records = [result_record(f"app{i}.yaml", name=f"app{i}") for i in range(20)]
+        path = _write_summary(tmp_path / "s.json", records, shard={"index": 1, "count": 12},
+                              output_dir="/runs/out")
+        monkeypatch.setattr(merge_module, "READ_CHUNK_SIZE", 3)
+        merger = SummaryMerger()
+
+        merged = list(merger.add_summary(path))
+
+        assert [r.file_path for r, _ in merged] == [f"app{i}.yaml" for i in range(20)]
+        assert merger.shards == {12: {1}}
+
+    def test_output_dir_yielded(self, tmp_path):
+        """Test that the run's output directory accompanies each result."""
+        path = _write_summary(tmp_path / "s.json", [result_record("a.yaml", name="a")],
+                              output_dir="/runs/out")
+
+        assert [d for _, d in SummaryMerger().add_summary(path)] == ["/runs/out"]
+
+
+class TestOutputPlacement:
+    """Tests for combining output files."""
+
+    def test_relative_output_path(self):
+        """Test that nested layouts are preserved relative to the run's output dir."""
+        result = ParseResult(file_path="a.yaml", status="success",
+                             output_path="/runs/out/ab/app.json", application_name="app")
+
+        assert relative_output_path(result, "/runs/out") == Path("ab/app.json")
+        assert relative_output_path(result, None) == Path("app.json")
+
+    @pytest.mark.parametrize("mode", ["hardlink", "copy"])
+    def test_place_outputs(self, tmp_path, mode):
+        """Test linking or copying files into a combined directory."""
+        source = tmp_path / "src" / "app.json"
+        source.parent.mkdir()
+        source.write_text('{"a": 1}')
+        destination = tmp_path / "combined" / "app.json"
+        destination.parent.mkdir()
+        destination.write_text("stale")
+
+        errors = place_outputs([(source, destination)], mode)
+
+        assert errors == []
+        assert destination.read_text() == '{"a": 1}'
+        assert (destination.stat().st_ino == source.stat().st_ino) == (mode == "hardlink")
+
+    def test_place_outputs_missing_source(self, tmp_path):
+        """Test that missing sources are reported, not raised."""
+        errors = place_outputs([(tmp_path / "missing.json", tmp_path / "out.json")])
+
+        assert len(errors) == 1
+        assert "missing.json" in errors[0]
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,310 @@
+"""Unit tests for atomic output writing and output directory claims."""
+
+import gzip
+import json
+import threading
+import time
+
+import pytest
+from conftest import manifest_yaml, write_manifests
+
+from parser.batch import process_files_batch
+from parser.layout import OutputLayout
+from parser.output import (
+    CLAIMS_FILE_NAME,
+    AggregateOutputFile,
+    NameClaims,
+    OutputDirectory,
+    atomic_write_text,
+    load_mapping,
+    resolve_compression,
+    write_if_changed,
+)
+
+
+class TestAtomicWriteText:
+    """Tests for temp-file-and-rename writes."""
+
+    def test_creates_missing_parent(self, tmp_path):
+        """Test that a missing directory is created on demand."""
+        target = tmp_path / "a" / "b" / "out.json"
+
+        atomic_write_text(target, "{}")
+
+        assert target.read_text() == "{}"
+
+    def test_replaces_existing_file_without_leftovers(self, tmp_path):
+        """Test that an existing file is replaced and no temp file remains."""
+        target = tmp_path / "out.json"
+        target.write_text("old")
+
+        atomic_write_text(target, "new")
+
+        assert target.read_text() == "new"
+        assert [p.name for p in tmp_path.iterdir()] == ["out.json"]
+
+    def test_failed_rename_removes_temp_file(self, tmp_path):
+        """Test that a failed write leaves neither a partial nor a temp file."""
+        target = tmp_path / "out.json"
+        target.mkdir()
+
+        with pytest.raises(OSError):
+            atomic_write_text(target, "{}")
+
+        assert [p.name for p in tmp_path.iterdir()] == ["out.json"]
+
+
+class TestWriteIfChanged:
+    """Tests for skipping identical writes."""
+
+    def test_missing_file_is_written(self, tmp_path):
+        """Test that a new file is written."""
+        target = tmp_path / "out.json"
+
+        assert write_if_changed(target, b"{}") is True
+        assert target.read_text() == "{}"
+
+    def test_identical_file_is_untouched(self, tmp_path):
+        """Test that identical content keeps the same inode and mtime."""
+        target = tmp_path / "out.json"
+        write_if_changed(target, '{"a": "é"}'.encode())
+        before = target.stat()
+
+        assert write_if_changed(target, '{"a": "é"}'.encode()) is False
+        after = target.stat()
+        assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+
+    @pytest.mark.parametrize("old", ['{"a": 2}', '{"a": 10}'])
+    def test_changed_content_is_rewritten(self, tmp_path, old):
+        """Test that same-size and different-size changes are both written."""
+        target = tmp_path / "out.json"
+        target.write_text(old)
+
+        assert write_if_changed(target, b'{"a": 1}') is True
+        assert target.read_text() == '{"a": 1}'
+
+
+class TestOutputDirectory:
+    """Tests for the run lock and per-name claims."""
+
+    def test_name_claims_rule(self, tmp_path):
+        """Test the shared claim rule: earlier owners keep names unless rerun or removed."""
+        kept = tmp_path / "kept.yaml"
+        rerun = tmp_path / "rerun.yaml"
+        kept.touch()
+        rerun.touch()
+        prior = {"kept": str(kept), "rerun": str(rerun), "gone": str(tmp_path / "gone.yaml")}
+        claims = NameClaims([str(rerun)], prior.get)
+
+        assert claims.claim("kept", "/m/new.yaml") == str(kept)
+        assert claims.claim("rerun", "/m/new.yaml") is None
+        assert claims.claim("gone", "/m/other.yaml") is None
+        assert claims.claim("gone", "/m/new.yaml") == "/m/other.yaml"
+        assert claims.claims == {"rerun": "/m/new.yaml", "gone": "/m/other.yaml"}
+
+    def test_load_mapping(self, tmp_path):
+        """Test that missing or malformed mapping files read as empty."""
+        path = tmp_path / "mapping.json"
+        assert load_mapping(path) == {}
+        path.write_text("[1]")
+        assert load_mapping(path) == {}
+        path.write_text('{"a": "x", "b": 1}')
+        assert load_mapping(path) == {"a": "x", "b": "1"}
+
+    def test_duplicate_name_in_one_run(self, tmp_path):
+        """Test that the first manifest keeps a name within a run."""
+        with OutputDirectory(tmp_path / "out") as outputs:
+            assert outputs.claim("app", "/m/a.yaml") is None
+            assert outputs.claim("app", "/m/a.yaml") is None
+            assert outputs.claim("app", "/m/b.yaml") == "/m/a.yaml"
+
+    def test_claims_persist_across_runs(self, tmp_path):
+        """Test that a later run cannot take a name owned by another existing manifest."""
+        first = tmp_path / "first.yaml"
+        first.write_text("")
+
+        with OutputDirectory(tmp_path / "out", [str(first)]) as outputs:
+            outputs.claim("app", str(first))
+
+        with OutputDirectory(tmp_path / "out", ["/other/app.yaml"]) as outputs:
+            assert outputs.claim("app", "/other/app.yaml") == str(first)
+
+        claims = json.loads((tmp_path / "out" / CLAIMS_FILE_NAME).read_text())
+        assert claims == {"app": str(first)}
+
+    def test_claim_of_removed_manifest_is_released(self, tmp_path):
+        """Test that a name owned by a deleted manifest can be taken over."""
+        with OutputDirectory(tmp_path / "out") as outputs:
+            outputs.claim("app", str(tmp_path / "gone.yaml"))
+
+        with OutputDirectory(tmp_path / "out") as outputs:
+            assert outputs.claim("app", "/new/app.yaml") is None
+
+    def test_rerun_releases_its_own_sources(self, tmp_path):
+        """Test that manifests reprocessed by a run may change their names."""
+        a = tmp_path / "a.yaml"
+        b = tmp_path / "b.yaml"
+        a.write_text("")
+        b.write_text("")
+
+        with OutputDirectory(tmp_path / "out", [str(a)]) as outputs:
+            outputs.claim("app", str(a))
+
+        # a.yaml now produces another name; b.yaml takes "app" in the same run
+        with OutputDirectory(tmp_path / "out", [str(a), str(b)]) as outputs:
+            assert outputs.claim("app", str(b)) is None
+            assert outputs.claim("renamed", str(a)) is None
+
+    def test_second_run_waits_for_lock(self, tmp_path):
+        """Test that concurrent runs on one directory are serialized."""
+        events: list[str] = []
+
+        def second_run():
+            with OutputDirectory(tmp_path, on_wait=lambda: events.append("waiting")):
+                events.append("second")
+
+        with OutputDirectory(tmp_path):
+            thread = threading.Thread(target=second_run)
+            thread.start()
+            time.sleep(0.2)
+            events.append("first done")
+        thread.join(timeout=5)
+
+        assert events == ["waiting", "first done", "second"]
+
+
+class TestBatchOutputs:
+    """Tests for batch writes through the output directory."""
+
+    def test_duplicate_application_name_fails_second_manifest(self, tmp_path):
+        """Test that two manifests with one name produce one output and one failure."""
+        files = [tmp_path / "a.yaml", tmp_path / "b.yaml"]
+        for path in files:
+            path.write_text(manifest_yaml("shared"))
+
+        summary = process_files_batch(
+            files, tmp_path / "out", show_progress=False, executor="serial"
+        )
+
+        assert (summary.successful, summary.failed) == (1, 1)
+        duplicate = summary.results[1]
+        assert duplicate.errors[0].error_type == "DUPLICATE_OUTPUT"
+        assert str(files[0]) in duplicate.errors[0].message
+        assert [p.name for p in (tmp_path / "out").glob("*.json")] == ["shared.json"]
+
+    def test_output_at_index_path_fails(self, tmp_path):
+        """Test that a template cannot overwrite the layout index with an application."""
+        files = write_manifests(tmp_path, ["index", "other"])
+        output = tmp_path / "out"
+
+        summary = process_files_batch(
+            files, output, show_progress=False, layout=OutputLayout("{name}.json")
+        )
+
+        assert [r.status for r in summary.results] == ["failed", "success"]
+        assert summary.results[0].errors[0].error_type == "DUPLICATE_OUTPUT"
+        assert "reserved for the layout index" in summary.results[0].errors[0].message
+        assert json.loads((output / "index.json").read_text()) == {"other": "other.json"}
+
+    def test_rerun_reports_unchanged_outputs(self, tmp_path):
+        """Test that a repeated run writes nothing and counts unchanged files."""
+        files = write_manifests(tmp_path, [f"app{i}" for i in range(3)])
+
+        first = process_files_batch(files, tmp_path / "out", show_progress=False)
+        mtimes = {p.name: p.stat().st_mtime_ns for p in (tmp_path / "out").glob("*.json")}
+        files[0].write_text(manifest_yaml("app0", namespace="dev"))
+        second = process_files_batch(files, tmp_path / "out", show_progress=False)
+
+        assert (first.written, first.unchanged) == (3, 0)
+        assert (second.written, second.unchanged) == (1, 2)
+        for name in ("app1.json", "app2.json"):
+            assert (tmp_path / "out" / name).stat().st_mtime_ns == mtimes[name]
+
+    def test_no_temp_files_left(self, tmp_path):
+        """Test that a parallel run leaves only final outputs behind."""
+        files = write_manifests(tmp_path, [f"app{i}" for i in range(12)])
+
+        summary = process_files_batch(
+            files, tmp_path / "out", show_progress=False, executor="threads", max_workers=4
+        )
+
+        assert summary.successful == 12
+        names = sorted(p.name for p in (tmp_path / "out").iterdir())
+        assert names == sorted([f"app{i}.json" for i in range(12)] + [CLAIMS_FILE_NAME])
+
+
+class TestAggregateOutputFile:
+    """Tests for streaming all outputs into one file."""
+
+    def test_ndjson_one_record_per_line(self, tmp_path):
+        """Test NDJSON framing and that NDJSON forces compact records."""
+        target = tmp_path / "apps.ndjson"
+        with AggregateOutputFile(target, "ndjson") as sink:
+            assert sink.json_style == "compact"
+            sink.write("a", b'{"name":"a"}')
+            sink.write("b", b'{"name":"b"}')
+
+        assert target.read_bytes() == b'{"name":"a"}\n{"name":"b"}\n'
+
+    def test_json_array_of_pretty_records(self, tmp_path):
+        """Test that pretty records form a valid indented JSON array."""
+        target = tmp_path / "apps.json"
+        with AggregateOutputFile(target, "json-array") as sink:
+            sink.write("a", b'{\n  "name": "a"\n}')
+            sink.write("b", b'{\n  "name": "b"\n}')
+
+        assert json.loads(target.read_text()) == [{"name": "a"}, {"name": "b"}]
+        assert target.read_text().startswith('[\n  {\n    "name": "a"')
+
+    def test_empty_json_array(self, tmp_path):
+        """Test that a run with no outputs still writes a valid array."""
+        target = tmp_path / "apps.json"
+        with AggregateOutputFile(target, "json-array"):
+            pass
+
+        assert json.loads(target.read_text()) == []
+
+    def test_gzip_is_deterministic(self, tmp_path):
+        """Test gzip selection by suffix and byte-identical repeated runs."""
+        contents = []
+        for run in range(2):
+            target = tmp_path / f"run{run}" / "apps.ndjson.gz"
+            with AggregateOutputFile(target, "ndjson") as sink:
+                assert sink.compression == "gzip"
+                sink.write("a", b'{"name":"a"}')
+            contents.append(target.read_bytes())
+
+        assert contents[0] == contents[1]
+        assert gzip.decompress(contents[0]) == b'{"name":"a"}\n'
+
+    def test_failed_run_leaves_no_file(self, tmp_path):
+        """Test that an aborted run discards the partial file."""
+        target = tmp_path / "apps.ndjson"
+
+        with pytest.raises(RuntimeError):
+            with AggregateOutputFile(target, "ndjson") as sink:
+                sink.write("a", b"{}")
+                raise RuntimeError("boom")
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_compression_from_suffix(self, tmp_path):
+        """Test automatic compression detection."""
+        assert resolve_compression(tmp_path / "a.ndjson") == "none"
+        assert resolve_compression(tmp_path / "a.ndjson", "gzip") == "gzip"
+
+    def test_batch_streams_into_ndjson(self, tmp_path):
+        """Test a parallel batch writing into one NDJSON file."""
+        files = write_manifests(tmp_path, [f"app{i}" for i in range(8)])
+        target = tmp_path / "apps.ndjson"
+
+        summary = process_files_batch(
+            files, tmp_path / "unused", show_progress=False, executor="threads",
+            max_workers=2, sink=AggregateOutputFile(target, "ndjson"),
+        )
+
+        records = [json.loads(line) for line in target.read_text().splitlines()]
+        assert summary.successful == summary.written == 8
+        assert sorted(r["metadata"]["name"] for r in records) == [f"app{i}" for i in range(8)]
+        assert all(r.output_path == str(target) for r in summary.results)
+        assert not (tmp_path / "unused").exists()
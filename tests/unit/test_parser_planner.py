@@ -0,0 +1,182 @@
+"""Unit tests for execution planning."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from parser import planner
+from parser.batch import process_files_batch
+from parser.planner import (
+    CalibrationProfile,
+    interpreter_id,
+    load_profile,
+    plan_execution,
+    save_profile,
+)
+from scanner.throttle import IOThrottle
+
+
+def _make_files(directory: Path, count: int, size: int) -> list[Path]:
+    """Create count files of the given size."""
+    files = []
+    for i in range(count):
+        path = directory / f"app{i:04d}.yaml"
+        path.write_bytes(b"x" * size)
+        files.append(path)
+    return files
+
+
+def _profile(seconds_per_file: float, startup: float = 0.05) -> CalibrationProfile:
+    """Build a profile for the running interpreter."""
+    return CalibrationProfile(
+        interpreter=interpreter_id(),
+        seconds_per_file=seconds_per_file,
+        seconds_per_kib=0.0,
+        process_startup_seconds=startup,
+    )
+
+
+class TestPlanExecution:
+    """Tests for plan_execution."""
+
+    @pytest.mark.parametrize("executor", ["serial", "threads", "processes"])
+    def test_explicit_executor_is_honored(self, tmp_path, executor):
+        """Test that explicitly requested strategies are never overridden."""
+        files = _make_files(tmp_path, 3, 10)
+
+        plan = plan_execution(files, executor, max_workers=2)
+
+        assert plan.executor == executor
+        assert plan.reason == "requested"
+
+    def test_auto_small_batch_is_serial(self, tmp_path):
+        """Test that a handful of files runs serially without calibration."""
+        files = _make_files(tmp_path, 3, 10)
+
+        plan = plan_execution(files, "auto", profile_path=tmp_path / "profile.json")
+
+        assert plan.executor == "serial"
+        assert "3 files" in plan.reason
+        assert not (tmp_path / "profile.json").exists()
+
+    def test_auto_few_bytes_is_serial(self, tmp_path):
+        """Test that many tiny files still run serially."""
+        files = _make_files(tmp_path, 100, 10)
+
+        plan = plan_execution(files, "auto", max_workers=4)
+
+        assert plan.executor == "serial"
+        assert "KiB" in plan.reason
+
+    def test_auto_large_batch_uses_processes(self, tmp_path, monkeypatch):
+        """Test that an expensive batch is parallelized on GIL builds."""
+        monkeypatch.setattr(planner, "gil_enabled", lambda: True)
+        files = _make_files(tmp_path, 200, 2048)
+        profile_path = tmp_path / "profile.json"
+        save_profile(_profile(seconds_per_file=0.05), profile_path)
+
+        plan = plan_execution(files, "auto", max_workers=4, profile_path=profile_path)
+
+        assert plan.executor == "processes"
+        assert plan.workers == 4
+        assert plan.chunk_size == 200 // (4 * planner.CHUNKS_PER_WORKER)
+
+    def test_auto_free_threaded_uses_threads(self, tmp_path, monkeypatch):
+        """Test that free-threaded interpreters prefer threads."""
+        files = _make_files(tmp_path, 200, 2048)
+        monkeypatch.setattr(planner, "gil_enabled", lambda: False)
+        profile_path = tmp_path / "profile.json"
+        save_profile(_profile(seconds_per_file=0.05), profile_path)
+
+        plan = plan_execution(files, "auto", max_workers=4, profile_path=profile_path)
+
+        assert plan.executor == "threads"
+        assert "free-threaded" in plan.reason
+
+    def test_auto_cheap_batch_stays_serial(self, tmp_path):
+        """Test that process startup cost can outweigh the parallel saving."""
+        files = _make_files(tmp_path, 200, 2048)
+        profile_path = tmp_path / "profile.json"
+        save_profile(_profile(seconds_per_file=0.0001, startup=0.5), profile_path)
+
+        plan = plan_execution(files, "auto", max_workers=4, profile_path=profile_path)
+
+        assert plan.executor == "serial"
+        assert "outweighs" in plan.reason
+
+    def test_auto_calibrates_and_caches_profile(self, tmp_path, monkeypatch):
+        """Test that a missing profile triggers one calibration run and is saved."""
+        files = _make_files(tmp_path, 200, 2048)
+        profile_path = tmp_path / "cache" / "profile.json"
+        calls = []
+
+        def fake_calibrate(sample, throttle=None):
+            calls.append(len(sample))
+            return _profile(seconds_per_file=0.05)
+
+        monkeypatch.setattr(planner, "calibrate", fake_calibrate)
+
+        plan_execution(files, "auto", max_workers=4, profile_path=profile_path)
+        plan_execution(files, "auto", max_workers=4, profile_path=profile_path)
+
+        assert calls == [planner.CALIBRATION_SAMPLE_FILES]
+        assert json.loads(profile_path.read_text())["interpreter"] == interpreter_id()
+
+
+    def test_calibration_reads_through_the_throttle(self, tmp_path, monkeypatch):
+        """Test that calibration reads are charged to the run's I/O throttle."""
+        files = _make_files(tmp_path, 200, 2048)
+
+        with IOThrottle(bytes_per_second=10**9, files_per_second=10**6) as throttle:
+            plan_execution(
+                files, "auto", max_workers=4, profile_path=tmp_path / "p.json", throttle=throttle
+            )
+            stats = throttle.stats()
+
+        assert stats.files_opened == planner.CALIBRATION_SAMPLE_FILES
+        assert stats.bytes_read == planner.CALIBRATION_SAMPLE_FILES * 2048
+
+    def test_batch_defaults_to_serial(self, tmp_path, monkeypatch):
+        """Test that library callers get no calibration or profile unless they ask for auto."""
+        files = _make_files(tmp_path, 200, 2048)
+        monkeypatch.setenv(planner.PROFILE_ENV_VAR, str(tmp_path / "profile.json"))
+
+        def no_calibration(sample, throttle=None):
+            raise AssertionError("calibrated")
+
+        monkeypatch.setattr(planner, "calibrate", no_calibration)
+
+        process_files_batch(files, tmp_path / "out", show_progress=False)
+
+        assert not (tmp_path / "profile.json").exists()
+
+
+class TestProfile:
+    """Tests for calibration profile persistence."""
+
+    def test_load_profile_other_interpreter_ignored(self, tmp_path):
+        """Test that a profile from another interpreter build is not reused."""
+        profile_path = tmp_path / "profile.json"
+        save_profile(
+            _profile(0.01).model_copy(update={"interpreter": "cpython-2.7-gil"}), profile_path
+        )
+
+        assert load_profile(profile_path) is None
+
+    def test_load_profile_corrupt_file(self, tmp_path):
+        """Test that a corrupt profile is treated as missing."""
+        profile_path = tmp_path / "profile.json"
+        profile_path.write_text("{not json")
+
+        assert load_profile(profile_path) is None
+
+    def test_calibrate_measures_costs(self, tmp_path):
+        """Test that calibration produces non-negative costs."""
+        files = _make_files(tmp_path, 2, 100)
+
+        profile = planner.calibrate(files)
+
+        assert profile.interpreter == interpreter_id()
+        assert profile.seconds_per_file >= 0
+        assert profile.process_startup_seconds > 0
@@ -0,0 +1,88 @@
+"""Unit tests for batch progress reporting."""
+
+import io
+from pathlib import Path
+
+import pytest
+from rich.console import Console
+
+from parser.models import ParseResult, ValidationError
+from parser.progress import BatchProgress, format_duration
+
+SUCCESS = ParseResult(file_path="ok.yaml", status="success", application_name="ok")
+FAILED = ParseResult(
+    file_path="bad.yaml",
+    status="failed",
+    errors=[ValidationError(error_type="MISSING_FIELD", message="Missing [spec]")],
+)
+
+
+class FakeClock:
+    """Clock advanced by hand."""
+
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _console(terminal: bool) -> tuple[Console, io.StringIO]:
+    out = io.StringIO()
+    return Console(file=out, force_terminal=terminal, width=120), out
+
+
+@pytest.mark.parametrize(
+    ("seconds", "expected"), [(0.4, "0s"), (42, "42s"), (185, "3m 05s"), (3720, "1h 02m")]
+)
+def test_format_duration(seconds, expected):
+    """Test short duration formatting."""
+    assert format_duration(seconds) == expected
+
+
+class TestBatchProgress:
+    """Tests for throttled progress output."""
+
+    def test_plain_output_is_periodic(self):
+        """Test that without a terminal only failures and periodic rate lines print."""
+        console, out = _console(terminal=False)
+        clock = FakeClock()
+
+        with BatchProgress(4, console, plain_interval=10, clock=clock) as progress:
+            progress.advance(Path("ok.yaml"), SUCCESS)
+            clock.now += 5
+            progress.advance(Path("bad.yaml"), FAILED)
+            clock.now += 5
+            progress.advance(Path("ok.yaml"), SUCCESS)
+            clock.now += 1
+            progress.advance(Path("ok.yaml"), SUCCESS)
+
+        assert out.getvalue().splitlines() == [
+            "✗ bad.yaml: Missing [spec]",
+            "Processed 3/4 files in 10s (0.3 files/s, ETA 3s)",
+            "Processed 4/4 files in 11s (0.4 files/s)",
+        ]
+
+    def test_verbose_prints_every_file(self):
+        """Test that verbose progress prints successes too."""
+        console, out = _console(terminal=False)
+
+        with BatchProgress(2, console, verbose=True, clock=FakeClock()) as progress:
+            progress.advance(Path("ok.yaml"), SUCCESS)
+            progress.advance(Path("skipped.yaml"), ParseResult(file_path="s", status="skipped"))
+
+        assert out.getvalue().splitlines()[:2] == ["✓ ok.yaml: ok", "⊘ skipped.yaml: Skipped"]
+
+    def test_terminal_draws_bar(self):
+        """Test that a terminal gets a progress bar and failure lines only."""
+        console, out = _console(terminal=True)
+
+        with BatchProgress(2, console, refresh_per_second=1) as progress:
+            progress.advance(Path("ok.yaml"), SUCCESS)
+            progress.advance(Path("bad.yaml"), FAILED)
+
+        text = out.getvalue()
+        assert "bad.yaml" in text
+        assert "ok.yaml" not in text
+        assert "2/2" in text
+        assert "Processed" not in text
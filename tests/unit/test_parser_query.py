@@ -0,0 +1,117 @@
+"""Unit tests for the output directory query index."""
+
+import json
+import os
+
+import pytest
+
+from parser.query import (
+    QUERY_INDEX_FILE_NAME,
+    Predicate,
+    QueryIndex,
+    flatten_fields,
+    parse_query,
+)
+
+
+def _write_output(directory, name, cluster="prod", **labels):
+    path = directory / f"{name}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(
+            {
+                "metadata": {"name": name, "labels": labels},
+                "source": {"repoURL": f"https://github.com/org/{name}.git"},
+                "destination": {"clusterName": cluster, "namespace": "default"},
+                "enableSyncPolicy": False,
+            }
+        )
+    )
+    return path
+
+
+class TestParseQuery:
+    """Tests for query expressions."""
+
+    def test_predicates(self):
+        """Test equality, prefix, existence and field aliases."""
+        assert parse_query("cluster=prod and repo=https://x/* AND label:tier") == [
+            Predicate(field="destination.clusterName", op="eq", value="prod"),
+            Predicate(field="source.repoURL", op="prefix", value="https://x/"),
+            Predicate(field="metadata.labels.tier", op="exists"),
+        ]
+
+    def test_quoted_value(self):
+        """Test that quoted values may contain spaces."""
+        assert parse_query('team="big team"')[0].value == "big team"
+
+    @pytest.mark.parametrize("expression", ["", "a=1 or b=2", "a=1 and", "=x", "a='x"])
+    def test_invalid(self, expression):
+        """Test that malformed expressions are rejected."""
+        with pytest.raises(ValueError):
+            parse_query(expression)
+
+
+def test_flatten_fields():
+    """Test flattening nested records into dotted paths."""
+    assert flatten_fields(
+        {"a": {"b": "x", "c": None, "d": ""}, "e": True, "f": {"g.h": "y"}}
+    ) == {"a.b": "x", "e": "true", "f.g.h": "y"}
+
+
+class TestQueryIndex:
+    """Tests for building, refreshing and querying the index."""
+
+    def test_builds_and_matches(self, tmp_path):
+        """Test combined predicates over a fresh index."""
+        _write_output(tmp_path, "a", team="payments")
+        _write_output(tmp_path, "b", cluster="dev", team="payments")
+        _write_output(tmp_path / "ab" / "cd", "c", team="search")
+
+        index = QueryIndex.open(tmp_path)
+
+        assert index.reindexed == 3
+        assert index.match(parse_query("team=payments")) == ["a.json", "b.json"]
+        assert index.match(parse_query("cluster=prod and team=payments")) == ["a.json"]
+        assert index.match(parse_query("name=c")) == ["ab/cd/c.json"]
+        assert index.match(parse_query("repo=https://github.com/org/*")) == [
+            "a.json", "ab/cd/c.json", "b.json"
+        ]
+        assert index.match(parse_query("enableSyncPolicy=false and label:missing")) == []
+        assert (tmp_path / QUERY_INDEX_FILE_NAME).exists()
+
+    def test_incremental_refresh(self, tmp_path):
+        """Test that only changed outputs are re-read and removed ones dropped."""
+        _write_output(tmp_path, "a", team="payments")
+        path = _write_output(tmp_path, "b", team="payments")
+        _write_output(tmp_path, "c", team="payments")
+        QueryIndex.open(tmp_path)
+
+        unchanged = QueryIndex.open(tmp_path)
+        assert unchanged.reindexed == 0
+        _write_output(tmp_path, "b", team="search-team")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        (tmp_path / "c.json").unlink()
+        index = QueryIndex.open(tmp_path)
+
+        assert (index.reindexed, index.removed) == (1, 1)
+        assert index.match(parse_query("team=payments")) == ["a.json"]
+        assert index.match(parse_query("team=search-team")) == ["b.json"]
+
+    def test_ignores_non_outputs(self, tmp_path):
+        """Test that layout indexes and grouped configs are not indexed as outputs."""
+        (tmp_path / "index.json").write_text(json.dumps({"a": "ab/cd/a.json"}))
+        (tmp_path / "config.json").write_text(json.dumps([{"metadata": {"name": "x"}}]))
+
+        index = QueryIndex.open(tmp_path)
+
+        assert index.match(parse_query("a")) == []
+        assert index.postings == {}
+
+    def test_corrupt_index_is_rebuilt(self, tmp_path):
+        """Test that an unreadable persisted index is ignored."""
+        _write_output(tmp_path, "a")
+        (tmp_path / QUERY_INDEX_FILE_NAME).write_text("not json")
+
+        assert QueryIndex.open(tmp_path).match(parse_query("name=a")) == ["a.json"]
@@ -0,0 +1,78 @@
+"""Unit tests for the bounded-memory result store."""
+
+from parser.batch import process_files_batch
+from parser.models import ParseResult, ValidationError
+from parser.results import CompactResult, ResultStore
+
+
+def _failed(name: str) -> ParseResult:
+    return ParseResult(
+        file_path=f"{name}.yaml",
+        status="failed",
+        errors=[
+            ValidationError(error_type="MISSING_FIELD", field="spec", message="Missing"),
+            ValidationError(error_type="YAML_PARSE_ERROR", message="Bad ✗"),
+        ],
+    )
+
+
+def _success(name: str) -> ParseResult:
+    return ParseResult(
+        file_path=f"{name}.yaml",
+        status="success",
+        output_path=f"out/{name}.json",
+        application_name=name,
+    )
+
+
+def test_compact_result_round_trip():
+    """Test that compacting and materializing a result preserves it."""
+    for result in (_success("a"), _failed("b")):
+        assert CompactResult.from_result(result).to_result() == result
+
+
+class TestResultStore:
+    """Tests for storing results in input order with spilled failures."""
+
+    def test_input_order_and_spill(self, tmp_path):
+        """Test that failures beyond the in-memory limit are spilled and read back."""
+        results = [_failed("f0"), _success("s0"), _failed("f1"), _failed("f2")]
+        with ResultStore(failures_in_memory=1, spill_dir=tmp_path) as store:
+            for index in (3, 1, 0, 2):
+                store.add(index, results[index])
+
+            assert store.spilled == 2
+            assert len(store) == 4
+            assert list(store) == results
+            assert list(store.failures()) == [results[0], results[2], results[3]]
+
+    def test_no_spill_file_without_overflow(self, tmp_path):
+        """Test that no temporary file is created while failures fit in memory."""
+        with ResultStore(spill_dir=tmp_path) as store:
+            store.add(0, _failed("a"))
+
+        assert store.spilled == 0
+        assert list(tmp_path.iterdir()) == []
+
+    def test_batch_run(self, tmp_path):
+        """Test that a batch run fills the store and leaves the summary empty."""
+        good = tmp_path / "good.yaml"
+        good.write_text(
+            "apiVersion: argoproj.io/v1alpha1\nkind: Application\nmetadata:\n  name: good\n"
+            "spec:\n  source:\n    repoURL: https://github.com/org/repo.git\n    path: ./a\n"
+            "  destination:\n    server: https://kubernetes.default.svc\n    namespace: x\n"
+        )
+        bad = tmp_path / "bad.yaml"
+        bad.write_text("kind: Broken\n")
+        store = ResultStore(failures_in_memory=0, spill_dir=tmp_path)
+
+        summary = process_files_batch(
+            [bad, good], tmp_path / "out", show_progress=False, result_store=store
+        )
+
+        assert (summary.successful, summary.failed, summary.results) == (1, 1, [])
+        assert [(r.file_path, r.status) for r in store] == [
+            (str(bad), "failed"), (str(good), "success")
+        ]
+        assert store.spilled == 1
+        store.close()
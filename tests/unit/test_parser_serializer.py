@@ -0,0 +1,90 @@
+"""Unit tests for JSON serialization backends."""
+
+import json
+
+import pytest
+
+from parser import serializer
+from parser.models import (
+    MigrationOutput,
+    OutputDestination,
+    OutputDirectoryConfig,
+    OutputMetadata,
+    OutputSource,
+)
+from parser.serializer import resolve_backend, serialize_model
+
+BACKENDS = [
+    "pydantic",
+    "json",
+    pytest.param(
+        "orjson",
+        marks=pytest.mark.skipif(
+            not serializer.orjson_available(), reason="orjson not installed"
+        ),
+    ),
+]
+
+
+@pytest.fixture
+def output() -> MigrationOutput:
+    """Migration output exercising escapes and non-ASCII text."""
+    return MigrationOutput(
+        metadata=OutputMetadata(
+            name="guestbook",
+            annotations={"description": 'Ünïcode "quoted" \\ tab\there \x01 😀'},
+            labels={},
+        ),
+        project="default",
+        source=OutputSource(
+            repoURL="https://github.com/org/repo.git",
+            revision="HEAD",
+            manifestPath="apps/guestbook",
+            directory=OutputDirectoryConfig(),
+        ),
+        destination=OutputDestination(clusterName="in-cluster", namespace="default"),
+        enableSyncPolicy=False,
+    )
+
+
+class TestSerializeModel:
+    """Tests for serialize_model()."""
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_pretty_is_byte_identical_to_legacy_output(self, output, backend):
+        """Test that pretty output matches the original json.dump format exactly."""
+        legacy = json.dumps(output.model_dump(mode="json"), indent=2, ensure_ascii=False)
+
+        assert serialize_model(output, "pretty", backend) == legacy.encode("utf-8")
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_compact_has_no_whitespace_between_tokens(self, output, backend):
+        """Test compact output is single-line and equivalent."""
+        compact = serialize_model(output, "compact", backend)
+
+        assert b"\n" not in compact
+        assert b'": ' not in compact
+        assert json.loads(compact) == output.model_dump(mode="json")
+
+
+class TestResolveBackend:
+    """Tests for serializer backend selection."""
+
+    def test_auto_falls_back_to_pydantic(self, monkeypatch):
+        """Test that auto uses pydantic when orjson is missing."""
+        monkeypatch.setattr(serializer, "orjson_available", lambda: False)
+
+        assert resolve_backend("auto") == "pydantic"
+
+    def test_auto_prefers_orjson(self, monkeypatch):
+        """Test that auto uses orjson when installed."""
+        monkeypatch.setattr(serializer, "orjson_available", lambda: True)
+
+        assert resolve_backend("auto") == "orjson"
+
+    def test_missing_orjson_is_an_error(self, monkeypatch):
+        """Test that explicitly requesting a missing orjson fails clearly."""
+        monkeypatch.setattr(serializer, "orjson_available", lambda: False)
+
+        with pytest.raises(ValueError, match="orjson"):
+            resolve_backend("orjson")
@@ -0,0 +1,73 @@
+"""Unit tests for deterministic batch sharding."""
+
+from pathlib import Path
+
+import pytest
+
+from parser.sharding import ShardSpec, parse_shard_spec, select_shard, shard_for_path
+
+
+class TestParseShardSpec:
+    """Tests for INDEX/COUNT parsing."""
+
+    def test_parse_valid(self):
+        """Test parsing a valid specification."""
+        assert parse_shard_spec("2/4") == ShardSpec(index=2, count=4)
+
+    @pytest.mark.parametrize("spec", ["2", "a/4", "0/4", "5/4", "1/0", "-1/3"])
+    def test_parse_invalid(self, spec):
+        """Test that malformed or out-of-range specifications are rejected."""
+        with pytest.raises(ValueError, match="Invalid shard"):
+            parse_shard_spec(spec)
+
+    def test_str_round_trip(self):
+        """Test string form matches the CLI syntax."""
+        assert str(parse_shard_spec("3/8")) == "3/8"
+
+
+class TestSelectShard:
+    """Tests for shard assignment."""
+
+    def _files(self, base: Path, count: int) -> list[Path]:
+        return [base / "apps" / f"team{i % 7}" / f"app{i}.yaml" for i in range(count)]
+
+    def test_shards_partition_files(self, tmp_path):
+        """Test that every file lands in exactly one shard."""
+        files = self._files(tmp_path, 500)
+
+        shards = [select_shard(files, tmp_path, ShardSpec(index=i, count=4)) for i in range(1, 5)]
+
+        assert sorted(f for shard in shards for f in shard) == sorted(files)
+        assert all(len(shard) > 50 for shard in shards)
+
+    def test_assignment_stable_when_files_added(self, tmp_path):
+        """Test that adding unrelated files does not move existing ones."""
+        files = self._files(tmp_path, 200)
+        spec = ShardSpec(index=3, count=5)
+        before = set(select_shard(files, tmp_path, spec))
+
+        extra = [tmp_path / "new" / f"extra{i}.yaml" for i in range(100)]
+        after = set(select_shard(sorted(files + extra), tmp_path, spec))
+
+        assert after - set(extra) == before
+
+    def test_assignment_independent_of_checkout_location(self, tmp_path):
+        """Test that assignment uses the path relative to the scanned directory."""
+        a = tmp_path / "runner-a"
+        b = tmp_path / "runner-b" / "nested"
+        spec = ShardSpec(index=2, count=3)
+
+        names_a = [p.relative_to(a) for p in select_shard(self._files(a, 100), a, spec)]
+        names_b = [p.relative_to(b) for p in select_shard(self._files(b, 100), b, spec)]
+
+        assert names_a == names_b
+
+    def test_shard_for_path_known_value(self):
+        """Test that the hash is stable across runs and interpreters."""
+        assert [shard_for_path(f"apps/app{i}.yaml", 4) for i in range(6)] == [4, 4, 4, 2, 1, 1]
+
+    def test_single_shard_keeps_everything(self, tmp_path):
+        """Test that 1/1 selects every file."""
+        files = self._files(tmp_path, 10)
+
+        assert select_shard(files, tmp_path, ShardSpec(index=1, count=1)) == files
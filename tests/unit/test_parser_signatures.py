@@ -0,0 +1,97 @@
+"""Unit tests for failure signature grouping."""
+
+from parser.batch import process_files_batch
+from parser.models import ErrorSignature, ParseResult, ValidationError
+from parser.signatures import (
+    ErrorSignatureCounter,
+    combine_signatures,
+    field_template,
+    message_template,
+)
+
+
+def _failed(file_path: str, *errors: tuple[str, str | None, str]) -> ParseResult:
+    return ParseResult(
+        file_path=file_path,
+        status="failed",
+        errors=[
+            ValidationError(error_type=error_type, field=field, message=message)
+            for error_type, field, message in errors
+        ],
+    )
+
+
+def test_message_template():
+    """Test that values, URLs, paths, file names and numbers become placeholders."""
+    assert message_template(
+        'while parsing\n  in "/m/a.yaml", line 3, column 10'
+    ) == "while parsing in <value>, line <n>, column <n>"
+    assert message_template("app-1.json is already produced by /src/app.yml") == (
+        "<file> is already produced by <path>"
+    )
+    assert message_template("bad repoURL https://github.com/org/x.git") == "bad repoURL <url>"
+    assert message_template("Field required") == "Field required"
+
+
+def test_field_template():
+    """Test that list indexes in field paths are generalized."""
+    assert field_template("spec.sources.0.repoURL") == "spec.sources.<n>.repoURL"
+    assert field_template(None) is None
+
+
+class TestErrorSignatureCounter:
+    """Tests for counting failures by signature."""
+
+    def test_groups_and_samples(self):
+        """Test counts, first-by-path samples and frequency order."""
+        counter = ErrorSignatureCounter(sample_files=2)
+        for name in ("d", "b", "c", "a"):
+            counter.add(
+                _failed(
+                    f"{name}.yaml",
+                    ("YAML_PARSE_ERROR", None, f'bad value "{name}" at line 1'),
+                    ("YAML_PARSE_ERROR", None, f'bad value "{name}" at line 2'),
+                )
+            )
+        counter.add(_failed("z.yaml", ("VALIDATION_ERROR", "spec", "Field required")))
+        counter.add(ParseResult(file_path="ok.yaml", status="success"))
+
+        assert counter.signatures() == [
+            ErrorSignature(
+                error_type="YAML_PARSE_ERROR",
+                message="bad value <value> at line <n>",
+                count=4,
+                sample_files=["a.yaml", "b.yaml"],
+            ),
+            ErrorSignature(
+                error_type="VALIDATION_ERROR",
+                field="spec",
+                message="Field required",
+                count=1,
+                sample_files=["z.yaml"],
+            ),
+        ]
+
+    def test_combine(self):
+        """Test combining signatures counted by separate runs."""
+        first = ErrorSignature(error_type="E", message="m", count=2, sample_files=["b", "c"])
+        second = ErrorSignature(error_type="E", message="m", count=1, sample_files=["a"])
+
+        assert combine_signatures([first], [second]) == [
+            ErrorSignature(error_type="E", message="m", count=3, sample_files=["a", "b", "c"])
+        ]
+
+
+def test_batch_summary_signatures(tmp_path):
+    """Test that a batch run groups its failures."""
+    files = []
+    for i in range(3):
+        path = tmp_path / f"broken{i}.yaml"
+        path.write_text("kind: Broken\n")
+        files.append(path)
+
+    summary = process_files_batch(files, tmp_path / "out", show_progress=False)
+
+    # Each file has the same few errors
+    assert {s.count for s in summary.error_signatures} == {3}
+    assert summary.error_signatures[0].sample_files == [str(f) for f in files]
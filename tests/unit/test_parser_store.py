@@ -0,0 +1,123 @@
+"""Unit tests for the SQLite output store."""
+
+import sqlite3
+
+import pytest
+from conftest import output_record, write_manifests
+
+from parser.batch import process_files_batch
+from parser.store import SqliteOutputStore
+
+
+def _store(path, records, sources=(), batch_size=1000):
+    with SqliteOutputStore(path, sources, batch_size=batch_size) as store:
+        for name, source, data in records:
+            assert store.claim(name, source) is None
+            store.write(name, data)
+    return store
+
+
+def _query(path, sql, *params):
+    with sqlite3.connect(path) as connection:
+        return connection.execute(sql, params).fetchall()
+
+
+class TestSqliteOutputStore:
+    """Tests for storing outputs in SQLite."""
+
+    def test_columns_and_side_tables(self, tmp_path):
+        """Test that fields are indexed columns and labels are normalized."""
+        db = tmp_path / "apps.db"
+
+        _store(db, [("a", "a.yaml", output_record("a", team="payments"))])
+
+        assert _query(
+            db, "SELECT name, clusterName, repoURL, enableSyncPolicy FROM applications"
+        ) == [("a", "prod", "https://example.com/a.git", 1)]
+        assert _query(db, "SELECT name, key, value FROM labels") == [("a", "team", "payments")]
+        assert _query(db, "SELECT key, value FROM annotations") == [("owner", "ops")]
+        assert _query(db, "PRAGMA journal_mode") == [("wal",)]
+
+    def test_queries_use_indexes(self, tmp_path):
+        """Test that cluster and label lookups are index searches."""
+        db = tmp_path / "apps.db"
+        _store(db, [("a", "a.yaml", output_record("a", team="payments"))])
+
+        plan = _query(
+            db, "EXPLAIN QUERY PLAN SELECT name FROM applications WHERE clusterName = ?", "x"
+        )
+        assert "applications_clusterName" in plan[0][-1]
+        plan = _query(
+            db, "EXPLAIN QUERY PLAN SELECT name FROM labels WHERE key = ? AND value = ?", "k", "v"
+        )
+        assert "labels_key_value" in plan[0][-1]
+
+    def test_rerun_upserts(self, tmp_path):
+        """Test that reruns update changed rows and leave unchanged ones."""
+        db = tmp_path / "apps.db"
+        _store(
+            db,
+            [("a", "a.yaml", output_record("a", team="x")), ("b", "b.yaml", output_record("b"))],
+        )
+
+        store = _store(
+            db,
+            [("a", "a.yaml", output_record("a", team="y")), ("b", "b.yaml", output_record("b"))],
+            batch_size=1,
+        )
+
+        assert (store.written, store.unchanged) == (1, 1)
+        assert _query(db, "SELECT value FROM labels WHERE name = 'a'") == [("y",)]
+        assert _query(db, "SELECT count(*) FROM applications") == [(2,)]
+
+    def test_renamed_application_replaces_old_row(self, tmp_path):
+        """Test that a manifest's old row goes away when its name changes."""
+        db = tmp_path / "apps.db"
+        _store(db, [("old", "a.yaml", output_record("old", team="x"))])
+
+        _store(db, [("new", "a.yaml", output_record("new"))], sources=["a.yaml"])
+
+        assert _query(db, "SELECT name FROM applications") == [("new",)]
+        assert _query(db, "SELECT count(*) FROM labels") == [(0,)]
+
+    def test_name_owned_by_existing_manifest(self, tmp_path):
+        """Test that a name stored for another existing manifest is reported."""
+        db = tmp_path / "apps.db"
+        owner = tmp_path / "a.yaml"
+        owner.touch()
+        _store(db, [("a", str(owner), output_record("a"))])
+
+        with SqliteOutputStore(db) as store:
+            assert store.claim("a", "other.yaml") == str(owner)
+            owner.unlink()
+            assert store.claim("a", "other.yaml") is None
+
+    def test_failed_run_discards_pending_batch(self, tmp_path):
+        """Test that an aborted run does not commit its unfinished batch."""
+        db = tmp_path / "apps.db"
+
+        with pytest.raises(RuntimeError):
+            with SqliteOutputStore(db) as store:
+                store.claim("a", "a.yaml")
+                store.write("a", output_record("a"))
+                raise RuntimeError("boom")
+
+        assert _query(db, "SELECT count(*) FROM applications") == [(0,)]
+
+    def test_batch_run(self, tmp_path):
+        """Test a parallel batch writing into the database."""
+        files = []
+        for i in range(6):
+            files += write_manifests(tmp_path, [f"app{i}"], cluster="c", team=f"t{i % 2}")
+        db = tmp_path / "apps.db"
+
+        summary = process_files_batch(
+            files, tmp_path / "unused", show_progress=False, executor="threads",
+            max_workers=2, sink=SqliteOutputStore(db, [str(f) for f in files], batch_size=4),
+        )
+
+        assert summary.successful == summary.written == 6
+        assert all(r.output_path == str(db) for r in summary.results)
+        assert _query(
+            db, "SELECT count(*) FROM labels WHERE key = 'team' AND value = 't0'"
+        ) == [(3,)]
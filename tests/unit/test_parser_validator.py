@@ -1,14 +1,20 @@
 """Unit tests for validation functions."""
 
+import copy
+import random
+
 import pytest
 from pathlib import Path
+from pydantic import ValidationError as PydanticValidationError
+from parser.models import ArgoCDApplication, ValidationError
 from parser.validator import (
+    check_manifest_structure,
     is_argocd_application,
     validate_required_fields,
     validate_empty_null_fields,
     get_validation_error_summary,
 )
-from parser.core import load_single_yaml_document, YAMLDocumentError
+from parser.core import load_single_yaml_document, parse_argocd_manifest, YAMLDocumentError
 
 
 class TestIsArgoCDApplication:
@@ -321,3 +327,151 @@ class TestInvalidManifestFixtures:
         fixture_path = Path("tests/fixtures/parser/invalid-manifests/malformed-syntax.yaml")
         with pytest.raises(Exception):  # yaml.YAMLError or similar
             load_single_yaml_document(fixture_path)
+
+
+SOUND_DOCUMENT = {
+    "apiVersion": "argoproj.io/v1alpha1",
+    "kind": "Application",
+    "metadata": {"name": "app", "labels": {"team": "a"}},
+    "spec": {
+        "project": "default",
+        "source": {"repoURL": "https://github.com/org/repo.git", "path": "./app"},
+        "destination": {"server": "https://kubernetes.default.svc", "namespace": "app"},
+        "syncPolicy": {"automated": {"prune": True}, "syncOptions": ["CreateNamespace=true"]},
+    },
+}
+
+# Paths the fuzz test removes or replaces, and the replacement values
+MUTATED_PATHS = [
+    ("apiVersion",), ("kind",), ("metadata",), ("metadata", "name"),
+    ("metadata", "namespace"), ("metadata", "labels"), ("spec",), ("spec", "project"),
+    ("spec", "source"), ("spec", "source", "repoURL"), ("spec", "source", "path"),
+    ("spec", "source", "chart"), ("spec", "source", "targetRevision"),
+    ("spec", "destination"), ("spec", "destination", "server"),
+    ("spec", "destination", "name"), ("spec", "destination", "namespace"),
+    ("metadata", "annotations"), ("spec", "syncPolicy"), ("spec", "syncPolicy", "automated"),
+    ("spec", "syncPolicy", "syncOptions"), ("spec", "syncPolicy", "retry"),
+    ("spec", "ignoreDifferences"), ("spec", "info"),
+]
+MUTATED_VALUES = [
+    None, "", "  ", "x", "v1", "Service", 3, True, [], ["x"], ["x", 2], {}, {"a": 1},
+    {"a": "b"}, [{"a": 1}], [{"a": "b"}, "c"],
+]
+REMOVED = object()
+
+
+def _pydantic_errors(document):
+    """Errors as parse_and_render reported them from Pydantic alone."""
+    try:
+        ArgoCDApplication.model_validate(document)
+    except PydanticValidationError as e:
+        return [
+            ValidationError(
+                error_type="VALIDATION_ERROR",
+                field=".".join(str(loc) for loc in error["loc"]),
+                message=error["msg"],
+            )
+            for error in e.errors()
+        ]
+    return []
+
+
+def _mutate(document, path, value):
+    parent = document
+    for key in path[:-1]:
+        if not isinstance(parent.get(key), dict):
+            return
+        parent = parent[key]
+    if value is REMOVED:
+        parent.pop(path[-1], None)
+    else:
+        parent[path[-1]] = copy.deepcopy(value)
+
+
+class TestCheckManifestStructure:
+    """Tests for single-pass structural validation."""
+
+    def test_sound_document(self):
+        """Test that a valid manifest has no structural errors."""
+        assert check_manifest_structure(copy.deepcopy(SOUND_DOCUMENT)) == []
+
+    def test_collects_all_errors(self):
+        """Test that every error is found in one pass, in Pydantic's order."""
+        document = {
+            "apiVersion": 1,
+            "metadata": {"name": " "},
+            "spec": {"source": {"repoURL": "x"}, "destination": {"namespace": "n"}},
+        }
+
+        assert [(e.field, e.message) for e in check_manifest_structure(document)] == [
+            ("apiVersion", "Input should be a valid string"),
+            ("kind", "Field required"),
+            ("metadata.name", "Value error, Field cannot be empty or whitespace-only"),
+            ("spec.source", "Value error, Either 'path' or 'chart' must be specified in source"),
+            (
+                "spec.destination",
+                "Value error, Either 'server' or 'name' must be specified in destination",
+            ),
+        ]
+
+    def test_kind_checked_last(self):
+        """Test that apiVersion and kind values are only checked on an otherwise valid manifest."""
+        document = copy.deepcopy(SOUND_DOCUMENT)
+        document["kind"] = "Service"
+
+        assert check_manifest_structure(document) == [
+            ValidationError(
+                error_type="VALIDATION_ERROR",
+                field="",
+                message="Value error, Invalid kind 'Service'. Expected 'Application'",
+            )
+        ]
+
+    def test_defers_key_errors(self):
+        """Test that non-string mapping keys are left to Pydantic."""
+        document = copy.deepcopy(SOUND_DOCUMENT)
+        document["metadata"]["labels"] = {1: "x"}
+
+        assert check_manifest_structure(document) is None
+
+    @pytest.mark.parametrize(
+        "field, value",
+        [
+            ("syncOptions", "!!set {CreateNamespace=true}"),
+            ("ignoreDifferences", "!!set {a}"),
+            ("info", "!!set {a}"),
+        ],
+    )
+    def test_defers_yaml_sets(self, tmp_path, field, value):
+        """Test that !!set values, which Pydantic accepts as lists, are left to Pydantic."""
+        manifest = tmp_path / "app.yaml"
+        parent = "spec.syncPolicy" if field == "syncOptions" else "spec"
+        manifest.write_text(
+            "apiVersion: argoproj.io/v1alpha1\nkind: Application\nmetadata:\n  name: a\n"
+            "spec:\n  source:\n    repoURL: https://example.com/a.git\n    path: a\n"
+            "  destination:\n    name: prod\n    namespace: default\n"
+            + ("  syncPolicy:\n    " if field == "syncOptions" else "  ")
+            + f"{field}: {value}\n"
+        )
+        document = load_single_yaml_document(manifest)
+
+        assert check_manifest_structure(document) is None
+        if field == "syncOptions":
+            assert parse_argocd_manifest(manifest).metadata.name == "a"
+        else:
+            assert _pydantic_errors(document)[0].field.startswith(f"{parent}.{field}")
+
+    def test_matches_pydantic(self):
+        """Test that reported errors equal Pydantic's on randomly broken manifests."""
+        rng = random.Random(1234)
+        for _ in range(3000):
+            document = copy.deepcopy(SOUND_DOCUMENT)
+            for _ in range(rng.randint(1, 4)):
+                _mutate(
+                    document,
+                    rng.choice(MUTATED_PATHS),
+                    rng.choice([REMOVED, *MUTATED_VALUES]),
+                )
+            errors = check_manifest_structure(document)
+            assert errors is not None
+            assert errors == _pydantic_errors(document), document
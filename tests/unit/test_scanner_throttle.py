@@ -0,0 +1,167 @@
+"""Unit tests for token-bucket I/O throttling."""
+
+import pickle
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from parser.core import load_single_yaml_document
+from scanner import throttle as throttle_module
+from scanner.core import ScanOptions, scan_directory
+from scanner.throttle import IOThrottle, parse_rate, parse_size
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record requested sleeps instead of sleeping."""
+    recorded: list[float] = []
+    monkeypatch.setattr(throttle_module.time, "sleep", recorded.append)
+    return recorded
+
+
+def _acquire_in_child(throttle: IOThrottle, nbytes: int) -> float:
+    return throttle.acquire(nbytes, files=1)
+
+
+class TestParseSize:
+    """Tests for human-readable size and rate parsing."""
+
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("1048576", 1048576),
+            ("512K", 512 * 1024),
+            ("512M", 512 * 1024**2),
+            ("2G", 2 * 1024**3),
+            ("1.5GiB", int(1.5 * 1024**3)),
+            ("256mb", 256 * 1024**2),
+        ],
+    )
+    def test_valid_sizes(self, text, expected):
+        """Test binary unit parsing."""
+        assert parse_size(text) == expected
+
+    @pytest.mark.parametrize("text", ["", "lots", "12X", "-5M", "0"])
+    def test_invalid_sizes(self, text):
+        """Test that malformed sizes are rejected."""
+        with pytest.raises(ValueError, match="Invalid size"):
+            parse_size(text)
+
+    def test_rate_accepts_per_second_suffix(self):
+        """Test that rates may be written as SIZE/s."""
+        assert parse_rate("20MiB/s") == parse_rate("20M") == 20 * 1024**2
+
+
+class TestIOThrottle:
+    """Tests for the shared token buckets."""
+
+    def test_rejects_non_positive_rates(self):
+        """Test validation of configured rates."""
+        with pytest.raises(ValueError, match="bytes_per_second"):
+            IOThrottle(bytes_per_second=0)
+
+    def test_unconfigured_options_disable_throttling(self):
+        """Test that no throttle is built without limits."""
+        assert IOThrottle.from_options(None, None) is None
+
+    def test_burst_then_wait_for_deficit(self, sleeps):
+        """Test that the first second is free and overdraft is paid back by sleeping."""
+        with IOThrottle(bytes_per_second=1000) as throttle:
+            assert throttle.acquire(500) == 0
+            waited = throttle.acquire(1500)
+
+        assert waited == pytest.approx(1.0, abs=0.05)
+        assert sleeps == [waited]
+
+    def test_file_bucket_is_independent(self, sleeps):
+        """Test that opens are limited even when bytes are unlimited."""
+        with IOThrottle(files_per_second=2) as throttle:
+            throttle.acquire(10**9, files=2)
+            waited = throttle.acquire(files=1)
+
+        assert waited == pytest.approx(0.5, abs=0.05)
+
+    def test_throttles_sharing_a_state_file_share_the_budget(self, tmp_path, sleeps):
+        """Test that two commands using one --io-bucket draw from one budget."""
+        state = tmp_path / "io.bucket"
+        with IOThrottle(files_per_second=10, state_path=state) as scan:
+            with IOThrottle(files_per_second=10, state_path=state) as parse:
+                scan.acquire(files=10)
+                assert parse.acquire(files=5) == pytest.approx(0.5, abs=0.05)
+
+        assert state.exists()
+
+    def test_refill_time_from_another_clock(self, tmp_path, sleeps):
+        """Test that a state file with a refill time in the future does not stall the run."""
+        state = tmp_path / "io.bucket"
+        future = time.monotonic() + 86400
+        state.write_bytes(struct.pack("7d", 1000.0, future, 0.0, 0.0, 0.0, 0.0, 0.0))
+
+        with IOThrottle(bytes_per_second=1000, state_path=state) as throttle:
+            assert throttle.acquire(500) == 0
+            waited = throttle.acquire(1500)
+
+        assert waited == pytest.approx(1.0, abs=0.05)
+
+    def test_budget_is_shared_with_worker_processes(self, sleeps):
+        """Test that a pickled throttle charges the parent's bucket."""
+        with IOThrottle(bytes_per_second=1000) as throttle:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                pool.submit(_acquire_in_child, throttle, 800).result()
+            waited = throttle.acquire(700)
+            stats = throttle.stats()
+
+        assert waited == pytest.approx(0.5, abs=0.05)
+        assert stats.bytes_read == 1500
+        assert stats.files_opened == 1
+
+    def test_pickled_throttle_does_not_own_state(self):
+        """Test that only the creating throttle deletes its private state file."""
+        with IOThrottle(files_per_second=100) as throttle:
+            clone = pickle.loads(pickle.dumps(throttle))
+            clone.close()
+            assert throttle.state_path.exists()
+
+        assert not throttle.state_path.exists()
+
+    def test_stats_report_throughput(self, sleeps):
+        """Test effective throughput reporting."""
+        with IOThrottle(bytes_per_second=10**9) as throttle:
+            throttle.acquire(2048, files=2)
+            stats = throttle.stats()
+
+        assert stats.bytes_read == 2048
+        assert stats.files_opened == 2
+        assert stats.bytes_per_second > 0
+        assert "2 file(s)" in stats.describe()
+
+
+class TestThrottledReads:
+    """Tests for throttle integration in the scanner and parser."""
+
+    def test_scanner_charges_each_visited_path(self, tmp_path, sleeps):
+        """Test that the directory walk draws from the file budget."""
+        for name in ("a.yaml", "b.yml", "c.yaml"):
+            (tmp_path / name).write_text("kind: Application")
+
+        with IOThrottle(files_per_second=1000) as throttle:
+            result = scan_directory(ScanOptions(input_dir=tmp_path), throttle)
+            stats = throttle.stats()
+
+        assert result.count == 3
+        assert stats.files_opened == 3
+
+    def test_parser_charges_file_size(self, tmp_path, sleeps):
+        """Test that manifest reads draw bytes and one open from the budget."""
+        manifest = tmp_path / "app.yaml"
+        manifest.write_text("kind: Application\nmetadata:\n  name: demo\n")
+
+        with IOThrottle(bytes_per_second=10**6, files_per_second=100) as throttle:
+            load_single_yaml_document(manifest, throttle)
+            stats = throttle.stats()
+
+        assert stats.bytes_read == Path(manifest).stat().st_size
+        assert stats.files_opened == 1